@@ -0,0 +1,86 @@
+"""
+Network requests and wall time of `--callers` concurrent identical calls (same hot user, same
+search), without and with request coalescing (`API(coalesce=...)`). Requests go to local stub
+client (no accounts / network) which answers after `--latency-ms`, search has `--pages` pages.
+
+Usage: python benchmarks/coalesce_requests.py [--callers 50] [--pages 5] [--latency-ms 150]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from twscrape import API, AccountsPool, gather
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+
+
+class StubClient:
+    def __init__(self, pages: int, latency: float, user_doc: dict):
+        self.pages = pages
+        self.latency = latency
+        self.user_doc = user_doc
+        self.requests = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def get(self, url: str, params: dict):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if url.endswith("UserByScreenName"):
+            return httpx.Response(200, json=self.user_doc)
+
+        cur = json.loads(params["variables"]).get("cursor", None)
+        page = 0 if cur is None else int(cur)
+        entries: list[dict] = [{"entryId": f"tweet-{page}-{x}"} for x in range(20)]
+        if page < self.pages - 1:
+            cursor = {"cursorType": "Bottom", "value": str(page + 1)}
+            entries.append({"entryId": f"cursor-bottom-{page}", "content": cursor})
+        return httpx.Response(200, json={"data": {"entries": entries}})
+
+
+async def main(args):
+    with open(os.path.join(DATA_DIR, "raw_user_by_login.json")) as fp:
+        user_doc = json.load(fp)
+
+    calls = {
+        "user_by_login": lambda api: api.user_by_login("xdevelopers"),
+        "search": lambda api: gather(api.search_raw("elon musk")),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = AccountsPool(os.path.join(tmp, "accounts.db"))
+        print(f"callers={args.callers} pages={args.pages} latency={args.latency_ms}ms")
+        for name, fn in calls.items():
+            for coalesce in [False, True]:
+                client = StubClient(args.pages, args.latency_ms / 1000, user_doc)
+                api = API(pool, coalesce=coalesce)
+                setattr(api, "_client", lambda queue: client)
+
+                t0 = time.perf_counter()
+                await asyncio.gather(*[fn(api) for _ in range(args.callers)])
+                elapsed = time.perf_counter() - t0
+                coalesced = sum(v for k, v in api.counters.items() if k.startswith("coalesced."))
+                print(
+                    f"{name:14s} coalesce={coalesce!s:5s} requests={client.requests:4d}"
+                    f" coalesced={coalesced:4d} wall={elapsed:5.2f}s"
+                )
+
+        await pool.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--callers", type=int, default=50)
+    p.add_argument("--pages", type=int, default=5)
+    p.add_argument("--latency-ms", type=int, default=150)
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,100 @@
+"""
+CPU time per page on mocked responses (tests/mocked-data/raw_*.json), from response body to
+parsed models, like `QueueClient._check_rep` -> `API._gql_items` -> `API.search` & others.
+
+"before": body decoded in `_check_rep`, `_gql_items` and wrapper (stdlib json), separate
+traversals for entries, cursor and typed objects.
+"after": body decoded once and cached on response, one walk; with each installed backend.
+
+Usage: python benchmarks/decode_pages.py [--rounds 50]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import httpx
+
+import twscrape.utils as utils
+from twscrape.models import parse_tweets, parse_users
+from twscrape.utils import find_obj, get_by_path, rep_json, walk_rep
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+
+
+def page_before(rep: httpx.Response):
+    rep.json()  # _check_rep
+    obj = rep.json()  # _gql_items
+    get_by_path(obj, "entries")
+    find_obj(obj, lambda x: x.get("cursorType") == "Bottom")
+    obj = rep.json()  # wrapper, parsers walk it again in to_old_rep
+    list(parse_tweets(obj))
+    list(parse_users(obj))
+
+
+def page_after(rep: httpx.Response):
+    rep_json(rep)  # _check_rep
+    walk_rep(rep).cursors.get("Bottom")  # _gql_items
+    list(parse_tweets(rep))  # wrapper
+    list(parse_users(rep))
+
+
+def measure(bodies: list[bytes], rounds: int, fn) -> float:
+    t0 = time.process_time()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(httpx.Response(200, content=body))
+    return (time.process_time() - t0) / (len(bodies) * rounds) * 1000
+
+
+def backends():
+    yield "json", json.loads
+    try:
+        import orjson
+
+        yield "orjson", orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec  # pyright: ignore[reportMissingImports]
+
+        yield "msgspec", msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+
+
+def main(args):
+    bodies = []
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp, "rb") as f:
+            bodies.append(f.read())
+
+    size = sum(len(x) for x in bodies) / len(bodies) / 1024
+    print(f"pages={len(bodies)} avg_size={size:.0f}KB rounds={args.rounds} cpu ms/page")
+
+    for name, loads in backends():
+        t0 = time.process_time()
+        for _ in range(args.rounds):
+            for body in bodies:
+                loads(body)
+        ms = (time.process_time() - t0) / (len(bodies) * args.rounds) * 1000
+        print(f"decode only  {name:8s} {ms:6.3f}ms")
+
+    before = measure(bodies, args.rounds, page_before)
+    print(f"pipeline     {'before':8s} {before:6.3f}ms")
+
+    default = utils._json_loads
+    for name, loads in backends():
+        utils._json_loads = loads
+        after = measure(bodies, args.rounds, page_after)
+        print(f"pipeline     {name:8s} {after:6.3f}ms ({before / after:.2f}x)")
+    utils._json_loads = default
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=50)
+    main(p.parse_args())
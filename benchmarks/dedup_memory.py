@@ -0,0 +1,51 @@
+"""
+Memory and add() rate of dedup filters (`twscrape.dedup`) for `--items` tweet keys: exact
+Python set (what downstream dedup does), `LruSet` and `BloomFilter` with several error rates.
+Memory is measured with tracemalloc (without keys), filters also report own `nbytes`.
+
+Usage: python benchmarks/dedup_memory.py [--items 1000000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from twscrape.dedup import BloomFilter, LruSet
+
+
+def main(args):
+    keys = [f"tweet:{1_700_000_000_000_000_000 + x * 7919}" for x in range(args.items)]
+    print(f"items={args.items:,d}")
+
+    filters = [
+        ("set", set),
+        ("lru", lambda: LruSet(max_items=args.items)),
+        ("bloom 1%", lambda: BloomFilter(capacity=args.items, error_rate=0.01)),
+        ("bloom 0.1%", lambda: BloomFilter(capacity=args.items, error_rate=0.001)),
+    ]
+    for name, make in filters:
+        obj = make()
+        t0 = time.perf_counter()
+        for x in keys:
+            obj.add(x)
+        rate = len(keys) / (time.perf_counter() - t0)
+
+        tracemalloc.start()  # second pass, tracemalloc slows down allocations
+        tmp = make()
+        for x in keys:
+            tmp.add(x)
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del tmp
+
+        # traced memory does not include keys (shared with `keys` list), nbytes does
+        extra = "" if isinstance(obj, set) else f" nbytes={obj.nbytes / 1024 / 1024:6.1f}MB"
+        if isinstance(obj, BloomFilter):
+            extra += f" error_rate={obj.error_rate_now:.4f} skipped={obj.seen:,d}"
+        print(f"{name:10s} traced={traced / 1024 / 1024:6.1f}MB rate={rate:10,.0f} keys/s{extra}")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--items", type=int, default=1_000_000)
+    main(p.parse_args())
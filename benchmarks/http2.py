@@ -0,0 +1,130 @@
+"""
+HTTP/1.1 vs HTTP/2 throughput with many concurrent requests over one proxy (or direct).
+Local TLS stub server (from http_reuse.py) negotiates protocol with ALPN and answers each
+request after `--delay` ms (like remote API). Reports requests/sec and opened connections.
+
+Requires `h2` package: pip install twscrape[http2]
+
+Usage: python benchmarks/http2.py [--requests 2000] [--concurrency 100] [--delay 20]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+from http_reuse import StubServer, make_account
+
+from twscrape.transport import close_transports
+
+BODY = b'{"data":{}}'
+
+
+class H2StubServer(StubServer):
+    def __init__(self, tmp: str, delay: float):
+        super().__init__(tmp)
+        self.ctx.set_alpn_protocols(["h2", "http/1.1"])
+        self.delay = delay
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        ssl_obj = writer.get_extra_info("ssl_object")
+        if ssl_obj is None or ssl_obj.selected_alpn_protocol() != "h2":
+            return await self.handle_h1(reader, writer)
+
+        self.handshakes += 1
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(self.delay)
+            headers = [(":status", "200"), ("content-length", str(len(BODY)))]
+            conn.send_headers(stream_id, headers)
+            conn.send_data(stream_id, BODY, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        tasks = set()
+        try:
+            while data := await reader.read(65535):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.create_task(respond(event.stream_id))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    if isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_h1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.handshakes += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n")
+                writer.write(b"content-length: %d\r\n\r\n%s" % (len(BODY), BODY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(server: H2StubServer, args, http2: bool):
+    server.handshakes = 0
+    url = f"https://localhost:{server.port}/graphql"
+    accounts = [make_account(i) for i in range(10)]  # several accounts, one proxy
+    clients = [x.make_client(http2=http2, max_streams=args.max_streams) for x in accounts]
+    per_worker = args.requests // args.concurrency
+
+    async def worker(wid: int):
+        clt = clients[wid % len(clients)]
+        for _ in range(per_worker):
+            rep = await clt.get(url)
+            assert rep.status_code == 200
+            assert rep.http_version == ("HTTP/2" if http2 else "HTTP/1.1")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    for x in clients:
+        await x.aclose()
+    await close_transports()
+
+    total = per_worker * args.concurrency
+    name = "http/2" if http2 else "http/1.1"
+    print(
+        f"{name:8s} requests={total} connections={server.handshakes:3d}"
+        f" elapsed={elapsed:.2f}s rate={total / elapsed:,.0f} req/s"
+    )
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        server = H2StubServer(tmp, args.delay / 1000)
+        os.environ["SSL_CERT_FILE"] = server.cert
+        srv = await server.start()
+
+        for http2 in [False, True]:
+            await run(server, args, http2)
+
+        srv.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--concurrency", type=int, default=100)
+    p.add_argument("--delay", type=float, default=20, help="Server response delay, ms")
+    p.add_argument("--max-streams", type=int, default=100)
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,116 @@
+"""
+HTTP connection reuse between account checkouts. Local TLS stub server (self-signed cert,
+generated with `openssl`) counts TLS handshakes. Each checkout makes client with
+`Account.make_client`, sends several requests and closes it (like QueueClient does).
+
+Usage: python benchmarks/http_reuse.py [--checkouts 200] [--requests 3] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+
+from twscrape.account import Account
+from twscrape.transport import close_transports
+
+
+class StubServer:
+    def __init__(self, tmp: str):
+        self.cert, self.key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        cmd = "openssl req -x509 -newkey rsa:2048 -nodes -days 1 -subj /CN=localhost"
+        cmd += f" -addext subjectAltName=DNS:localhost -keyout {self.key} -out {self.cert}"
+        subprocess.run(cmd.split(), check=True, capture_output=True)
+
+        self.ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.ctx.load_cert_chain(self.cert, self.key)
+        self.handshakes = 0
+        self.port = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.handshakes += 1
+        body = b'{"data":{}}'
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                size = [x for x in head.split(b"\r\n") if x.lower().startswith(b"content-length")]
+                if size:
+                    await reader.readexactly(int(size[0].split(b":")[1]))
+
+                writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n")
+                writer.write(b"content-length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        server = await asyncio.start_server(self.handle, "127.0.0.1", 0, ssl=self.ctx)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+
+def make_account(i: int):
+    return Account(
+        username=f"user{i}",
+        password="pass",
+        email="email",
+        email_password="email_pass",
+        user_agent="ua",
+        active=True,
+        cookies={"ct0": f"token{i}"},
+    )
+
+
+async def run(server: StubServer, args, reuse: bool):
+    os.environ["TWS_REUSE_CONNECTIONS"] = "1" if reuse else "0"
+    server.handshakes = 0
+    url = f"https://localhost:{server.port}/graphql"
+    latency: list[float] = []
+
+    async def worker(wid: int):
+        for i in range(args.checkouts // args.concurrency):
+            clt = make_account(wid * args.checkouts + i).make_client()
+            for _ in range(args.requests):
+                t0 = time.perf_counter()
+                rep = await clt.get(url)
+                latency.append((time.perf_counter() - t0) * 1000)
+                assert rep.status_code == 200
+            await clt.aclose()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - t0
+    await close_transports()
+
+    latency = sorted(latency)
+    p50, p99 = statistics.median(latency), latency[int(len(latency) * 0.99) - 1]
+    print(
+        f"reuse={str(reuse):5s} requests={len(latency)} handshakes={server.handshakes:4d}"
+        f" p50={p50:.2f}ms p99={p99:.2f}ms rate={len(latency) / elapsed:,.0f} req/s"
+    )
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        server = StubServer(tmp)
+        os.environ["SSL_CERT_FILE"] = server.cert
+        srv = await server.start()
+
+        for reuse in [False, True]:
+            await run(server, args, reuse)
+
+        srv.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--checkouts", type=int, default=200)
+    p.add_argument("--requests", type=int, default=3, help="Requests per checkout")
+    p.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,56 @@
+"""
+Memory held by parsed models. Mocked search and timeline payloads are parsed `--copies` times
+(like long scrape which keeps all tweets for dedup / aggregation), memory retained by parsed
+objects is measured with `tracemalloc` (raw responses are loaded before and not counted).
+
+Reports bytes per Tweet (with nested User, Media, links, etc) and shallow size of one Tweet.
+
+Usage: python benchmarks/models_memory.py [--copies 20]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from twscrape.models import Tweet, parse_tweets
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+PAYLOADS = ["raw_search", "raw_user_tweets", "raw_user_tweets_and_replies", "raw_list_timeline"]
+
+
+def measure(name: str, copies: int):
+    with open(os.path.join(DATA_DIR, f"{name}.json")) as f:
+        obj = json.load(f)
+
+    gc.collect()
+    tracemalloc.start()
+    items: list[Tweet] = []
+    for _ in range(copies):
+        items.extend(parse_tweets(obj))
+
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    x = items[0]
+    shallow = sys.getsizeof(x) + (sys.getsizeof(x.__dict__) if hasattr(x, "__dict__") else 0)
+    print(
+        f"{name:28s} tweets={len(items):6d} bytes/tweet={size / len(items):8,.0f}"
+        f" shallow={shallow}B"
+    )
+
+
+def main(args):
+    slots = hasattr(Tweet, "__slots__")
+    print(f"copies={args.copies} slots={slots}")
+    for name in PAYLOADS:
+        measure(name, args.copies)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--copies", type=int, default=20)
+    main(p.parse_args())
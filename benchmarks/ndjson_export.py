@@ -0,0 +1,71 @@
+"""
+NDJSON export throughput: current CLI print loop (`print(to_str(doc))` to redirected stdout)
+vs `NdjsonWriter` (buffered, model `dict()` encoded with fast JSON backend) without and with
+compression. Tweets are parsed from mocked pages (tests/mocked-data/raw_*.json) before timing,
+repeated `--copies` times.
+
+Usage: python benchmarks/ndjson_export.py [--copies 20]
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import tempfile
+import time
+
+from twscrape.cli import to_str
+from twscrape.models import Tweet, parse_tweets
+from twscrape.ndjson import NdjsonWriter
+from twscrape.utils import JSON_BACKEND
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+
+
+def via_print(items: list[Tweet], path: str):
+    with open(path, "w") as fp, contextlib.redirect_stdout(fp):
+        for x in items:
+            print(to_str(x))
+
+
+def via_writer(items: list[Tweet], path: str):
+    with NdjsonWriter(path) as out:
+        for x in items:
+            out.write(x)
+
+
+def main(args):
+    items: list[Tweet] = []
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp) as f:
+            items.extend(parse_tweets(json.load(f)))
+    items = items * args.copies
+
+    cases = [
+        ("print", via_print, "ndjson"),
+        ("writer", via_writer, "ndjson"),
+        ("writer+gzip", via_writer, "ndjson.gz"),
+        ("writer+zstd", via_writer, "ndjson.zst"),
+    ]
+
+    print(f"rows={len(items)} json_backend={JSON_BACKEND}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn, ext in cases:
+            path = os.path.join(tmp, f"{name}.{ext}")
+            t0 = time.perf_counter()
+            try:
+                fn(items, path)
+            except ImportError:
+                print(f"{name:12s} skipped (not installed)")
+                continue
+
+            elapsed = time.perf_counter() - t0
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"{name:12s} rate={len(items) / elapsed:8,.0f} rows/s size={size:6.1f}MB")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--copies", type=int, default=20)
+    main(p.parse_args())
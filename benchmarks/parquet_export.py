@@ -0,0 +1,82 @@
+"""
+Tweets to Parquet: direct Arrow conversion (`twscrape.arrow.ParquetSink`) vs current JSON step
+(CLI output with `Tweet.json()` per line, then JSON -> pandas / pyarrow.json -> Parquet).
+Tweets are parsed from mocked pages (tests/mocked-data/raw_*.json) before timing, repeated
+`--copies` times. Reports CPU time and rows/sec of export.
+
+Requires `pyarrow` (and `pandas` for pandas path, skipped if not installed).
+
+Usage: python benchmarks/parquet_export.py [--copies 20]
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import tempfile
+import time
+
+import pyarrow.json as pj
+import pyarrow.parquet as pq
+
+from twscrape.arrow import ParquetSink
+from twscrape.models import Tweet, parse_tweets
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+
+
+def via_arrow(items: list[Tweet], path: str):
+    with ParquetSink(path) as sink:
+        for x in items:
+            sink.write(x)
+
+
+def via_json_arrow(items: list[Tweet], path: str):
+    buf = io.BytesIO("\n".join(x.json() for x in items).encode())
+    pq.write_table(pj.read_json(buf), path, compression="zstd")
+
+
+def via_json_pandas(items: list[Tweet], path: str):
+    import pandas as pd  # pyright: ignore[reportMissingImports]
+
+    buf = io.StringIO("\n".join(x.json() for x in items))
+    pd.read_json(buf, lines=True).to_parquet(path, compression="zstd")
+
+
+def main(args):
+    items: list[Tweet] = []
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp) as f:
+            items.extend(parse_tweets(json.load(f)))
+    items = items * args.copies
+
+    cases = [
+        ("json+pyarrow", via_json_arrow),
+        ("json+pandas", via_json_pandas),
+        ("arrow", via_arrow),
+    ]
+
+    print(f"rows={len(items)}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn in cases:
+            path = os.path.join(tmp, f"{name}.parquet")
+            t0, c0 = time.perf_counter(), time.process_time()
+            try:
+                fn(items, path)
+            except ImportError:
+                print(f"{name:13s} skipped (not installed)")
+                continue
+
+            elapsed, cpu = time.perf_counter() - t0, time.process_time() - c0
+            size = os.path.getsize(path) / 1024 / 1024
+            print(
+                f"{name:13s} cpu={cpu:6.2f}s rate={len(items) / elapsed:8,.0f} rows/s"
+                f" size={size:.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--copies", type=int, default=20)
+    main(p.parse_args())
@@ -0,0 +1,92 @@
+"""
+Eager vs lazy tweet parsing (`parse_tweets(..., lazy=True)`) on mocked timeline payloads.
+Consumer reads only id, date, user id and rawContent of each tweet ("fields"), dumps whole
+tweet with `dict()` ("full") or dumps only these fields ("projection", lazy side uses
+`parse_tweets(..., fields=...)`). Responses are decoded & walked before timing, so only
+models parsing is measured.
+
+Usage: python benchmarks/parse_lazy.py [--rounds 50]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import httpx
+
+from twscrape.models import parse_tweets
+from twscrape.utils import walk_rep
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+FIELDS = ["id", "date", "rawContent", "user.id"]
+
+
+def read_fields(reps: list[httpx.Response], lazy: bool):
+    cnt = 0
+    for rep in reps:
+        for x in parse_tweets(rep, lazy=lazy):
+            x.id, x.date, x.user.id, x.rawContent
+            cnt += 1
+    return cnt
+
+
+def read_full(reps: list[httpx.Response], lazy: bool):
+    cnt = 0
+    for rep in reps:
+        for x in parse_tweets(rep, lazy=lazy):
+            x.dict()
+            cnt += 1
+    return cnt
+
+
+def read_projection(reps: list[httpx.Response], lazy: bool):
+    cnt = 0
+    for rep in reps:
+        if lazy:
+            for x in parse_tweets(rep, fields=FIELDS):
+                x.dict()
+                cnt += 1
+        else:
+            for x in parse_tweets(rep):
+                doc = x.dict()
+                {k: doc[k] for k in ["id", "date", "rawContent"]} | {
+                    "user": {"id": doc["user"]["id"]}
+                }
+                cnt += 1
+    return cnt
+
+
+def measure(reps: list[httpx.Response], rounds: int, consumer, lazy: bool):
+    t0, cnt = time.perf_counter(), 0
+    for _ in range(rounds):
+        cnt += consumer(reps, lazy)
+    return cnt / (time.perf_counter() - t0)
+
+
+def main(args):
+    reps = []
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp, "rb") as f:
+            rep = httpx.Response(200, content=f.read())
+            walk_rep(rep)
+            reps.append(rep)
+
+    print(f"pages={len(reps)} rounds={args.rounds}")
+    for name, consumer in [
+        ("fields", read_fields),
+        ("full", read_full),
+        ("projection", read_projection),
+    ]:
+        eager = measure(reps, args.rounds, consumer, lazy=False)
+        lazy = measure(reps, args.rounds, consumer, lazy=True)
+        print(
+            f"{name:10s} eager={eager:8,.0f} tweets/s lazy={lazy:8,.0f} tweets/s"
+            f" speedup={lazy / eager:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=50)
+    main(p.parse_args())
@@ -0,0 +1,88 @@
+"""
+Response processing speed on mocked pages (tests/mocked-data/raw_*.json). Each page is
+processed like in `API._gql_items` + wrappers: find entries, find cursor, collect typed
+objects and parse them to models.
+
+"before": separate traversals (get_by_path + find_obj + get_typed_object in to_old_rep).
+"after": one `walk_doc` pass shared by pagination loop and parsers.
+
+Reports pages/sec for walking only and for walking with parsing to models.
+
+Usage: python benchmarks/parse_pages.py [--rounds 50]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from collections import defaultdict
+
+from twscrape.models import Trend, Tweet, User
+from twscrape.utils import (
+    GqlDoc,
+    find_obj,
+    get_by_path,
+    get_typed_object,
+    to_old_rep,
+    walk_doc,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "mocked-data")
+
+
+def walk_before(obj: dict, with_parse: bool):
+    # pagination loop: entries + cursor, parser: typed objects (inside to_old_rep)
+    get_by_path(obj, "entries")
+    find_obj(obj, lambda x: x.get("cursorType") == "Bottom")
+    if with_parse:
+        return parse(obj)
+    get_typed_object(obj, defaultdict(list))
+
+
+def walk_after(obj: dict, with_parse: bool):
+    doc = walk_doc(obj)
+    doc.cursors.get("Bottom")
+    if with_parse:
+        return parse(doc)
+
+
+def parse(tmp: dict | GqlDoc):
+    obj = to_old_rep(tmp)
+    for key, Cls in [("tweets", Tweet), ("users", User), ("trends", Trend)]:
+        for x in obj[key].values():
+            try:
+                Cls.parse(x, obj)
+            except Exception:
+                pass
+
+
+def measure(pages: list[dict], rounds: int, walk, with_parse: bool):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for obj in pages:
+            walk(obj, with_parse)
+    return len(pages) * rounds / (time.perf_counter() - t0)
+
+
+def main(args):
+    pages = []
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp) as f:
+            pages.append(json.load(f))
+
+    print(f"pages={len(pages)} rounds={args.rounds}")
+    for with_parse in [False, True]:
+        name = "walk+parse" if with_parse else "walk"
+        before = measure(pages, args.rounds, walk_before, with_parse)
+        after = measure(pages, args.rounds, walk_after, with_parse)
+        print(
+            f"{name:10s} before={before:8,.0f} pages/s after={after:8,.0f} pages/s"
+            f" speedup={after / before:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=50)
+    main(p.parse_args())
@@ -0,0 +1,63 @@
+"""
+Measures how many `get_for_queue` + `unlock` cycles per second AccountsPool can do.
+
+Usage: python benchmarks/pool_checkout.py [--accounts 50] [--cycles 2000] [--concurrency 1]
+                                         [--in-memory] [--write-delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from twscrape import AccountsPool
+from twscrape.logger import set_log_level
+
+QUEUE = "SearchTimeline"
+
+
+async def prepare(pool: AccountsPool, accounts: int):
+    for i in range(accounts):
+        await pool.add_account(f"user{i:05d}", "pass", f"email{i}", "email_pass", user_agent="ua")
+        await pool.set_active(f"user{i:05d}", True)
+
+
+async def checkout_loop(pool: AccountsPool, cycles: int):
+    for _ in range(cycles):
+        acc = await pool.get_for_queue(QUEUE)
+        assert acc is not None, "pool exhausted, use more accounts"
+        await pool.unlock(acc.username, QUEUE, req_count=1)
+
+
+async def main(args):
+    set_log_level("ERROR")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = AccountsPool(
+            os.path.join(tmp, "bench.db"), in_memory=args.in_memory, write_delay=args.write_delay
+        )
+        await prepare(pool, args.accounts)
+
+        per_worker = args.cycles // args.concurrency
+        total = per_worker * args.concurrency
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(checkout_loop(pool, per_worker) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - t0
+
+        await pool.close()
+
+    mode = "memory" if args.in_memory else "sql"
+    print(f"mode={mode} accounts={args.accounts} concurrency={args.concurrency} cycles={total}")
+    print(f"elapsed={elapsed:.2f}s rate={total / elapsed:,.0f} cycles/s")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--accounts", type=int, default=50)
+    p.add_argument("--cycles", type=int, default=2000)
+    p.add_argument("--concurrency", type=int, default=1)
+    p.add_argument("--in-memory", action="store_true", help="Use in-process scheduler")
+    p.add_argument("--write-delay", type=float, default=0.05, help="0 to disable batching")
+    asyncio.run(main(p.parse_args()))
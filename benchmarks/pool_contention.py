@@ -0,0 +1,78 @@
+"""
+Several processes share one accounts.db and do `get_for_queue` + `unlock` in a loop.
+Reports total checkouts per second for 1, 4 and 16 worker processes.
+
+Usage: python benchmarks/pool_contention.py [--accounts 200] [--seconds 5] [--workers 1 4 16]
+"""
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from twscrape import AccountsPool
+from twscrape.logger import set_log_level
+
+QUEUE = "SearchTimeline"
+
+
+async def prepare(db_file: str, accounts: int):
+    pool = AccountsPool(db_file)
+    for i in range(accounts):
+        await pool.add_account(f"user{i:05d}", "pass", f"email{i}", "email_pass", user_agent="ua")
+        await pool.set_active(f"user{i:05d}", True)
+    await pool.close()
+
+
+async def worker(db_file: str, seconds: float) -> tuple[int, float]:
+    set_log_level("ERROR")
+    pool = AccountsPool(db_file)
+
+    count, max_wait = 0, 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        acc = await pool.get_for_queue(QUEUE)
+        max_wait = max(max_wait, time.perf_counter() - t0)
+        if acc is None:
+            continue
+
+        await pool.unlock(acc.username, QUEUE, req_count=1)
+        count += 1
+
+    await pool.close()
+    return count, max_wait
+
+
+def run_worker(args: tuple[str, float]):
+    return asyncio.run(worker(*args))
+
+
+def main(args):
+    set_log_level("ERROR")
+    ctx = mp.get_context("spawn")
+
+    for n in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, "bench.db")
+            asyncio.run(prepare(db_file, args.accounts))
+
+            with ctx.Pool(n) as p:
+                res = p.map(run_worker, [(db_file, args.seconds)] * n)
+
+        total = sum(x[0] for x in res)
+        max_wait = max(x[1] for x in res)
+        print(
+            f"workers={n:2d} checkouts={total:6d} rate={total / args.seconds:8,.0f}/s"
+            f" max_checkout_wait={max_wait:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--accounts", type=int, default=200)
+    p.add_argument("--seconds", type=float, default=5)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    main(p.parse_args())
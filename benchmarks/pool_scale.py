@@ -0,0 +1,76 @@
+"""
+Checkout latency depending on pool size. 90% of accounts are locked for the queue
+(like in the middle of long scraping), then `get_for_queue` + `unlock`, `next_available_at`
+and `stats` are timed.
+
+Usage: python benchmarks/pool_scale.py [--sizes 100 1000 10000] [--cycles 200]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from twscrape import AccountsPool
+from twscrape.db import executemany
+from twscrape.logger import set_log_level
+from twscrape.utils import utc
+
+QUEUE = "SearchTimeline"
+
+
+async def prepare(pool: AccountsPool, size: int):
+    await pool.get_all()  # run migrations
+
+    qs = """
+    INSERT INTO accounts (username, password, email, email_password, user_agent, active)
+    VALUES (:username, 'pass', :username, 'pass', 'ua', true)
+    """
+    await executemany(pool._db_file, qs, [{"username": f"user{i:05d}"} for i in range(size)])
+
+    unlock_at = utc.ts() + 3600
+    for i in range(size * 9 // 10):
+        await pool.lock_until(f"user{i:05d}", QUEUE, unlock_at)
+
+
+async def timeit(fn, cycles: int):
+    res = []
+    for _ in range(cycles):
+        t0 = time.perf_counter()
+        await fn()
+        res.append((time.perf_counter() - t0) * 1000)
+    res = sorted(res)
+    return statistics.median(res), res[int(len(res) * 0.99) - 1]
+
+
+async def main(args):
+    set_log_level("ERROR")
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = AccountsPool(os.path.join(tmp, "bench.db"))
+            await prepare(pool, size)
+
+            async def checkout():
+                acc = await pool.get_for_queue(QUEUE)
+                assert acc is not None
+                await pool.unlock(acc.username, QUEUE, req_count=1)
+
+            rs = [
+                ("checkout", await timeit(checkout, args.cycles)),
+                ("next_available_at", await timeit(lambda: pool.next_available_at(QUEUE), 50)),
+                ("stats", await timeit(pool.stats, 50)),
+            ]
+            await pool.close()
+
+        for name, (p50, p99) in rs:
+            print(f"accounts={size:6d} {name:18s} p50={p50:7.2f}ms p99={p99:7.2f}ms")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    p.add_argument("--cycles", type=int, default=200)
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,132 @@
+"""
+Simulation of account selection strategies. Accounts start with synthetic rate limit state
+(random `x-rate-limit-remaining` left from previous runs). Workers take account, make a
+session of several requests (each response "returns" rate limit headers) and release it;
+account which reaches zero remaining is locked until reset. Simulation stops when some
+worker can't get an account (pool is exhausted).
+
+Reports total requests served and how many sessions were cut by rate limit (handoffs:
+request has to be retried with other account).
+
+Usage: python benchmarks/pool_strategies.py [--accounts 100] [--workers 16] [--budget 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from twscrape import AccountsPool
+from twscrape.db import executemany
+from twscrape.logger import set_log_level
+from twscrape.strategies import (
+    ByUsername,
+    LeastRecentlyUsed,
+    MostRemaining,
+    SelectionStrategy,
+    Sharded,
+)
+from twscrape.utils import utc
+
+QUEUE = "SearchTimeline"
+
+
+class FakeServer:
+    def __init__(self, accounts: int, budget: int, seed: int):
+        rnd = random.Random(seed)
+        self.reset = utc.ts() + 3600  # window is longer than simulation
+        self.remaining = {f"user{i:05d}": rnd.randint(0, budget) for i in range(accounts)}
+        self.served: dict[str, int] = {x: 0 for x in self.remaining}
+        self.handoffs = 0
+
+    def request(self, username: str) -> tuple[int, int]:
+        # returns rate limit headers of response: (remaining, reset)
+        self.remaining[username] = max(self.remaining[username] - 1, 0)
+        if self.remaining[username] > 0:
+            self.served[username] += 1
+        return self.remaining[username], self.reset
+
+
+async def prepare(db_file: str, server: FakeServer):
+    pool = AccountsPool(db_file)
+    await pool.get_all()  # run migrations
+
+    qs = """
+    INSERT INTO accounts (username, password, email, email_password, user_agent, active)
+    VALUES (:username, 'pass', :username, 'pass', 'ua', true)
+    """
+    await executemany(db_file, qs, [{"username": x} for x in server.remaining])
+    await pool.close()
+
+
+async def simulate(db_file: str, server: FakeServer, strategies: list[SelectionStrategy]):
+    # pool per worker (like separate processes), updates are not batched, so released
+    # accounts are visible to other workers immediately
+    pools = [AccountsPool(db_file, strategy=x, write_delay=0) for x in strategies]
+    rnd = random.Random(42)
+    stop = asyncio.Event()
+
+    async def worker(pool: AccountsPool):
+        while not stop.is_set():
+            acc = await pool.get_for_queue(QUEUE)
+            if acc is None:
+                stop.set()
+                return
+
+            req_count, limit = 0, None
+            for _ in range(rnd.randint(5, 20)):  # session: pagination of one query
+                limit = server.request(acc.username)
+                if limit[0] == 0:
+                    server.handoffs += 1
+                    break
+                req_count += 1
+                await asyncio.sleep(0)
+
+            if limit is not None and limit[0] == 0:
+                await pool.lock_until(acc.username, QUEUE, limit[1], req_count, limit=limit)
+            else:
+                await pool.unlock(acc.username, QUEUE, req_count, limit=limit)
+
+    await asyncio.gather(*(worker(x) for x in pools))
+    for x in pools:
+        await x.close()
+
+
+async def main(args):
+    set_log_level("ERROR")
+
+    cases: list[tuple[str, list[SelectionStrategy]]] = [
+        ("by_username", [ByUsername()] * args.workers),
+        ("lru", [LeastRecentlyUsed()] * args.workers),
+        ("most_remaining", [MostRemaining()] * args.workers),
+        ("sharded", [Sharded(i, args.workers) for i in range(args.workers)]),
+    ]
+
+    for name, strategies in cases:
+        server = FakeServer(args.accounts, args.budget, args.seed)
+        capacity = sum(max(x - 1, 0) for x in server.remaining.values())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, "bench.db")
+            await prepare(db_file, server)
+
+            t0 = time.perf_counter()
+            await simulate(db_file, server, strategies)
+            elapsed = time.perf_counter() - t0
+
+        total = sum(server.served.values())
+        print(
+            f"{name:15s} served={total:6d} ({total / capacity:6.1%} of budget)"
+            f" handoffs={server.handoffs:4d} elapsed={elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--accounts", type=int, default=100)
+    p.add_argument("--workers", type=int, default=16)
+    p.add_argument("--budget", type=int, default=50, help="Max rate limit per account")
+    p.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(p.parse_args()))
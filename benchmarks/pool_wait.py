@@ -0,0 +1,64 @@
+"""
+Time to resume: how long `get_for_queue_or_wait` waits after the only account of the queue
+is unlocked in the same process. With several waiters they take the account in turn, so
+time is counted from first unlock and includes checkouts of previous waiters.
+
+Usage: python benchmarks/pool_wait.py [--rounds 20] [--waiters 1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from twscrape import AccountsPool
+from twscrape.logger import set_log_level
+
+QUEUE = "SearchTimeline"
+
+
+async def main(args):
+    set_log_level("ERROR")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = AccountsPool(os.path.join(tmp, "bench.db"))
+        await pool.add_account("user1", "pass", "email", "email_pass", user_agent="ua")
+        await pool.set_active("user1", True)
+
+        res = []
+        for _ in range(args.rounds):
+            acc = await pool.get_for_queue(QUEUE)
+            assert acc is not None
+
+            resumed: list[float] = []
+
+            async def waiter():
+                acc = await pool.get_for_queue_or_wait(QUEUE)
+                assert acc is not None
+                resumed.append(time.perf_counter())
+                await pool.unlock(acc.username, QUEUE)
+
+            tasks = [asyncio.create_task(waiter()) for _ in range(args.waiters)]
+            await asyncio.sleep(random.uniform(0.1, 0.5))  # let waiters park
+
+            t0 = time.perf_counter()
+            await pool.unlock(acc.username, QUEUE)
+            await asyncio.gather(*tasks)
+            res.extend((x - t0) * 1000 for x in resumed)
+
+        await pool.close()
+
+    res = sorted(res)
+    p50, p99 = statistics.median(res), res[int(len(res) * 0.99) - 1]
+    print(f"rounds={args.rounds} waiters={args.waiters} resumes={len(res)}")
+    print(f"time_to_resume p50={p50:.2f}ms p99={p99:.2f}ms max={res[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rounds", type=int, default=20)
+    p.add_argument("--waiters", type=int, default=1)
+    asyncio.run(main(p.parse_args()))
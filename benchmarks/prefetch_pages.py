@@ -0,0 +1,79 @@
+"""
+End-to-end wall time of paginated crawl with slow consumer, without and with page prefetching
+(`API(prefetch=k)`). Requests go to local stub client (no accounts / network) which answers
+after `--latency-ms` with page of 20 entries and cursor to next page; consumer spends
+`--consumer-ms` on each page (e.g. DB insert).
+
+Usage: python benchmarks/prefetch_pages.py [--pages 50] [--consumer-ms 200] [--latency-ms 150]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from twscrape import API, AccountsPool
+
+
+class StubClient:
+    def __init__(self, pages: int, latency: float):
+        self.pages = pages
+        self.latency = latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def get(self, url: str, params: dict):
+        await asyncio.sleep(self.latency)
+
+        cur = json.loads(params["variables"]).get("cursor", None)
+        page = 0 if cur is None else int(cur)
+        entries: list[dict] = [{"entryId": f"tweet-{page}-{x}"} for x in range(20)]
+        if page < self.pages - 1:
+            cursor = {"cursorType": "Bottom", "value": str(page + 1)}
+            entries.append({"entryId": f"cursor-bottom-{page}", "content": cursor})
+        return httpx.Response(200, json={"data": {"entries": entries}})
+
+
+async def crawl(api: API, args) -> tuple[int, float]:
+    t0, pages = time.perf_counter(), 0
+    async for _ in api.search_raw("elon musk"):
+        await asyncio.sleep(args.consumer_ms / 1000)  # consumer work
+        pages += 1
+    return pages, time.perf_counter() - t0
+
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = AccountsPool(os.path.join(tmp, "accounts.db"))
+        client = StubClient(args.pages, args.latency_ms / 1000)
+
+        print(f"pages={args.pages} consumer={args.consumer_ms}ms latency={args.latency_ms}ms")
+        base = 0.0
+        for prefetch in [0, 1, 2, 4]:
+            api = API(pool, prefetch=prefetch)
+            setattr(api, "_client", lambda queue: client)
+
+            pages, elapsed = await crawl(api, args)
+            base = base or elapsed
+            print(
+                f"prefetch={prefetch} pages={pages} wall={elapsed:6.2f}s"
+                f" speedup={base / elapsed:.2f}x"
+            )
+
+        await pool.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--pages", type=int, default=50)
+    p.add_argument("--consumer-ms", type=int, default=200)
+    p.add_argument("--latency-ms", type=int, default=150)
+    asyncio.run(main(p.parse_args()))
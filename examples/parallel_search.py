@@ -1,24 +1,16 @@
 """
 This example shows how to use twscrape to complete some queries in parallel.
-To limit the number of concurrent requests, see examples/parallel_search_with_limit.py
+`API.search_many` shares accounts between queries (`concurrency` accounts at once),
+pages of all queries are interleaved. For other methods see `API.run_many`.
+To limit the number of concurrent requests manually, see examples/parallel_search_with_limit.py
 """
 
 import asyncio
+from collections import defaultdict
 
 import twscrape
 
 
-async def worker(api: twscrape.API, q: str):
-    tweets = []
-    try:
-        async for doc in api.search(q):
-            tweets.append(doc)
-    except Exception as e:
-        print(e)
-    finally:
-        return tweets
-
-
 async def main():
     api = twscrape.API()
     # add accounts here or before from cli (see README.md for examples)
@@ -26,9 +18,11 @@ async def main():
     await api.pool.login_all()
 
     queries = ["elon musk", "tesla", "spacex", "neuralink", "boring company"]
-    results = await asyncio.gather(*(worker(api, q) for q in queries))
 
-    combined = dict(zip(queries, results))
+    combined = defaultdict(list)
+    async for q, doc in api.search_many(queries, limit=100, concurrency=2):
+        combined[q].append(doc)
+
     for k, v in combined.items():
         print(k, len(v))
 
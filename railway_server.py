@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from twscrape import API, gather
+from twscrape.cache import ResponseCache
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -15,8 +16,8 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Initialize Twitter API client
-twitter_api = API()
+# Initialize Twitter API client (user lookups are cached, screen name -> id rarely changes)
+twitter_api = API(cache=ResponseCache(db_file="accounts.db"))
 
 # Models for API responses
 class TweetData(BaseModel):
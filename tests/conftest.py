@@ -1,3 +1,9 @@
+import asyncio
+import json
+import os
+from typing import Callable
+
+import httpx
 import pytest
 
 from twscrape.accounts_pool import AccountsPool
@@ -7,11 +13,70 @@ from twscrape.queue_client import QueueClient
 
 set_log_level("ERROR")
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), "mocked-data")
+
+
+def load_data(name: str) -> dict:
+    with open(os.path.join(DATA_DIR, f"{name}.json")) as fp:
+        return json.load(fp)
+
+
+def timeline_page(kv: dict, pages=1) -> httpx.Response:
+    # 3 entries per page, cursor "cur-N" points to page N, last page has no Bottom cursor
+    cur = kv.get("cursor", None)
+    page = 0 if cur is None else int(cur.split("-")[1])
+    entries: list[dict] = [{"entryId": f"tweet-{page}-{x}"} for x in range(3)]
+    if page < pages - 1:
+        cursor = {"cursorType": "Bottom", "value": f"cur-{page + 1}"}
+        entries.append({"entryId": f"cursor-bottom-{page}", "content": cursor})
+    return httpx.Response(200, json={"data": {"entries": entries}})
+
+
+class StubClient:
+    def __init__(self, stub: "Stub", queue: str):
+        self.stub = stub
+        self.queue = queue
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def get(self, url: str, params: dict | None = None):
+        return await self.stub.get(url, params)
+
+
+class Stub:
+    """Replaces account clients: `handler` answers request variables after `latency`"""
+
+    def __init__(self, handler: Callable[[dict], httpx.Response] = timeline_page, latency=0.0):
+        self.handler = handler
+        self.latency = latency
+        self.clients: list[StubClient] = []  # one per account checkout
+        self.requests: list[dict] = []  # variables of all requests
+
+    @property
+    def cursors(self):
+        return [x.get("cursor", None) for x in self.requests]
+
+    def client(self, queue: str):
+        self.clients.append(StubClient(self, queue))
+        return self.clients[-1]
+
+    async def get(self, url: str, params: dict | None = None):
+        kv = json.loads(params["variables"]) if params else {}
+        self.requests.append(kv)
+        await asyncio.sleep(self.latency)  # network
+        return self.handler(kv)
+
 
 @pytest.fixture
-def pool_mock(tmp_path):
+async def pool_mock(tmp_path):
     db_path = tmp_path / "test.db"
-    yield AccountsPool(db_path)
+    pool = AccountsPool(db_path)
+    yield pool
+    await pool.close()
 
 
 @pytest.fixture
@@ -33,3 +98,10 @@ async def api_mock(pool_mock: AccountsPool):
 
     api = API(pool_mock)
     yield api
+
+
+@pytest.fixture
+def stub(api_mock: API, monkeypatch):
+    stub = Stub()
+    monkeypatch.setattr(api_mock, "_client", stub.client)
+    return stub
@@ -1,11 +1,19 @@
+import asyncio
 import os
+from contextlib import aclosing
+from functools import partial
 
+import httpx
 import pytest
 
-from twscrape.accounts_pool import NoAccountError
+from twscrape.accounts_pool import AccountsPool, NoAccountError
 from twscrape.api import API
+from twscrape.cache import ResponseCache
+from twscrape.queue_client import QueueClient
 from twscrape.utils import gather, get_env_bool
 
+from .conftest import Stub, load_data, timeline_page
+
 
 class MockedError(Exception):
     pass
@@ -59,3 +67,227 @@ async def test_raise_when_no_account(api_mock: API):
 
     del os.environ["TWS_RAISE_WHEN_NO_ACCOUNT"]
     assert get_env_bool("TWS_RAISE_WHEN_NO_ACCOUNT") is False
+
+
+async def test_resume(api_mock: API, stub: Stub):
+    stub.handler = partial(timeline_page, pages=5)
+
+    async with aclosing(api_mock.search_raw("foo", resume=True)) as gen:
+        async for _ in gen:
+            if len(stub.requests) == 3:
+                break  # crawl stopped while processing page 3, so 2 pages are done
+
+    ckpt = await api_mock.checkpoints.get("SearchTimeline", api_mock_kv("foo"))
+    assert ckpt is not None
+    assert (ckpt.cursor, ckpt.items, ckpt.pages) == ("cur-2", 6, 2)
+
+    # other variables are not affected
+    assert await api_mock.checkpoints.get("SearchTimeline", api_mock_kv("bar")) is None
+
+    stub.requests.clear()
+    reps = await gather(api_mock.search_raw("foo", limit=12, resume=True))
+    assert stub.cursors == ["cur-2", "cur-3"]  # limit counts items of previous run
+    assert len(reps) == 2
+
+    # finished crawl removes checkpoint, without resume checkpoint is not used
+    assert await api_mock.checkpoints.get_all() == []
+    stub.requests.clear()
+    await gather(api_mock.search_raw("foo"))
+    assert stub.cursors == [None, "cur-1", "cur-2", "cur-3", "cur-4"]
+
+
+def api_mock_kv(q: str):
+    return {"rawQuery": q, "count": 20, "product": "Latest", "querySource": "typed_query"}
+
+
+async def test_users_by_ids(api_mock: API, stub: Stub):
+    user_doc = load_data("raw_user_by_id")
+
+    def handler(kv: dict):
+        uid = int(kv["userId"])
+        if uid == 13:
+            raise ValueError("bad request")
+        return httpx.Response(200, json=user_doc if uid % 2 == 0 else {"data": {}})
+
+    stub.handler = handler
+
+    ids = [2, 3, 4, 4, 13, 6, 2]
+    res = await gather(api_mock.users_by_ids(ids, concurrency=2))
+    assert sorted(int(x["userId"]) for x in stub.requests) == [2, 3, 4, 6, 13]  # once per id
+    assert len(stub.clients) == 2  # one account checkout per worker, not per id
+    assert all(x.queue == "UserByRestId" for x in stub.clients)
+
+    res = {x.key: x for x in res}
+    assert len(res) == 5
+    assert res[2].value is not None and res[2].error is None
+    assert res[3].value is None and res[3].error is None  # not found
+    assert res[13].value is None and isinstance(res[13].error, ValueError)
+
+
+async def test_tweets_by_ids(api_mock: API, stub: Stub):
+    page_doc = load_data("raw_tweet_details")
+    focal, other, missing = 1649191520250245121, 1649191522485817345, 1
+
+    def handler(kv: dict):
+        return httpx.Response(
+            200, json=page_doc if int(kv["focalTweetId"]) == focal else {"data": {}}
+        )
+
+    stub.handler = handler
+
+    res = await gather(api_mock.tweets_by_ids([focal, other, focal, missing], concurrency=1))
+    calls = [int(x["focalTweetId"]) for x in stub.requests]
+    assert calls == [focal, missing]  # other tweet is taken from focal tweet page
+    assert [x.key for x in res] == [focal, other, missing]
+    assert res[0].value is not None and res[0].value.id == focal
+    assert res[1].value is not None and res[1].value.id == other
+    assert res[2].value is None and res[2].error is None
+    assert api_mock.counters["tweets_by_ids.reused"] == 1
+    assert api_mock.counters["tweets_by_ids.requests"] == 2
+
+    # cached pages are not counted as requests
+    api_mock.cache = ResponseCache()
+    await gather(api_mock.tweets_by_ids([focal]))
+    await gather(api_mock.tweets_by_ids([focal]))
+    assert len(stub.requests) == 3
+    assert api_mock.counters["tweets_by_ids.requests"] == 3
+
+
+async def test_run_many(api_mock: API, stub: Stub):
+    stub.handler = partial(timeline_page, pages=2)
+
+    queries = ["a", "b", "c", "a"]
+    res = await gather(api_mock.run_many(api_mock.search_raw, queries, concurrency=1))
+    assert len(stub.clients) == 1  # all queries share one account
+    calls = [x["rawQuery"] for x in stub.requests]
+    assert calls == ["a", "b", "c", "a", "b", "c"]  # pages are interleaved
+    assert sorted(q for q, _ in res) == ["a", "a", "b", "b", "c", "c"]
+
+    # account is shared only inside run_many
+    await gather(api_mock.search_raw("d"))
+    assert len(stub.clients) == 2
+
+
+async def test_prefetch(api_mock: API, stub: Stub):
+    stub.handler = partial(timeline_page, pages=10)
+
+    api_mock.prefetch = 2
+    async with aclosing(api_mock.search_raw("foo", resume=True)) as gen:
+        i = 0
+        async for _ in gen:
+            await asyncio.sleep(0.01)  # slow consumer, next pages are requested meanwhile
+            assert len(stub.requests) == i + 3
+            if i == 2:
+                break
+            i += 1
+
+    await asyncio.sleep(0.01)
+    assert len(stub.requests) == 5  # stopped on close
+
+    # checkpoint is of consumed pages, not of prefetched ones
+    ckpt = await api_mock.checkpoints.get("SearchTimeline", api_mock_kv("foo"))
+    assert ckpt is not None and ckpt.cursor == "cur-2"
+
+    stub.requests.clear()
+    reps = await gather(api_mock.search_raw("foo"))
+    assert len(reps) == 10
+    assert stub.cursors == [None] + [f"cur-{x}" for x in range(1, 10)]
+
+
+async def test_coalesce_items(api_mock: API, stub: Stub):
+    user_doc = load_data("raw_user_by_login")
+    stub.handler = lambda kv: httpx.Response(200, json=user_doc)
+    stub.latency = 0.01
+
+    # concurrent identical calls share request (no account checkout) and parsed user
+    users = await asyncio.gather(*[api_mock.user_by_login("xdevelopers") for _ in range(5)])
+    assert len(stub.clients) == 1 and [x["screen_name"] for x in stub.requests] == ["xdevelopers"]
+    assert all(x is users[0] for x in users) and users[0] is not None
+    assert api_mock.counters["coalesced.items"] == 4
+
+    # raw calls are shared separately, other logins are not shared
+    await asyncio.gather(*[api_mock.user_by_login_raw("xdevelopers") for _ in range(2)])
+    await asyncio.gather(api_mock.user_by_login("a"), api_mock.user_by_login("b"))
+    assert len(stub.clients) == 4 and api_mock.counters["coalesced.items"] == 5
+
+    # not shared after call is finished
+    await api_mock.user_by_login("xdevelopers")
+    assert len(stub.clients) == 5
+
+    # cancel of first caller does not break waiting ones
+    task1 = asyncio.create_task(api_mock.user_by_login("xdevelopers"))
+    task2 = asyncio.create_task(api_mock.user_by_login("xdevelopers"))
+    await asyncio.sleep(0)
+    task1.cancel()
+    assert await task2 is not None
+    assert api_mock._inflight == {}
+
+    api_mock.coalesce = False
+    stub.clients.clear()
+    await asyncio.gather(*[api_mock.user_by_login("xdevelopers") for _ in range(3)])
+    assert len(stub.clients) == 3
+
+
+async def test_coalesce_pages(api_mock: API, stub: Stub):
+    stub.handler = partial(timeline_page, pages=4)
+    stub.latency = 0.01
+
+    # generators started together share each page, second one takes no account
+    res = await asyncio.gather(*[gather(api_mock.search_raw("foo")) for _ in range(3)])
+    assert [len(x) for x in res] == [4, 4, 4]
+    assert len(stub.clients) == 1 and stub.cursors == [None, "cur-1", "cur-2", "cur-3"]
+    assert api_mock.counters["coalesced.pages"] == 8
+
+    # limit does not change requests, so first pages are shared too
+    gen1, gen2 = gather(api_mock.search_raw("foo", limit=6)), gather(api_mock.search_raw("foo"))
+    res = await asyncio.gather(gen1, gen2)
+    assert [len(x) for x in res] == [2, 4]
+    assert api_mock.counters["coalesced.pages"] == 10
+    assert len(stub.clients) == 3  # both accounts are taken lazily, on first not shared page
+
+    await asyncio.gather(gather(api_mock.search_raw("foo")), gather(api_mock.search_raw("bar")))
+    assert len(stub.clients) == 5
+
+
+async def test_bulk_fewer_accounts(tmp_path, monkeypatch):
+    user_doc = load_data("raw_user_by_id")
+    stub = Stub(lambda kv: httpx.Response(200, json=user_doc), latency=0.01)
+    monkeypatch.setattr(QueueClient, "get", lambda self, url, params=None: stub.get(url, params))
+
+    pool = AccountsPool(str(tmp_path / "accounts.db"), raise_when_no_account=True)
+    for x in range(1, 3):
+        await pool.add_account(f"user{x}", f"pass{x}", f"email{x}", f"email_pass{x}")
+        await pool.set_active(f"user{x}", True)
+
+    api = API(pool)
+
+    # 2 accounts for 4 workers: extra workers stop, others do all keys
+    res = await gather(api.users_by_ids(range(10), concurrency=4))
+    assert sorted(x.key for x in res) == list(range(10))
+    assert all(x.value is not None and x.error is None for x in res)
+
+    # no account at all
+    await pool.set_active("user1", False)
+    await pool.set_active("user2", False)
+    with pytest.raises(NoAccountError):
+        await gather(api.users_by_ids(range(10), concurrency=4))
+
+    await pool.close()
+
+
+async def test_run_many_fewer_accounts(tmp_path, monkeypatch):
+    stub = Stub(partial(timeline_page, pages=2), latency=0.01)
+    monkeypatch.setattr(QueueClient, "get", lambda self, url, params=None: stub.get(url, params))
+
+    pool = AccountsPool(str(tmp_path / "accounts.db"), raise_when_no_account=True)
+    await pool.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool.set_active("user1", True)
+
+    api = API(pool)
+
+    # 1 account for pool of 4 clients: calls wait for opened client instead of failing
+    res = await gather(api.run_many(api.search_raw, ["a", "b", "c"], concurrency=4))
+    assert sorted(q for q, _ in res) == ["a", "a", "b", "b", "c", "c"]
+    assert len(stub.requests) == 6
+
+    await pool.close()
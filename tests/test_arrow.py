@@ -0,0 +1,74 @@
+import json
+
+import httpx
+import pytest
+
+from twscrape.models import Tweet, User, parse_tweets, parse_users
+
+from .conftest import load_data
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from twscrape.arrow import ParquetSink, model_schema, to_record_batch, write_parquet  # noqa: E402
+
+
+def test_record_batch():
+    for name in ["raw_search", "raw_user_tweets", "card_poll", "_issue_42"]:
+        items = list(parse_tweets(load_data(name)))
+        batch = to_record_batch(items)
+        assert batch.schema == model_schema(Tweet)
+        assert batch.num_rows == len(items)
+
+        rows = batch.to_pylist()
+        for doc, row in zip(items, rows):
+            assert row["id"] == doc.id
+            assert row["date"] == doc.date
+            assert row["user"]["username"] == doc.user.username
+            assert len(row["links"]) == len(doc.links)
+            assert len(row["media"]["photos"]) == len(doc.media.photos)
+            if doc.card is not None:
+                assert json.loads(row["card"])["_type"] == doc.card._type
+            if doc.retweetedTweet is not None:
+                assert row["retweetedTweet"]["id"] == doc.retweetedTweet.id
+
+    users = list(parse_users(load_data("raw_followers")))
+    batch = to_record_batch(users)
+    assert batch.schema == model_schema(User)
+    assert batch.to_pylist()[0]["username"] == users[0].username
+
+
+def test_record_batch_projection():
+    items = list(parse_tweets(load_data("raw_search"), fields={"id", "user.id"}))
+    rows = to_record_batch(items).to_pylist()
+    assert rows[0]["id"] == items[0].id
+    assert rows[0]["user"]["id"] == items[0].user.id
+    assert rows[0]["rawContent"] is None
+    assert rows[0]["user"]["username"] is None
+
+
+async def test_write_parquet(tmp_path):
+    pages = [httpx.Response(200, json=load_data(x)) for x in ["raw_search", "raw_user_tweets"]]
+    total = sum(len(list(parse_tweets(x))) for x in pages)
+
+    async def gen():
+        for x in pages:
+            yield x
+
+    path = str(tmp_path / "tweets.parquet")
+    rows = await write_parquet(gen(), path, model=Tweet, batch_size=10)
+    assert rows == total
+
+    fp = pq.ParquetFile(path)
+    assert fp.metadata.num_rows == total
+    assert fp.metadata.num_row_groups == (total + 9) // 10
+    assert fp.schema_arrow == model_schema(Tweet)
+
+
+def test_parquet_sink_empty(tmp_path):
+    path = str(tmp_path / "users.parquet")
+    with ParquetSink(path, model=User) as sink:
+        pass
+
+    assert sink.rows == 0
+    assert pq.read_table(path).schema == model_schema(User)
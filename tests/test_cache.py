@@ -0,0 +1,109 @@
+import httpx
+
+from twscrape.api import API
+from twscrape.cache import ResponseCache, cache_key
+
+from .conftest import Stub, load_data
+
+USER_DOC = load_data("raw_user_by_login")
+
+
+def user_rep(found=True):
+    req = httpx.Request("GET", "https://x.com/i/api/graphql/x/UserByScreenName")
+    return httpx.Response(200, json=USER_DOC if found else {"data": {}}, request=req)
+
+
+async def test_cache_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("twscrape.cache.time.time", lambda: now)
+
+    cache = ResponseCache(ttl={"UserByRestId": 0}, negative_ttl=10)
+    await cache.put("UserByScreenName", {"screen_name": "Foo"}, user_rep())
+    await cache.put("UserByScreenName", {"screen_name": "bar"}, user_rep(found=False))
+    await cache.put("UserByRestId", {"userId": "1"}, user_rep())  # disabled op
+    assert len(cache) == 2
+
+    assert await cache.get("UserByScreenName", {"screen_name": "foo"}) is not None
+    assert await cache.get("UserByScreenName", {"screen_name": "bar"}) is not None
+    assert await cache.get("UserByRestId", {"userId": "1"}) is None
+
+    now += 11  # negative ttl passed
+    assert await cache.get("UserByScreenName", {"screen_name": "bar"}) is None
+    assert await cache.get("UserByScreenName", {"screen_name": "FOO"}) is not None
+
+    now += 24 * 3600
+    assert await cache.get("UserByScreenName", {"screen_name": "foo"}) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["negative_hits"] == 1
+    assert stats["misses"] == 2 and stats["expired"] == 2
+    assert stats["items"] == 0 and stats["nbytes"] == 0
+
+
+async def test_cache_errors():
+    cache = ResponseCache()
+    errors = {"errors": [{"message": "Dependency: Unspecified", "code": 131}]}
+    await cache.put("UserByScreenName", {"screen_name": "foo"}, httpx.Response(200, json=errors))
+    rep = httpx.Response(200, json={**errors, "data": {"user": {}}})
+    await cache.put("UserByScreenName", {"screen_name": "bar"}, rep)
+    assert len(cache) == 0 and cache.stats().get("negative_stores", 0) == 0
+
+    # errors next to requested object do not matter
+    rep = httpx.Response(200, json={**USER_DOC, **errors})
+    await cache.put("UserByScreenName", {"screen_name": "xdevelopers"}, rep)
+    assert cache.stats()["stores"] == 1
+
+
+async def test_cache_eviction():
+    cache = ResponseCache(max_items=2)
+    for x in range(3):
+        await cache.put("UserByScreenName", {"screen_name": f"u{x}"}, user_rep())
+    assert len(cache) == 2
+    assert await cache.get("UserByScreenName", {"screen_name": "u0"}) is None
+    assert cache.counters["evictions"] == 1
+
+    size = len(user_rep().content)
+    cache = ResponseCache(max_bytes=size * 2)
+    for x in range(3):
+        await cache.put("UserByScreenName", {"screen_name": f"u{x}"}, user_rep())
+    assert len(cache) == 2 and cache.stats()["nbytes"] == size * 2
+
+
+async def test_cache_db(tmp_path):
+    db_file = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_file=db_file)
+    await cache.put("UserByScreenName", {"screen_name": "foo"}, user_rep())
+
+    cache = ResponseCache(db_file=db_file)  # e.g. after restart
+    rep = await cache.get("UserByScreenName", {"screen_name": "foo"})
+    assert rep is not None and rep.json() == USER_DOC
+    assert cache.counters["hits_db"] == 1
+
+    await cache.get("UserByScreenName", {"screen_name": "foo"})
+    assert cache.counters["hits"] == 1  # promoted to memory
+
+    await cache.clear()
+    assert await cache.get("UserByScreenName", {"screen_name": "foo"}) is None
+
+
+def test_cache_key():
+    a = cache_key("UserByScreenName", {"screen_name": "Foo", "withSafetyModeUserFields": True})
+    b = cache_key("UserByScreenName", {"withSafetyModeUserFields": True, "screen_name": "foo"})
+    assert a == b
+
+
+async def test_api_cache(api_mock: API, stub: Stub):
+    stub.handler = lambda kv: user_rep(found=kv["screen_name"] != "missing")
+    api_mock.cache = ResponseCache()
+
+    user1 = await api_mock.user_by_login("xDevelopers")
+    user2 = await api_mock.user_by_login("xdevelopers")
+    assert user1 is not None and user2 is not None and user1.id == user2.id
+
+    assert await api_mock.user_by_login("missing") is None
+    assert await api_mock.user_by_login("missing") is None  # negative cache
+    assert [x["screen_name"] for x in stub.requests] == ["xDevelopers", "missing"]
+
+    res = [x async for x in api_mock.users_by_logins(["xdevelopers", "other"])]
+    assert [x["screen_name"] for x in stub.requests] == ["xDevelopers", "missing", "other"]
+    assert len(res) == 2
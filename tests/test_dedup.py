@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+from twscrape.api import API
+from twscrape.dedup import BloomFilter, Dedup, LruSet, load_dedup
+from twscrape.utils import gather
+
+from .conftest import Stub, load_data
+
+
+def test_lru_set(tmp_path):
+    obj = LruSet(max_items=3)
+    assert obj.add("a") and obj.add("b") and obj.add("c")
+    assert not obj.add("a")  # a is most recent now
+    assert obj.add("d")  # b evicted
+    assert "b" not in obj and "a" in obj
+    assert len(obj) == 3 and obj.seen == 1
+    assert obj.nbytes > 0
+
+    obj.save(str(tmp_path / "lru.bin"))
+    new = load_dedup(str(tmp_path / "lru.bin"))
+    assert isinstance(new, LruSet)
+    assert new.stats() == obj.stats()
+    assert not new.add("c") and new.add("b")
+
+
+def test_bloom_filter(tmp_path):
+    obj = BloomFilter(capacity=10_000, error_rate=0.01)
+    assert obj.nbytes == (obj.bits_count + 7) // 8
+    assert obj.nbytes < 15_000  # ~1.2 bytes per key for 1%
+
+    new_keys = sum(obj.add(f"tweet:{x}") for x in range(10_000))
+    assert new_keys >= 10_000 * 0.99  # false positives are counted as seen
+    assert all(f"tweet:{x}" in obj for x in range(10_000))  # no false negatives
+    assert not obj.add("tweet:1")
+
+    fp = sum(f"user:{x}" in obj for x in range(10_000)) / 10_000
+    assert fp < 0.02
+    assert 0.005 < obj.error_rate_now < 0.02
+
+    obj.save(str(tmp_path / "bloom.bin"))
+    new = load_dedup(str(tmp_path / "bloom.bin"))
+    assert isinstance(new, BloomFilter)
+    assert new.stats() == obj.stats()
+    assert "tweet:500" in new
+
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=100, error_rate=0)
+
+
+def test_abstract():
+    class NoSave(Dedup):
+        def add(self, key: str) -> bool:
+            return True
+
+    with pytest.raises(TypeError, match="_body"):
+        NoSave()  # pyright: ignore[reportAbstractUsage]
+
+
+async def test_api_dedup(api_mock: API, stub: Stub):
+    page = load_data("raw_search")
+    stub.handler = lambda kv: httpx.Response(200, json=page)  # same tweets on every page
+
+    items = await gather(api_mock.search("foo", limit=40))
+    ids = [x.id for x in items]
+    assert len(ids) > len(set(ids))
+
+    api_mock.dedup = LruSet()
+    items = await gather(api_mock.search("foo", limit=40))
+    assert sorted(x.id for x in items) == sorted(set(ids))
+
+    items = await gather(api_mock.search("bar", limit=40))  # seen in other call
+    assert items == []
+    assert api_mock.dedup.seen == len(ids) * 2 - len(set(ids))
@@ -0,0 +1,154 @@
+import asyncio
+import gzip
+import json
+import os
+import threading
+
+import httpx
+import pytest
+
+from twscrape.models import parse_tweets
+from twscrape.ndjson import NdjsonWriter
+
+from .conftest import load_data
+
+
+def read_lines(path: str) -> list[dict]:
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as fp:
+            return [json.loads(x) for x in fp]
+
+    if path.endswith(".zst"):
+        zstandard = pytest.importorskip("zstandard")
+        with open(path, "rb") as fp, zstandard.ZstdDecompressor().stream_reader(fp) as r:
+            return [json.loads(x) for x in r.read().splitlines()]
+
+    with open(path, "rb") as fp:
+        return [json.loads(x) for x in fp]
+
+
+@pytest.mark.parametrize("ext", ["ndjson", "ndjson.gz", "ndjson.zst"])
+def test_write(tmp_path, ext):
+    if ext.endswith(".zst"):
+        pytest.importorskip("zstandard")
+
+    items = list(parse_tweets(load_data("raw_search")))
+    path = str(tmp_path / f"tweets.{ext}")
+    with NdjsonWriter(path) as out:
+        for x in items:
+            out.write(x)
+
+    assert out.files == [path]
+    assert out.rows == len(items)
+    assert read_lines(path) == [json.loads(x.json()) for x in items]
+
+
+def test_write_projection_and_raw(tmp_path):
+    obj = load_data("raw_search")
+    items = list(parse_tweets(obj, fields={"id", "user.id"}))
+    path = str(tmp_path / "tweets.ndjson")
+    with NdjsonWriter(path) as out:
+        for x in items:
+            out.write(x)
+        out.write(httpx.Response(200, json=obj))
+
+    rows = read_lines(path)
+    assert rows[0] == {"id": items[0].id, "user": {"id": items[0].user.id}}
+    assert rows[-1] == obj
+
+
+def test_rotate(tmp_path):
+    items = list(parse_tweets(load_data("raw_user_tweets")))
+    assert len(items) > 10
+
+    path = str(tmp_path / "tweets.ndjson.gz")
+    with NdjsonWriter(path, rotate_rows=10) as out:
+        for x in items:
+            out.write(x)
+
+    assert len(out.files) == (len(items) + 9) // 10
+    assert out.files[0] == str(tmp_path / "tweets.00001.ndjson.gz")
+    assert sum(len(read_lines(x)) for x in out.files) == len(items)
+
+    path = str(tmp_path / "by_size.ndjson")
+    with NdjsonWriter(path, rotate_bytes=10_000) as out:
+        for x in items:
+            out.write(x)
+
+    assert len(out.files) > 1
+    assert all(os.path.getsize(x) < 10_000 + 20_000 for x in out.files)
+    assert [x["id"] for f in out.files for x in read_lines(f)] == [x.id for x in items]
+
+
+def test_flush_interval(tmp_path):
+    items = list(parse_tweets(load_data("raw_search")))
+    path = str(tmp_path / "tweets.ndjson")
+    out = NdjsonWriter(path, flush_interval=0)
+    out.write(items[0])
+    out.write(items[1])
+    assert len(read_lines(path)) == 2  # visible before close
+    out.close()
+
+
+async def test_flush_timer(tmp_path):
+    items = list(parse_tweets(load_data("raw_search")))
+    path = str(tmp_path / "tweets.ndjson")
+    out = NdjsonWriter(path, flush_interval=0.05)
+    out.write(items[0])
+    assert not os.path.exists(path)  # buffered
+
+    await asyncio.sleep(0.1)  # no more rows (stream stalled), but timer flushes buffer
+    assert len(read_lines(path)) == 1
+    out.close()
+
+
+@pytest.mark.parametrize("ext", ["ndjson", "ndjson.gz", "ndjson.zst"])
+def test_fsync(tmp_path, monkeypatch, ext):
+    if ext.endswith(".zst"):
+        pytest.importorskip("zstandard")
+
+    synced = []
+    monkeypatch.setattr("twscrape.ndjson.os.fsync", synced.append)
+
+    items = list(parse_tweets(load_data("raw_search")))
+    path = str(tmp_path / f"tweets.{ext}")
+    out = NdjsonWriter(path, fsync_interval=0)
+    out.write(items[0])
+    out.flush()
+    assert len(synced) == 1  # fd of file under compressed stream
+    assert os.path.getsize(path) > 0  # compressed data is flushed too
+    out.close()
+    assert len(synced) == 2 and len(read_lines(path)) == 1
+
+    synced.clear()
+    with NdjsonWriter(path, fsync_interval=None) as out:
+        out.write(items[0])
+        out.flush()
+    assert synced == []
+
+
+async def test_writer_thread(tmp_path, monkeypatch):
+    threads = []
+    monkeypatch.setattr(
+        "twscrape.ndjson.os.fsync", lambda fd: threads.append(threading.current_thread())
+    )
+
+    items = list(parse_tweets(load_data("raw_search")))
+    path = str(tmp_path / "tweets.ndjson.gz")
+    with NdjsonWriter(path, buffer_size=1, fsync_interval=0) as out:
+        for x in items:
+            out.write(x)
+        out.flush()
+
+    # writes and fsync are done outside of event loop thread
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    assert read_lines(path) == [json.loads(x.json()) for x in items]
+
+
+def test_empty(tmp_path):
+    path = str(tmp_path / "tweets.ndjson")
+    with NdjsonWriter(path) as out:
+        pass
+
+    assert out.files == [path]
+    assert read_lines(path) == []
@@ -1,11 +1,15 @@
+import glob
 import json
 import os
 from typing import Callable
 
+import pytest
+
 from twscrape import API, gather
 from twscrape.models import (
     AudiospaceCard,
     BroadcastCard,
+    LazyModel,
     PollCard,
     SummaryCard,
     Trend,
@@ -13,7 +17,10 @@ from twscrape.models import (
     User,
     UserRef,
     parse_tweet,
+    parse_tweets,
+    parse_users,
 )
+from twscrape.utils import find_obj
 
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "mocked-data")
@@ -33,6 +40,10 @@ class FakeRep:
     def __init__(self, text: str):
         self.text = text
 
+    @property
+    def content(self):
+        return self.text.encode()
+
     def json(self):
         return json.loads(self.text)
 
@@ -199,6 +210,84 @@ async def test_search():
     assert bookmarks_count > 0, "`bookmark_fields` key is changed or unluck search data"
 
 
+def test_lazy_tweets():
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "*.json"))):
+        rep = fake_rep(fp).json()
+        eager = list(parse_tweets(rep))
+        lazy = list(parse_tweets(rep, lazy=True))
+        assert [x.id for x in lazy] == [x.id for x in eager], fp
+
+        for a, b in zip(lazy, eager):
+            assert a.user is a.user  # memoized
+            assert a.rawContent == b.rawContent
+            assert a.to_tweet() == b
+            assert a.dict() == b.dict()
+            assert a.json() == b.json()
+
+
+def test_lazy_users():
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "*.json"))):
+        rep = fake_rep(fp).json()
+        eager = list(parse_users(rep))
+        lazy = list(parse_users(rep, lazy=True))
+        assert [x.to_user() for x in lazy] == eager, fp
+        assert [x.json() for x in lazy] == [x.json() for x in eager], fp
+
+    class NoUrl(LazyModel):
+        _model = User
+
+    with pytest.raises(TypeError):
+        NoUrl({}, {})  # pyright: ignore[reportAbstractUsage]
+
+
+async def test_fields_projection():
+    api = get_api()
+    mock_rep(api.search_raw, "raw_search", as_generator=True)
+
+    fields = {"id", "date", "rawContent", "user.id", "media.photos", "quotedTweet.user.username"}
+    items = await gather(api.search("elon musk lang:en", limit=20, fields=fields))
+    assert len(items) > 0
+
+    for doc in items:
+        obj = doc.dict()
+        assert set(obj.keys()) == {"id", "date", "rawContent", "user", "media", "quotedTweet"}
+        assert obj["user"] == {"id": doc.user.id}
+        assert set(obj["media"].keys()) == {"photos"}
+        if doc.quotedTweet is not None:
+            assert obj["quotedTweet"] == {"user": {"username": doc.quotedTweet.user.username}}
+
+        assert "card" not in doc._cache and "links" not in doc._cache  # not parsed
+        assert json.loads(doc.json())["id"] == doc.id
+
+    with pytest.raises(ValueError, match="Unknown field 'nope' of Tweet"):
+        await gather(api.search("elon musk lang:en", limit=20, fields={"id", "nope"}))
+
+    with pytest.raises(ValueError, match="Unknown field 'nope' of User"):
+        list(parse_users(fake_rep("raw_followers").json(), fields={"id", "nope"}))
+
+    # broken item is skipped on parse like in eager mode, not raised later from `dict()`
+    rep = fake_rep("raw_search").json()
+    legacy = find_obj(rep, lambda x: "created_at" in x and "full_text" in x)
+    assert legacy is not None
+    del legacy["created_at"]
+
+    eager = list(parse_tweets(rep))
+    items = list(parse_tweets(rep, fields={"id", "date", "user.id"}))
+    assert [x.id for x in items] == [x.id for x in eager]
+    assert all(x.dict()["date"] is not None for x in items)
+
+
+async def test_models_slotted():
+    api = get_api()
+    mock_rep(api.search_raw, "raw_search", as_generator=True)
+
+    items = await gather(api.search("elon musk lang:en", limit=20))
+    for doc in items:
+        assert not hasattr(doc, "__dict__")
+        assert not hasattr(doc.user, "__dict__")
+        assert doc.dict()["_type"] == "snscrape.modules.twitter.Tweet"
+
+
 async def test_user_by_id():
     api = get_api()
     mock_rep(api.user_by_id_raw, "raw_user_by_id")
@@ -1,5 +1,13 @@
-from twscrape.accounts_pool import AccountsPool
-from twscrape.utils import utc
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from twscrape.accounts_pool import AccountsPool, NoAccountError
+from twscrape.db import close_db, fetchone, get_db
+from twscrape.strategies import LeastRecentlyUsed, MostRemaining, SelectionStrategy, Sharded
+from twscrape.utils import shard_of, utc
 
 
 async def test_add_accounts(pool_mock: AccountsPool):
@@ -136,3 +144,256 @@ async def test_get_stats(pool_mock: AccountsPool):
     assert stats["total"] == 1
     assert stats["active"] == 1
     assert stats[f"locked_{Q}"] == 1
+
+
+async def test_db_connections_reused(pool_mock: AccountsPool):
+    Q = "test_queue"
+
+    await pool_mock.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool_mock.set_active("user1", True)
+
+    db = get_db(pool_mock._db_file)
+    for _ in range(20):
+        acc = await pool_mock.get_for_queue(Q)
+        assert acc is not None
+        await pool_mock.unlock(acc.username, Q)
+        assert len(await pool_mock.get_all()) == 1
+
+    # one writer + bounded readers
+    assert len(db._opened) <= 1 + db.max_readers
+
+    # pool can be used after close
+    await pool_mock.close()
+    assert len(db._opened) == 0
+    assert len(await pool_mock.get_all()) == 1
+
+
+async def test_db_wal_mode(pool_mock: AccountsPool):
+    await pool_mock.add_account("user1", "pass1", "email1", "email_pass1")
+
+    rs = await fetchone(pool_mock._db_file, "PRAGMA journal_mode")
+    assert rs is not None and rs[0] == "wal"
+
+
+async def test_in_memory_scheduler(tmp_path):
+    Q = "test_queue"
+    pool = AccountsPool(tmp_path / "mem.db", in_memory=True, flush_interval=60)
+    for x in range(1, 3):
+        await pool.add_account(f"user{x}", f"pass{x}", f"email{x}", f"email_pass{x}")
+        await pool.set_active(f"user{x}", True)
+
+    acc1 = await pool.get_for_queue(Q)
+    acc2 = await pool.get_for_queue(Q)
+    assert acc1 is not None and acc1.username == "user1"
+    assert acc2 is not None and acc2.username == "user2"
+    assert await pool.get_for_queue(Q) is None
+
+    # should be available again after unlock
+    await pool.unlock("user1", Q, req_count=2)
+    acc = await pool.get_for_queue(Q)
+    assert acc is not None and acc.username == "user1"
+
+    # pending changes should be visible on read
+    end_time = utc.ts() + 60
+    await pool.lock_until("user2", Q, end_time, req_count=3)
+    acc = await pool.get("user2")
+    assert int(acc.locks[Q].timestamp()) == end_time
+    assert acc.stats[Q] == 3
+    assert (await pool.stats())[f"locked_{Q}"] == 2
+
+    # direct db changes should be visible for scheduler
+    await pool.reset_locks()
+    acc = await pool.get_for_queue(Q)
+    assert acc is not None and acc.username == "user1"
+
+    await pool.mark_inactive("user2", "banned")
+    await pool.close()
+
+    # state should be persisted on close
+    pool = AccountsPool(tmp_path / "mem.db")
+    acc = await pool.get("user1")
+    assert acc.stats[Q] == 2
+    assert Q in acc.locks
+    acc = await pool.get("user2")
+    assert acc.active is False
+    assert acc.error_msg == "banned"
+
+    # and on interpreter exit
+    pool = AccountsPool(tmp_path / "mem.db", in_memory=True, flush_interval=60)
+    await pool.set_active("user2", True)
+    await pool.mark_inactive("user1", "banned")
+    await close_db(str(tmp_path / "mem.db"))
+    assert pool._scheduler is not None
+    pool._scheduler.flush_sync()
+    acc = await AccountsPool(tmp_path / "mem.db").get("user1")
+    assert acc.active is False and acc.error_msg == "banned"
+
+
+async def test_batched_writes(tmp_path):
+    Q = "test_queue"
+    pool = AccountsPool(tmp_path / "batch.db", write_delay=60)
+    await pool.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool.set_active("user1", True)
+
+    # updates of same account & queue are merged
+    acc = await pool.get_for_queue(Q)
+    assert acc is not None
+    await pool.lock_until("user1", Q, utc.ts() + 60, req_count=2)
+    await pool.unlock("user1", Q, req_count=3)
+    assert len(pool._writes or []) == 1
+
+    # queued unlock should not block checkout
+    acc = await pool.get_for_queue(Q)
+    assert acc is not None and acc.username == "user1"
+    assert (await pool.get("user1")).stats[Q] == 5
+
+    # pending updates should be written on close
+    await pool.unlock("user1", Q, req_count=1)
+    await pool.close()
+    acc = await AccountsPool(tmp_path / "batch.db").get("user1")
+    assert acc.stats[Q] == 6
+    assert Q not in acc.locks
+
+    # and on interpreter exit
+    await pool.unlock("user1", Q, req_count=1)
+    await close_db(str(tmp_path / "batch.db"))
+    assert pool._writes is not None
+    pool._writes.flush_sync()
+    acc = await AccountsPool(tmp_path / "batch.db").get("user1")
+    assert acc.stats[Q] == 7
+
+
+async def test_selection_strategies(pool_mock: AccountsPool):
+    Q = "test_queue"
+    for x in range(1, 4):
+        await pool_mock.add_account(f"user{x}", f"pass{x}", f"email{x}", f"email_pass{x}")
+        await pool_mock.set_active(f"user{x}", True)
+
+    async def take():
+        acc = await pool_mock.get_for_queue(Q)
+        assert acc is not None
+        await pool_mock.unlock(acc.username, Q)
+        return acc.username
+
+    # least recently used: accounts are taken in turn
+    pool_mock._strategy = LeastRecentlyUsed()
+    for x in ["user1", "user2", "user3"]:
+        acc = await pool_mock.get_for_queue(Q)
+        assert acc is not None and acc.username == x
+    await pool_mock.reset_locks()
+
+    # most remaining: unknown budget is treated as full, spent budget is used last
+    pool_mock._strategy = MostRemaining()
+    reset = utc.ts() + 600
+    await pool_mock.unlock("user1", Q, limit=(5, reset))
+    await pool_mock.unlock("user2", Q, limit=(40, reset))
+    await pool_mock.unlock("user3", Q, limit=(0, utc.ts() - 10))  # window is over
+    await pool_mock._flush()
+    assert await take() == "user3"
+    await pool_mock.unlock("user3", Q, limit=(1, reset))
+    await pool_mock._flush()
+    assert await take() == "user2"
+
+    # sharded: worker takes own accounts first, then others
+    shards = {x: shard_of(x, 2) for x in ["user1", "user2", "user3"]}
+    for worker in range(2):
+        pool_mock._strategy = Sharded(worker, 2)
+        assert shards[await take()] == worker or worker not in shards.values()
+
+    with pytest.raises(ValueError):
+        Sharded(2, 2)
+
+    class NoOrder(SelectionStrategy):
+        pass
+
+    with pytest.raises(TypeError):
+        NoOrder()  # pyright: ignore[reportAbstractUsage]
+
+
+async def test_wait_woken_on_unlock(pool_mock: AccountsPool):
+    Q = "test_queue"
+    pool_mock._max_waiters = 2
+    await pool_mock.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool_mock.set_active("user1", True)
+
+    acc = await pool_mock.get_for_queue(Q)
+    assert acc is not None
+
+    order = []
+
+    async def waiter(name: str):
+        acc = await pool_mock.get_for_queue_or_wait(Q)
+        assert acc is not None
+        order.append(name)
+        await pool_mock.unlock(acc.username, Q)
+
+    t1 = asyncio.create_task(waiter("first"))
+    await asyncio.sleep(0.05)
+    t2 = asyncio.create_task(waiter("second"))
+    await asyncio.sleep(0.05)
+
+    # too many waiters
+    with pytest.raises(NoAccountError):
+        await pool_mock.get_for_queue_or_wait(Q)
+
+    # waiters should be resumed right after unlock (not after poll interval) in FIFO order
+    t0 = time.perf_counter()
+    await pool_mock.unlock("user1", Q)
+    await asyncio.wait_for(asyncio.gather(t1, t2), timeout=2)
+    assert time.perf_counter() - t0 < 1
+    assert order == ["first", "second"]
+
+
+async def test_account_lease(tmp_path):
+    Q = "test_queue"
+    pool1 = AccountsPool(tmp_path / "lease.db", lease_ttl=2)
+    pool2 = AccountsPool(tmp_path / "lease.db", lease_ttl=2)
+    await pool1.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool1.set_active("user1", True)
+
+    acc = await pool1.get_for_queue(Q)
+    assert acc is not None
+    assert await pool2.get_for_queue(Q) is None
+
+    # lease can be renewed only by owner
+    assert await pool1.renew_lease("user1", Q)
+    assert not await pool2.renew_lease("user1", Q)
+
+    # not renewed lease expires and account can be taken by other owner
+    await asyncio.sleep(2.1)
+    acc = await pool2.get_for_queue(Q)
+    assert acc is not None and acc.username == "user1"
+    assert not await pool1.renew_lease("user1", Q)
+
+    # released account has no lease
+    await pool2.unlock("user1", Q)
+    await pool2.close()
+    assert not await pool2.renew_lease("user1", Q)
+    await pool1.close()
+
+
+async def test_migrate_json_locks(tmp_path):
+    db_path = str(tmp_path / "old.db")
+
+    # db created by version with json locks & stats columns (v4)
+    pool = AccountsPool(db_path)
+    await pool.add_account("user1", "pass1", "email1", "email_pass1")
+    await pool.close()
+
+    with sqlite3.connect(db_path) as db:
+        db.execute("DELETE FROM account_locks")
+        db.execute("DELETE FROM account_stats")
+        locks = (
+            '{"SearchTimeline": "2100-01-01T10:00:00+00:00", "Followers": "2100-01-02 10:00:00"}'
+        )
+        stats = '{"SearchTimeline": 10, "Followers": "bad"}'
+        db.execute("UPDATE accounts SET locks = ?, stats = ?", (locks, stats))
+        db.execute("PRAGMA user_version = 4")
+
+    pool = AccountsPool(db_path)
+    acc = await pool.get("user1")
+    assert acc.locks["SearchTimeline"] == utc.from_iso("2100-01-01 10:00:00")
+    assert acc.locks["Followers"] == utc.from_iso("2100-01-02 10:00:00")
+    assert acc.stats == {"SearchTimeline": 10}
+    assert await pool.get_for_queue("SearchTimeline") is None
+    await pool.close()
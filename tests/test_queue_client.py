@@ -1,10 +1,14 @@
+import asyncio
 from contextlib import aclosing
 
 import httpx
+import pytest
 from pytest_httpx import HTTPXMock
 
 from twscrape.accounts_pool import AccountsPool
+from twscrape.db import execute, fetchone
 from twscrape.queue_client import QueueClient
+from twscrape.transport import SharedTransport, close_transports, use_http2
 
 DB_FILE = "/tmp/twscrape_test_queue_client.db"
 URL = "https://example.com/api"
@@ -101,8 +105,11 @@ async def test_retry_with_same_acc_on_network_error(httpx_mock: HTTPXMock, clien
     locked1 = await get_locked(pool)
     assert len(locked1) == 1
 
-    # timeout on first request, account should not be switched
+    # timeout on first requests, account should not be switched
     httpx_mock.add_exception(httpx.ReadTimeout("Unable to read within timeout"))
+    httpx_mock.add_exception(httpx.PoolTimeout("No connection in pool"))
+    httpx_mock.add_exception(httpx.PoolTimeout("No connection in pool"))
+    httpx_mock.add_exception(httpx.PoolTimeout("No connection in pool"))
     httpx_mock.add_response(url=URL, json={"foo": "2"}, status_code=200)
 
     rep = await client.get(URL)
@@ -156,3 +163,77 @@ async def test_ctx_closed_on_break(httpx_mock: HTTPXMock, client_fixture: CF):
 
     # ctx should be None after break
     assert client.ctx is None
+
+
+async def test_rate_limit_stored_on_unlock(httpx_mock: HTTPXMock, client_fixture: CF):
+    pool, client = client_fixture
+
+    headers = {"x-rate-limit-remaining": "42", "x-rate-limit-reset": "4102444800"}
+    httpx_mock.add_response(url=URL, json={"foo": "bar"}, status_code=200, headers=headers)
+
+    async with client:
+        assert (await client.get(URL)) is not None
+
+    await pool._flush()
+    qs = "SELECT limit_remaining, limit_reset FROM account_stats WHERE username = 'user1'"
+    rs = await fetchone(pool._db_file, qs)
+    assert rs is not None and tuple(rs) == (42, 4102444800)
+
+
+async def test_lease_renewed_while_used(httpx_mock: HTTPXMock, client_fixture: CF):
+    pool, client = client_fixture
+    pool.lease_ttl = 2
+
+    async with client:
+        await asyncio.sleep(2.5)  # longer than lease, but heartbeat renews it
+        assert "user1" in await get_locked(pool)
+
+        # lease taken by other owner, client should switch account
+        qs = """
+        UPDATE account_locks SET owner = 'other', unlock_at = datetime('now', '+60 seconds')
+        WHERE username = 'user1'
+        """
+        await execute(pool._db_file, qs)
+        await asyncio.sleep(1)
+
+        httpx_mock.add_response(url=URL, json={"foo": "bar"}, status_code=200)
+        rep = await client.get(URL)
+        assert rep is not None
+        assert getattr(rep, "__username") == "user2"
+
+
+async def test_connections_shared_between_accounts(client_fixture: CF):
+    pool, _ = client_fixture
+    acc1, acc2 = await pool.get("user1"), await pool.get("user2")
+    acc1.cookies, acc2.cookies = {"ct0": "a"}, {"ct0": "b"}
+
+    clt1, clt2 = acc1.make_client(), acc2.make_client()
+    assert isinstance(clt1._transport, SharedTransport)
+    assert isinstance(clt2._transport, SharedTransport)
+    assert clt1._transport._transport is clt2._transport._transport
+    assert clt1.headers["x-csrf-token"] == "a" and clt2.headers["x-csrf-token"] == "b"
+    assert clt1._transport._transport._pool._max_connections > 100  # not limited by default
+
+    # shared connections are not closed with client
+    await clt1.aclose()
+    assert acc1.make_client(proxy="http://localhost:1080")._transport is not clt2._transport
+    await close_transports()
+
+
+async def test_http2_per_proxy(client_fixture: CF):
+    pytest.importorskip("h2")
+    pool, _ = client_fixture
+    acc = await pool.get("user1")
+    proxy = "http://localhost:1080"
+
+    assert use_http2(True, proxy) and not use_http2(False, None)
+    assert use_http2({None}, None) and not use_http2({None}, proxy)
+    assert use_http2(proxy, proxy) and not use_http2(proxy, None)  # single proxy
+    assert not use_http2(proxy, "localhost")  # not substring
+
+    # http/1.1 and http/2 connections are kept separately
+    clt1, clt2 = acc.make_client(), acc.make_client(http2={None})
+    assert clt1._transport is not clt2._transport
+    assert clt2._transport is acc.make_client(http2=True)._transport
+    assert acc.make_client(proxy, http2={None})._transport is not clt2._transport
+    await close_transports()
@@ -1,6 +1,26 @@
+import asyncio
+import glob
+import json
+import os
+from collections import defaultdict
+from contextlib import aclosing
+
+import httpx
 import pytest
 
-from twscrape.utils import parse_cookies
+from twscrape.utils import (
+    find_obj,
+    gather,
+    get_by_path,
+    get_typed_object,
+    parse_cookies,
+    read_ahead,
+    rep_json,
+    walk_doc,
+    walk_rep,
+)
+
+from .conftest import DATA_DIR
 
 
 def test_cookies_parse():
@@ -25,3 +45,66 @@ def test_cookies_parse():
     with pytest.raises(ValueError, match=r"Invalid cookie value: .+"):
         val = "{invalid}"
         assert parse_cookies(val) == {}
+
+
+def test_walk_doc():
+    for fp in sorted(glob.glob(os.path.join(DATA_DIR, "raw_*.json"))):
+        with open(fp) as f:
+            obj = json.load(f)
+
+        doc = walk_doc(obj)
+        assert doc.entries == (get_by_path(obj, "entries") or []), fp
+
+        for ct in ["Top", "Bottom", "ShowMoreThreads"]:
+            cur = find_obj(obj, lambda x: x.get("cursorType") == ct)
+            assert doc.cursors.get(ct) == (cur.get("value") if cur else None), fp
+
+        typed = get_typed_object(obj, defaultdict(list))
+        assert doc.typed.keys() == typed.keys(), fp
+        for k, v in typed.items():
+            assert [id(x) for x in doc.typed[k]] == [id(x) for x in v], fp
+
+
+def test_rep_decoded_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr("twscrape.utils._json_loads", lambda x: calls.append(x) or json.loads(x))
+
+    rep = httpx.Response(200, json={"data": {"entries": [{"entryId": "tweet-1"}]}})
+    obj = rep_json(rep)
+    assert rep_json(rep) is obj
+    assert walk_rep(rep).entries == [{"entryId": "tweet-1"}]
+    assert len(calls) == 1
+
+
+async def test_read_ahead():
+    produced, closed = [], []
+
+    async def gen(n: int, fail=False):
+        try:
+            for x in range(n):
+                await asyncio.sleep(0)
+                produced.append(x)
+                yield x
+            if fail:
+                raise ValueError("failed")
+        finally:
+            closed.append(True)
+
+    res = []
+    async for x in read_ahead(gen(5), 2):
+        await asyncio.sleep(0.01)  # slow consumer
+        res.append(x)
+        assert len(produced) - len(res) <= 2  # not more than size items ahead
+    assert res == [0, 1, 2, 3, 4]
+    assert closed == [True]
+
+    produced, closed = [], []
+    async with aclosing(read_ahead(gen(100), 3)) as it:
+        async for x in it:
+            await asyncio.sleep(0.01)
+            break
+    assert len(produced) <= 4
+    assert closed == [True]  # source is closed on consumer break
+
+    with pytest.raises(ValueError):
+        await gather(read_ahead(gen(3, fail=True), 2))
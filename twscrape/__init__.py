@@ -1,7 +1,7 @@
 # ruff: noqa: F401
 from .account import Account
 from .accounts_pool import AccountsPool, NoAccountError
-from .api import API
+from .api import API, BulkResult
 from .logger import set_log_level
 from .models import *  # noqa: F403
 from .utils import gather
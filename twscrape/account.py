@@ -4,11 +4,59 @@ import sqlite3
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 
-from httpx import AsyncClient, AsyncHTTPTransport
+from httpx import AsyncClient
 
 from .models import JSONTrait
+from .transport import MAX_STREAMS, Http2Config, get_transport, use_http2
 from .utils import utc
 
+# locks and stats are stored in separate tables, but returned as json columns for from_rs
+# account_locks has row for each account & queue, free account has UNLOCKED value, so
+# available accounts can be found by index range (unlock_at <= now)
+UNLOCKED = "1970-01-01 00:00:00"
+
+ACCOUNTS_QS = f"""
+SELECT
+    a.username, a.password, a.email, a.email_password, a.user_agent, a.active, a.headers,
+    a.cookies, a.proxy, a.error_msg, a.last_used, a._tx, a.mfa_code,
+    (
+        SELECT json_group_object(queue, unlock_at) FROM account_locks
+        WHERE username = a.username AND unlock_at > '{UNLOCKED}'
+    ) AS locks,
+    (SELECT json_group_object(queue, req_count) FROM account_stats WHERE username = a.username) AS stats
+FROM accounts a
+"""
+
+LOCKS_INSERT_QS = """
+INSERT INTO account_locks (username, queue, unlock_at) VALUES (:username, :queue, :unlock_at)
+ON CONFLICT(username, queue) DO UPDATE SET unlock_at = excluded.unlock_at, owner = NULL
+"""
+
+LOCKS_RESET_QS = f"""
+UPDATE account_locks SET unlock_at = '{UNLOCKED}', owner = NULL WHERE username = :username
+"""
+
+STATS_INSERT_QS = """
+INSERT INTO account_stats (username, queue, req_count) VALUES (:username, :queue, :req_count)
+ON CONFLICT(username, queue) DO UPDATE SET req_count = excluded.req_count
+"""
+
+# increments request counter and keeps last seen rate limit (when it's known)
+STATS_UPDATE_QS = """
+INSERT INTO account_stats (username, queue, req_count, limit_remaining, limit_reset)
+VALUES (:username, :queue, :req_count, :limit_remaining, :limit_reset)
+ON CONFLICT(username, queue) DO UPDATE SET
+    req_count = req_count + excluded.req_count,
+    limit_remaining = COALESCE(excluded.limit_remaining, limit_remaining),
+    limit_reset = COALESCE(excluded.limit_reset, limit_reset)
+"""
+
+
+def db_time(x: datetime | None):
+    # same format as sqlite datetime(), so values can be compared in sql queries
+    return x.strftime("%Y-%m-%d %H:%M:%S") if x else None
+
+
 TOKEN = "Bearer AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
 
 
@@ -50,13 +98,27 @@ class Account(JSONTrait):
         rs["last_used"] = rs["last_used"].isoformat() if rs["last_used"] else None
         return rs
 
-    def make_client(self, proxy: str | None = None) -> AsyncClient:
+    def locks_rs(self):
+        return [
+            {"username": self.username, "queue": k, "unlock_at": db_time(v)}
+            for k, v in self.locks.items()
+        ]
+
+    def stats_rs(self):
+        return [
+            {"username": self.username, "queue": k, "req_count": v} for k, v in self.stats.items()
+        ]
+
+    def make_client(
+        self, proxy: str | None = None, http2: Http2Config = False, max_streams=MAX_STREAMS
+    ) -> AsyncClient:
         proxies = [proxy, os.getenv("TWS_PROXY"), self.proxy]
         proxies = [x for x in proxies if x is not None]
         proxy = proxies[0] if proxies else None
 
-        transport = AsyncHTTPTransport(retries=2)
-        client = AsyncClient(proxy=proxy, follow_redirects=True, transport=transport)
+        # connections are shared between accounts with same proxy
+        transport = get_transport(proxy, use_http2(http2, proxy), max_streams)
+        client = AsyncClient(follow_redirects=True, transport=transport)
 
         # saved from previous usage
         client.cookies.update(self.cookies)
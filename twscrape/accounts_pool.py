@@ -1,17 +1,36 @@
 import asyncio
-import sqlite3
+import os
+import socket
 import uuid
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import TypedDict
 
 from fake_useragent import UserAgent
 from httpx import HTTPStatusError
 
-from .account import Account
-from .db import execute, fetchall, fetchone
+from .account import (
+    ACCOUNTS_QS,
+    LOCKS_INSERT_QS,
+    LOCKS_RESET_QS,
+    STATS_INSERT_QS,
+    STATS_UPDATE_QS,
+    UNLOCKED,
+    Account,
+)
+from .db import close_db, execute, fetchall, fetchone, transaction
 from .logger import logger
 from .login import LoginConfig, login
+from .scheduler import AccountsScheduler
+from .strategies import SelectionStrategy
 from .utils import get_env_bool, parse_cookies, utc
+from .write_queue import WriteQueue
+
+LEASE_TTL = 120  # seconds
+WAIT_POLL = 5.0  # max seconds between checks when waiting for account
+
+RateLimit = tuple[int, int] | None  # last seen (x-rate-limit-remaining, x-rate-limit-reset)
 
 
 class NoAccountError(Exception):
@@ -34,17 +53,83 @@ def guess_delim(line: str):
 
 class AccountsPool:
     # _order_by: str = "RANDOM()"
-    _order_by: str = "username"
+    # free accounts first (ordered by username), then accounts with expired locks
+    _order_by: str = "unlock_at, username"
 
     def __init__(
         self,
         db_file="accounts.db",
         login_config: LoginConfig | None = None,
         raise_when_no_account=False,
+        in_memory=False,
+        flush_interval=1.0,
+        write_delay=0.05,
+        write_batch=100,
+        strategy: SelectionStrategy | None = None,
+        fair_wait=True,
+        max_waiters: int | None = None,
+        lease_ttl=LEASE_TTL,
     ):
+        """
+        in_memory: serve account checkouts from in-process scheduler and write
+            changes to db every `flush_interval` seconds, on `close()` and on interpreter exit
+            (only for single process usage)
+        write_delay: max seconds lock / unlock / stats updates can wait to be written
+            together with others (0 to write each update immediately)
+        write_batch: number of queued updates which triggers write without waiting
+        strategy: in which order free accounts are taken, see `twscrape.strategies`
+            (not used with in_memory, scheduler takes accounts by username)
+        fair_wait: accounts released in this process are given to waiters in FIFO order
+            (otherwise all waiters are woken and compete)
+        max_waiters: max number of coroutines waiting for account of same queue,
+            `NoAccountError` is raised for next ones
+        lease_ttl: seconds account is locked on checkout, QueueClient renews lease while
+            account is in use, so accounts of stopped process are available after this time
+        """
         self._db_file = db_file
         self._login_config = login_config or LoginConfig()
         self._raise_when_no_account = raise_when_no_account
+        self._scheduler = AccountsScheduler(db_file, flush_interval) if in_memory else None
+        self._strategy = strategy
+        self._known_queues: set[str] = set()
+        self._fair_wait = fair_wait
+        self._max_waiters = max_waiters
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self.lease_ttl = lease_ttl
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._writes = (
+            WriteQueue(db_file, write_delay, write_batch)
+            if write_delay > 0 and not in_memory
+            else None
+        )
+
+    async def close(self):
+        # close db connections, pool can be used again after (connections will be reopened)
+        if self._scheduler is not None:
+            await self._scheduler.close()
+        if self._writes is not None:
+            await self._writes.flush()
+        await close_db(self._db_file)
+
+    async def _flush(self):
+        # make pending in-memory changes visible in db before reading it
+        if self._scheduler is not None:
+            await self._scheduler.flush()
+        if self._writes is not None:
+            await self._writes.flush()
+
+    @asynccontextmanager
+    async def _db_write(self):
+        # direct db writes should not be overwritten by in-memory state or queued updates
+        if self._writes is not None:
+            await self._writes.flush()
+
+        if self._scheduler is None:
+            yield
+            return
+
+        async with self._scheduler.paused():
+            yield
 
     async def load_from_file(self, filepath: str, line_format: str):
         line_delim = guess_delim(line_format)
@@ -117,26 +202,30 @@ class AccountsPool:
             return
 
         qs = f"""DELETE FROM accounts WHERE username IN ({",".join([f'"{x}"' for x in usernames])})"""
-        await execute(self._db_file, qs)
+        async with self._db_write():
+            await execute(self._db_file, qs)
 
     async def delete_inactive(self):
         qs = "DELETE FROM accounts WHERE active = false"
-        await execute(self._db_file, qs)
+        async with self._db_write():
+            await execute(self._db_file, qs)
 
     async def get(self, username: str):
-        qs = "SELECT * FROM accounts WHERE username = :username"
+        await self._flush()
+        qs = f"{ACCOUNTS_QS} WHERE username = :username"
         rs = await fetchone(self._db_file, qs, {"username": username})
         if not rs:
             raise ValueError(f"Account {username} not found")
         return Account.from_rs(rs)
 
     async def get_all(self):
-        qs = "SELECT * FROM accounts"
-        rs = await fetchall(self._db_file, qs)
+        await self._flush()
+        rs = await fetchall(self._db_file, ACCOUNTS_QS)
         return [Account.from_rs(x) for x in rs]
 
     async def get_account(self, username: str):
-        qs = "SELECT * FROM accounts WHERE username = :username"
+        await self._flush()
+        qs = f"{ACCOUNTS_QS} WHERE username = :username"
         rs = await fetchone(self._db_file, qs, {"username": username})
         if not rs:
             return None
@@ -144,13 +233,31 @@ class AccountsPool:
 
     async def save(self, account: Account):
         data = account.to_rs()
+        del data["locks"], data["stats"]  # stored in separate tables
         cols = list(data.keys())
 
         qs = f"""
         INSERT INTO accounts ({",".join(cols)}) VALUES ({",".join([f":{x}" for x in cols])})
         ON CONFLICT(username) DO UPDATE SET {",".join([f"{x}=excluded.{x}" for x in cols])}
         """
-        await execute(self._db_file, qs, data)
+
+        # new account should get lock rows for all known queues
+        ensure_qs = f"""
+        INSERT OR IGNORE INTO account_locks (username, queue, unlock_at)
+        SELECT :username, queue, '{UNLOCKED}' FROM account_locks GROUP BY queue
+        """
+
+        kv = {"username": account.username}
+        async with self._db_write(), transaction(self._db_file) as db:
+            await db.execute(qs, data)
+            await db.execute(LOCKS_RESET_QS, kv)
+            await db.execute(ensure_qs, kv)
+            await db.executemany(LOCKS_INSERT_QS, account.locks_rs())
+            await db.execute("DELETE FROM account_stats WHERE username = :username", kv)
+            await db.executemany(STATS_INSERT_QS, account.stats_rs())
+
+        if account.active:
+            self._wake()
 
     async def login(self, account: Account):
         try:
@@ -169,11 +276,12 @@ class AccountsPool:
 
     async def login_all(self, usernames: list[str] | None = None):
         if usernames is None:
-            qs = "SELECT * FROM accounts WHERE active = false AND error_msg IS NULL"
+            qs = f"{ACCOUNTS_QS} WHERE active = false AND error_msg IS NULL"
         else:
             us = ",".join([f'"{x}"' for x in usernames])
-            qs = f"SELECT * FROM accounts WHERE username IN ({us})"
+            qs = f"{ACCOUNTS_QS} WHERE username IN ({us})"
 
+        await self._flush()
         rs = await fetchall(self._db_file, qs)
         accounts = [Account.from_rs(rs) for rs in rs]
         # await asyncio.gather(*[login(x) for x in self.accounts])
@@ -192,143 +300,264 @@ class AccountsPool:
             logger.warning("No usernames provided")
             return
 
+        us = ",".join([f'"{x}"' for x in usernames])
         qs = f"""
         UPDATE accounts SET
             active = false,
-            locks = json_object(),
             last_used = NULL,
             error_msg = NULL,
             headers = json_object(),
             cookies = json_object(),
             user_agent = "{UserAgent().safari}"
-        WHERE username IN ({",".join([f'"{x}"' for x in usernames])})
+        WHERE username IN ({us})
         """
 
-        await execute(self._db_file, qs)
+        async with self._db_write(), transaction(self._db_file) as db:
+            await db.execute(qs)
+            await db.execute(
+                f"UPDATE account_locks SET unlock_at = '{UNLOCKED}', owner = NULL WHERE username IN ({us})"
+            )
         await self.login_all(usernames)
 
     async def relogin_failed(self):
+        await self._flush()
         qs = "SELECT username FROM accounts WHERE active = false AND error_msg IS NOT NULL"
         rs = await fetchall(self._db_file, qs)
         await self.relogin([x["username"] for x in rs])
 
     async def reset_locks(self):
-        qs = "UPDATE accounts SET locks = json_object()"
-        await execute(self._db_file, qs)
+        qs = f"UPDATE account_locks SET unlock_at = '{UNLOCKED}', owner = NULL"
+        async with self._db_write():
+            await execute(self._db_file, qs)
+        self._wake()
 
     async def set_active(self, username: str, active: bool):
         qs = "UPDATE accounts SET active = :active WHERE username = :username"
-        await execute(self._db_file, qs, {"username": username, "active": active})
+        async with self._db_write():
+            await execute(self._db_file, qs, {"username": username, "active": active})
+        if active:
+            self._wake()
 
-    async def lock_until(self, username: str, queue: str, unlock_at: int, req_count=0):
-        qs = f"""
-        UPDATE accounts SET
-            locks = json_set(locks, '$.{queue}', datetime({unlock_at}, 'unixepoch')),
-            stats = json_set(stats, '$.{queue}', COALESCE(json_extract(stats, '$.{queue}'), 0) + {req_count}),
-            last_used = datetime({utc.ts()}, 'unixepoch')
-        WHERE username = :username
-        """
-        await execute(self._db_file, qs, {"username": username})
+    async def lock_until(
+        self, username: str, queue: str, unlock_at: int, req_count=0, limit: RateLimit = None
+    ):
+        if self._scheduler is not None:
+            await self._scheduler.lock_until(username, queue, unlock_at, req_count)
+        elif self._writes is not None:
+            await self._writes.put(username, queue, unlock_at, req_count, utc.ts(), limit)
+        else:
+            lock_qs = f"""
+            INSERT INTO account_locks (username, queue, unlock_at)
+            VALUES (:username, :queue, datetime({unlock_at}, 'unixepoch'))
+            ON CONFLICT(username, queue) DO UPDATE SET unlock_at = excluded.unlock_at, owner = NULL
+            """
+            await self._update_used(username, queue, req_count, lock_qs, limit)
 
-    async def unlock(self, username: str, queue: str, req_count=0):
-        qs = f"""
-        UPDATE accounts SET
-            locks = json_remove(locks, '$.{queue}'),
-            stats = json_set(stats, '$.{queue}', COALESCE(json_extract(stats, '$.{queue}'), 0) + {req_count}),
-            last_used = datetime({utc.ts()}, 'unixepoch')
-        WHERE username = :username
+        if unlock_at <= utc.ts():
+            self._wake(queue)
+
+    async def unlock(self, username: str, queue: str, req_count=0, limit: RateLimit = None):
+        if self._scheduler is not None:
+            await self._scheduler.unlock(username, queue, req_count)
+        elif self._writes is not None:
+            await self._writes.put(username, queue, None, req_count, utc.ts(), limit)
+        else:
+            lock_qs = f"""
+            INSERT INTO account_locks (username, queue, unlock_at)
+            VALUES (:username, :queue, '{UNLOCKED}')
+            ON CONFLICT(username, queue) DO UPDATE SET unlock_at = excluded.unlock_at, owner = NULL
+            """
+            await self._update_used(username, queue, req_count, lock_qs, limit)
+
+        self._wake(queue)
+
+    async def _update_used(
+        self, username: str, queue: str, req_count: int, lock_qs: str, limit: RateLimit
+    ):
+
+        used_qs = f"""
+        UPDATE accounts SET last_used = datetime({utc.ts()}, 'unixepoch') WHERE username = :username
         """
-        await execute(self._db_file, qs, {"username": username})
+
+        kv = {"username": username, "queue": queue, "req_count": req_count}
+        kv["limit_remaining"], kv["limit_reset"] = limit or (None, None)
+        async with transaction(self._db_file) as db:
+            await db.execute(lock_qs, kv)
+            await db.execute(STATS_UPDATE_QS, kv)
+            await db.execute(used_qs, kv)
 
     async def _get_and_lock(self, queue: str, condition: str):
         # if space in condition, it's a subquery, otherwise it's username
         condition = f"({condition})" if " " in condition else f"'{condition}'"
 
-        if int(sqlite3.sqlite_version_info[1]) >= 35:
-            qs = f"""
-            UPDATE accounts SET
-                locks = json_set(locks, '$.{queue}', datetime('now', '+15 minutes')),
-                last_used = datetime({utc.ts()}, 'unixepoch')
-            WHERE username = {condition}
-            RETURNING *
-            """
-            rs = await fetchone(self._db_file, qs)
-        else:
-            tx = uuid.uuid4().hex
+        # select and lock account in one write transaction, so other processes can't take it
+        async with transaction(self._db_file) as db:
+            async with db.execute(
+                f"SELECT username FROM accounts WHERE username = {condition}"
+            ) as cur:
+                rs = await cur.fetchone()
+                if not rs:
+                    return None
+
+            kv = {"username": rs[0], "queue": queue, "owner": self.owner_id}
             qs = f"""
-            UPDATE accounts SET
-                locks = json_set(locks, '$.{queue}', datetime('now', '+15 minutes')),
-                last_used = datetime({utc.ts()}, 'unixepoch'),
-                _tx = '{tx}'
-            WHERE username = {condition}
+            INSERT INTO account_locks (username, queue, unlock_at, owner)
+            VALUES (:username, :queue, datetime('now', '+{self.lease_ttl} seconds'), :owner)
+            ON CONFLICT(username, queue) DO UPDATE SET
+                unlock_at = excluded.unlock_at, owner = excluded.owner
             """
-            await execute(self._db_file, qs)
+            await db.execute(qs, kv)
+
+            qs = f"UPDATE accounts SET last_used = datetime({utc.ts()}, 'unixepoch') WHERE username = :username"
+            await db.execute(qs, kv)
 
-            qs = f"SELECT * FROM accounts WHERE _tx = '{tx}'"
-            rs = await fetchone(self._db_file, qs)
+            async with db.execute(f"{ACCOUNTS_QS} WHERE username = :username", kv) as cur:
+                rs = await cur.fetchone()
 
         return Account.from_rs(rs) if rs else None
 
+    async def renew_lease(self, username: str, queue: str) -> bool:
+        """
+        Extends checkout lock of account for `lease_ttl` seconds. Returns False if lease is
+        lost: account was released or taken by other owner after lease expiration.
+        """
+        if self._scheduler is not None:
+            return True  # single process, lock is not expired while account in use
+
+        qs = f"""
+        UPDATE account_locks SET unlock_at = datetime('now', '+{self.lease_ttl} seconds')
+        WHERE username = :username AND queue = :queue AND owner = :owner
+        """
+        kv = {"username": username, "queue": queue, "owner": self.owner_id}
+        async with transaction(self._db_file) as db:
+            cur = await db.execute(qs, kv)
+            return cur.rowcount > 0
+
     async def get_for_queue(self, queue: str):
+        if self._scheduler is not None:
+            return await self._scheduler.get_for_queue(queue)
+
+        if queue not in self._known_queues:
+            qs = f"""
+            INSERT OR IGNORE INTO account_locks (username, queue, unlock_at)
+            SELECT username, :queue, '{UNLOCKED}' FROM accounts
+            """
+            await execute(self._db_file, qs, {"queue": queue})
+            self._known_queues.add(queue)
+
         q = f"""
-        SELECT username FROM accounts
-        WHERE active = true AND (
-            locks IS NULL
-            OR json_extract(locks, '$.{queue}') IS NULL
-            OR json_extract(locks, '$.{queue}') < datetime('now')
+        SELECT username FROM account_locks
+        WHERE queue = '{queue}' AND unlock_at <= datetime('now') AND EXISTS (
+            SELECT 1 FROM accounts a WHERE a.username = account_locks.username AND a.active = true
         )
-        ORDER BY {self._order_by}
+        ORDER BY {self._strategy.order_by(queue) if self._strategy else self._order_by}
         LIMIT 1
         """
 
-        return await self._get_and_lock(queue, q)
+        account = await self._get_and_lock(queue, q)
+        if account is None and self._writes is not None:
+            await self._writes.flush()  # queued (or being written) unlocks can free accounts
+            account = await self._get_and_lock(queue, q)
+
+        return account
 
     async def get_for_queue_or_wait(self, queue: str) -> Account | None:
-        msg_shown = False
+        msg_shown, waited = False, False
         while True:
-            account = await self.get_for_queue(queue)
-            if not account:
+            # in fair mode new callers wait behind already waiting ones, instead of taking
+            # account which was released for them
+            timeout = WAIT_POLL
+            if waited or not self._fair_wait or not self._waiters.get(queue, None):
+                account = await self.get_for_queue(queue)
+                if account is not None:
+                    if msg_shown:
+                        logger.info(f"Continuing with account {account.username} on queue {queue}")
+                    return account
+
                 if self._raise_when_no_account or get_env_bool("TWS_RAISE_WHEN_NO_ACCOUNT"):
                     raise NoAccountError(f"No account available for queue {queue}")
 
-                if not msg_shown:
-                    nat = await self.next_available_at(queue)
-                    if not nat:
-                        logger.warning("No active accounts. Stopping...")
-                        return None
+                nat = await self._next_available(queue)
+                if nat is None:
+                    logger.warning("No active accounts. Stopping...")
+                    return None
 
-                    msg = f'No account available for queue "{queue}". Next available at {nat}'
+                if not msg_shown:
+                    msg = f'No account available for queue "{queue}". Next available at {self._fmt_at(nat)}'
                     logger.info(msg)
                     msg_shown = True
 
-                await asyncio.sleep(5)
-                continue
-            else:
-                if msg_shown:
-                    logger.info(f"Continuing with account {account.username} on queue {queue}")
+                # accounts released in this process wake waiters directly, locks from other
+                # processes are checked at their expiration time (or polled, if released earlier)
+                timeout = min(max((nat - utc.now()).total_seconds(), 0.01), WAIT_POLL)
 
-            return account
+            await self._wait(queue, timeout, first=waited)
+            waited = True
 
-    async def next_available_at(self, queue: str):
-        qs = f"""
-        SELECT json_extract(locks, '$."{queue}"') as lock_until
-        FROM accounts
-        WHERE active = true AND json_extract(locks, '$."{queue}"') IS NOT NULL
-        ORDER BY lock_until ASC
+    async def _wait(self, queue: str, timeout: float, first=False):
+        waiters = self._waiters.setdefault(queue, deque())
+        if self._max_waiters is not None and len(waiters) >= self._max_waiters:
+            raise NoAccountError(f"Too many waiters for queue {queue} ({len(waiters)})")
+
+        fut = asyncio.get_running_loop().create_future()
+        if first:
+            waiters.appendleft(fut)  # already waited, but account taken by other
+        else:
+            waiters.append(fut)
+
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._wake(queue)  # pass wakeup to next waiter
+            raise
+        finally:
+            if fut in waiters:
+                waiters.remove(fut)
+
+    def _wake(self, queue: str | None = None):
+        # account released in this process: wake first waiter of queue (all in unfair mode)
+        for q in [queue] if queue is not None else list(self._waiters.keys()):
+            waiters = self._waiters.get(q, None)
+            while waiters:
+                fut = waiters.popleft()
+                if fut.done() or fut.get_loop().is_closed():
+                    continue
+
+                fut.set_result(None)
+                if self._fair_wait and queue is not None:
+                    break
+
+    async def _next_available(self, queue: str) -> datetime | None:
+        await self._flush()
+        qs = """
+        SELECT l.unlock_at FROM account_locks l
+        JOIN accounts a ON a.username = l.username
+        WHERE l.queue = :queue AND a.active = true AND l.unlock_at > :unlocked
+        ORDER BY l.unlock_at ASC
         LIMIT 1
         """
-        rs = await fetchone(self._db_file, qs)
-        if rs:
-            now, trg = utc.now(), utc.from_iso(rs[0])
-            if trg < now:
-                return "now"
+        rs = await fetchone(self._db_file, qs, {"queue": queue, "unlocked": UNLOCKED})
+        return utc.from_iso(rs[0]) if rs else None
 
-            at_local = datetime.now() + (trg - now)
-            return at_local.strftime("%H:%M:%S")
+    def _fmt_at(self, trg: datetime):
+        now = utc.now()
+        if trg < now:
+            return "now"
 
-        return None
+        at_local = datetime.now() + (trg - now)
+        return at_local.strftime("%H:%M:%S")
+
+    async def next_available_at(self, queue: str):
+        trg = await self._next_available(queue)
+        return self._fmt_at(trg) if trg else None
 
     async def mark_inactive(self, username: str, error_msg: str | None):
+        if self._scheduler is not None:
+            return await self._scheduler.mark_inactive(username, error_msg)
+
         qs = """
         UPDATE accounts SET active = false, error_msg = :error_msg
         WHERE username = :username
@@ -336,27 +565,21 @@ class AccountsPool:
         await execute(self._db_file, qs, {"username": username, "error_msg": error_msg})
 
     async def stats(self):
-        def locks_count(queue: str):
-            return f"""
-            SELECT COUNT(*) FROM accounts
-            WHERE json_extract(locks, '$.{queue}') IS NOT NULL
-                AND json_extract(locks, '$.{queue}') > datetime('now')
-            """
+        await self._flush()
 
-        qs = "SELECT DISTINCT(f.key) as k from accounts, json_each(locks) f"
+        qs = """
+        SELECT queue, SUM(unlock_at > datetime('now')) AS locked FROM account_locks GROUP BY queue
+        """
         rs = await fetchall(self._db_file, qs)
-        gql_ops = [x["k"] for x in rs]
+        locked = {f"locked_{x['queue']}": x["locked"] for x in rs}
 
-        config = [
-            ("total", "SELECT COUNT(*) FROM accounts"),
-            ("active", "SELECT COUNT(*) FROM accounts WHERE active = true"),
-            ("inactive", "SELECT COUNT(*) FROM accounts WHERE active = false"),
-            *[(f"locked_{x}", locks_count(x)) for x in gql_ops],
-        ]
-
-        qs = f"SELECT {','.join([f'({q}) as {k}' for k, q in config])}"
+        qs = """
+        SELECT COUNT(*) AS total, COALESCE(SUM(active = true), 0) AS active,
+            COALESCE(SUM(active = false), 0) AS inactive
+        FROM accounts
+        """
         rs = await fetchone(self._db_file, qs)
-        return dict(rs) if rs else {}
+        return {**dict(rs), **locked} if rs else {}
 
     async def accounts_info(self):
         accounts = await self.get_all()
@@ -1,13 +1,44 @@
-from contextlib import aclosing
-from typing import Literal
+import asyncio
+import contextvars
+from collections import Counter
+from contextlib import AsyncExitStack, aclosing
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    TypeVar,
+    overload,
+)
 
 from httpx import Response
 
-from .accounts_pool import AccountsPool
-from .logger import set_log_level
-from .models import Tweet, User, parse_trends, parse_tweet, parse_tweets, parse_user, parse_users
-from .queue_client import QueueClient
-from .utils import encode_params, find_obj, get_by_path
+from .accounts_pool import AccountsPool, NoAccountError
+from .cache import ResponseCache
+from .checkpoints import Checkpoints
+from .dedup import Dedup
+from .logger import logger, set_log_level
+from .models import (
+    Fields,
+    LazyTweet,
+    LazyUser,
+    Tweet,
+    User,
+    parse_trends,
+    parse_tweet,
+    parse_tweets,
+    parse_user,
+    parse_users,
+)
+from .queue_client import AbortReqError, QueueClient, SharedClient
+from .transport import MAX_STREAMS, Http2Config
+from .utils import encode_params, read_ahead, walk_rep
 
 # OP_{NAME} – {NAME} should be same as second part of GQL ID (required to auto-update script)
 OP_SearchTimeline = "U3QTLwGF8sZCHDuWIMSAmg/SearchTimeline"
@@ -66,6 +97,27 @@ GQL_FEATURES = {  # search values here (view source) https://x.com/
 
 KV = dict | None
 TrendId = Literal["trending", "news", "sport", "entertainment"] | str
+GqlReq = tuple[str, dict, dict | None]  # op, variables, features
+
+CONCURRENCY = 4  # default number of accounts used at once by bulk methods
+BUFFER_SIZE = 1000  # items received by `run_many` ahead of consumer
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+# set by `API.run_many` for its calls: accounts limit and shared clients per queue
+_shared_clients: contextvars.ContextVar[tuple[int, dict[str, SharedClient]] | None] = (
+    contextvars.ContextVar("twscrape_shared_clients", default=None)
+)
+
+_RETRY = object()  # result of coalesced call which was cancelled, waiters should repeat it
+
+
+@dataclass(slots=True)
+class BulkResult(Generic[T]):
+    key: Any  # requested id / login
+    value: T | None  # None if not found or request failed
+    error: Exception | None = None  # why request failed (not raised by bulk methods)
 
 
 class API:
@@ -78,7 +130,34 @@ class API:
         debug=False,
         proxy: str | None = None,
         raise_when_no_account=False,
+        http2: Http2Config = False,
+        max_streams=MAX_STREAMS,
+        prefetch=0,
+        dedup: Dedup | None = None,
+        cache: ResponseCache | None = None,
+        coalesce=True,
     ):
+        """
+        Paginated methods accept `resume=True`: last cursor is saved after each consumed page
+        (see `API.checkpoints`) and next call with same arguments continues from it.
+
+        prefetch: number of pages requested ahead while consumer processes current page
+            (0 – next page is requested only when consumer asks for it)
+
+        dedup: filter of seen tweets / users (`twscrape.dedup.LruSet` or `BloomFilter`),
+            items already returned by any method are skipped (`api.dedup.stats()` for memory)
+
+        cache: cache of single item responses (`user_by_login`, `user_by_id`, `tweet_details`
+            and bulk versions), see `twscrape.cache.ResponseCache`
+
+        coalesce: concurrent identical requests (same operation and params, e.g. many
+            `user_by_login("x")` calls or pages of same search from same cursor) share one
+            network call and its parsed result (counted in `api.counters["coalesced.*"]`)
+
+        http2: use HTTP/2 (requires `httpx[http2]`): True for all connections, proxy url or
+            collection of proxies to use it with (None for direct connection). Concurrent requests with same
+            proxy are multiplexed over one connection, up to `max_streams` at once.
+        """
         if isinstance(pool, AccountsPool):
             self.pool = pool
         elif isinstance(pool, str):
@@ -87,6 +166,15 @@ class API:
             self.pool = AccountsPool(raise_when_no_account=raise_when_no_account)
 
         self.proxy = proxy
+        self.http2 = http2
+        self.max_streams = max_streams
+        self.prefetch = prefetch
+        self.dedup = dedup
+        self.cache = cache
+        self.coalesce = coalesce
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.checkpoints = Checkpoints(self.pool._db_file)
+        self.counters: Counter[str] = Counter()
         self.debug = debug
         if self.debug:
             set_log_level("DEBUG")
@@ -103,22 +191,92 @@ class API:
 
         return rep if is_res else None, new_total, is_cur and not is_lim
 
-    def _get_cursor(self, obj: dict, cursor_type="Bottom") -> str | None:
-        if cur := find_obj(obj, lambda x: x.get("cursorType") == cursor_type):
-            return cur.get("value")
-        return None
+    def _unique(self, kind: str, items: Iterable[T]) -> Iterator[T]:
+        # skip items seen before (in other pages or calls) if dedup filter is set
+        if self.dedup is None:
+            yield from items
+            return
+
+        for x in items:
+            if self.dedup.add(f"{kind}:{getattr(x, 'id')}"):
+                yield x
+
+    def _flight_key(self, op: str, params: dict) -> str:
+        return f"{op}?" + "&".join(f"{k}={v}" for k, v in sorted(encode_params(params).items()))
+
+    async def _single_flight(self, key: str, fn: Callable[[], Awaitable[T]], counter: str) -> T:
+        # first caller runs `fn`, concurrent callers with same key wait for its result
+        if not self.coalesce:
+            return await fn()
+
+        while (fut := self._inflight.get(key)) is not None:
+            res = await asyncio.shield(fut)  # cancel of waiter does not cancel shared call
+            if res is not _RETRY:
+                self.counters[counter] += 1
+                return res
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            res = await fn()
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # error is raised by caller, waiters are optional
+            raise
+        except BaseException:
+            fut.set_result(_RETRY)  # caller cancelled, one of waiters repeats call
+            raise
+        else:
+            fut.set_result(res)
+            return res
+        finally:
+            del self._inflight[key]
 
     # gql helpers
 
-    async def _gql_items(
-        self, op: str, kv: dict, ft: dict | None = None, limit=-1, cursor_type="Bottom"
-    ):
-        queue, cur, cnt, active = op.split("/")[-1], None, 0, True
-        kv, ft = {**kv}, {**GQL_FEATURES, **(ft or {})}
+    def _client(self, queue: str):
+        return QueueClient(self.pool, queue, self.debug, self.proxy, self.http2, self.max_streams)
+
+    def _gql_client(self, queue: str) -> QueueClient | SharedClient:
+        shared = _shared_clients.get()
+        if shared is None:
+            return self._client(queue)
+
+        size, clients = shared
+        if queue not in clients:
+            clients[queue] = SharedClient(partial(self._client, queue), size)
+        return clients[queue]
 
-        async with QueueClient(self.pool, queue, self.debug, proxy=self.proxy) as client:
+    async def _gql_pages(
+        self, op: str, kv: dict, ft: dict, limit: int, cursor_type: str, cur: str | None, cnt: int
+    ):
+        # yields pages with pagination state after them: (rep, cursor, items count, has next),
+        # rep is None if request failed
+        queue, active = op.split("/")[-1], True
+        clients: list[QueueClient | SharedClient] = []
+
+        async def fetch(params: dict):
+            # account is taken on first own request (not needed if all pages are coalesced)
+            if not clients:
+                clients.append(await stack.enter_async_context(self._gql_client(queue)))
+
+            rep = await clients[0].get(f"{GQL_URL}/{op}", params=encode_params(params))
+            if rep is None:
+                return None
+
+            doc = walk_rep(rep)
+            els = [
+                x
+                for x in doc.entries
+                if not (
+                    x["entryId"].startswith("cursor-") or x["entryId"].startswith("messageprompt-")
+                )
+            ]
+            return rep, els, doc.cursors
+
+        async with AsyncExitStack() as stack:
             while active:
-                params = {"variables": kv, "features": ft}
+                params = {"variables": {**kv}, "features": ft}
                 if cur is not None:
                     params["variables"]["cursor"] = cur
                 if queue in ("SearchTimeline", "ListLatestTweetsTimeline"):
@@ -126,38 +284,260 @@ class API:
                 if queue in ("UserMedia",):
                     params["fieldToggles"] = {"withArticlePlainText": False}
 
-                rep = await client.get(f"{GQL_URL}/{op}", params=encode_params(params))
-                if rep is None:
+                key = self._flight_key(op, params)
+                page = await self._single_flight(key, partial(fetch, params), "coalesced.pages")
+                if page is None:
+                    yield None, cur, cnt, False
                     return
 
-                obj = rep.json()
-                els = get_by_path(obj, "entries") or []
-                els = [
-                    x
-                    for x in els
-                    if not (
-                        x["entryId"].startswith("cursor-")
-                        or x["entryId"].startswith("messageprompt-")
-                    )
-                ]
-                cur = self._get_cursor(obj, cursor_type)
+                rep, els, cursors = page
+                cur = cursors.get(cursor_type)
 
                 rep, cnt, active = self._is_end(rep, queue, els, cur, cnt, limit)
                 if rep is None:
                     return
 
+                yield rep, cur, cnt, active
+
+    async def _gql_items(
+        self,
+        op: str,
+        kv: dict,
+        ft: dict | None = None,
+        limit=-1,
+        cursor_type="Bottom",
+        resume=False,
+        prefetch: int | None = None,
+    ):
+        queue, cur, cnt, pages = op.split("/")[-1], None, 0, 0
+        kv, ft = {**kv}, {**GQL_FEATURES, **(ft or {})}
+
+        if resume:
+            ckpt = await self.checkpoints.get(queue, kv)
+            if ckpt is not None:
+                cur, cnt, pages = ckpt.cursor, ckpt.items, ckpt.pages
+                logger.info(f"Resuming {queue} after page {pages} ({cnt:,d} items)")
+
+        # with prefetch next pages are requested while consumer processes current one
+        prefetch = self.prefetch if prefetch is None else prefetch
+        gen = self._gql_pages(op, kv, ft, limit, cursor_type, cur, cnt)
+        gen = read_ahead(gen, prefetch) if prefetch > 0 else gen
+
+        async with aclosing(gen):
+            async for rep, cur, cnt, active in gen:
+                if rep is None:
+                    return  # request failed, checkpoint is kept
+
                 yield rep
 
-    async def _gql_item(self, op: str, kv: dict, ft: dict | None = None):
-        ft = ft or {}
+                # saved after page is consumed, so restarted crawl does not skip it
+                pages += 1
+                if resume and active and cur is not None:
+                    await self.checkpoints.save(queue, kv, cur, cnt, pages)
+
+        if resume:
+            await self.checkpoints.delete(queue, kv)  # finished, next call starts over
+
+    async def _gql_item(self, op: str, kv: dict, ft: dict | None = None) -> Response | None:
         queue = op.split("/")[-1]
-        async with QueueClient(self.pool, queue, self.debug, proxy=self.proxy) as client:
-            params = {"variables": {**kv}, "features": {**GQL_FEATURES, **ft}}
-            return await client.get(f"{GQL_URL}/{op}", params=encode_params(params))
+        params = {"variables": {**kv}, "features": {**GQL_FEATURES, **(ft or {})}}
+
+        async def fetch():
+            if self.cache is not None and (rep := await self.cache.get(queue, kv)) is not None:
+                return rep  # no account checkout on cache hit
+
+            async with self._gql_client(queue) as client:
+                rep = await client.get(f"{GQL_URL}/{op}", params=encode_params(params))
+
+            if self.cache is not None and rep is not None:
+                await self.cache.put(queue, kv, rep)
+            return rep
+
+        return await self._single_flight(self._flight_key(op, params), fetch, "coalesced.items")
+
+    async def _gql_parsed(
+        self,
+        kind: str,
+        req: GqlReq,
+        raw: Callable[[], Awaitable[Response | None]],
+        parse: Callable[[Response], T],
+    ) -> T | None:
+        # concurrent identical calls share parsed object too, `raw` does request of `req`
+        async def fetch():
+            rep = await raw()
+            return parse(rep) if rep else None
+
+        op, kv, ft = req
+        params = {"variables": kv, "features": {**GQL_FEATURES, **(ft or {})}}
+        key = f"{kind}:{self._flight_key(op, params)}"
+        return await self._single_flight(key, fetch, "coalesced.items")
+
+    async def _gql_many(
+        self,
+        keys: Iterable[Any],
+        req: Callable[[Any], GqlReq],
+        parse: Callable[[BulkResult[Response]], Iterable[BulkResult]],
+        concurrency=CONCURRENCY,
+        wanted: Callable[[Any], bool] | None = None,
+        counter: str | None = None,
+    ):
+        """
+        Single item requests for many keys (duplicates are skipped). `concurrency` workers
+        are started, each keeps its account for all its requests (account is switched only
+        on rate limit or ban), so there is no account checkout per key. Results are yielded
+        in completion order, failed request is reported in `BulkResult.error`.
+
+        Worker which can not get account (e.g. fewer free accounts than `concurrency` with
+        `raise_when_no_account`) stops and its keys are done by others. Keys left when all
+        workers stopped are reported with `NoAccountError` (raised if no worker got account).
+
+        `parse` converts response of key to results, it's called by worker before next
+        request, so `wanted(key)` (checked right before request) already sees its results.
+        `counter` (name in `API.counters`) counts requests sent to network (not cache hits).
+        """
+        todo = list(dict.fromkeys(keys))
+        todo.reverse()  # pop from end, keep input order
+        done: asyncio.Queue[BulkResult | BaseException | None] = asyncio.Queue()
+
+        async def fetch(client: QueueClient, op: str, kv: dict, params: dict):
+            if counter is not None:
+                self.counters[counter] += 1
+            rep = await client.get(f"{GQL_URL}/{op}", params=encode_params(params))
+            if self.cache is not None and rep is not None:
+                await self.cache.put(op.split("/")[-1], kv, rep)
+            return rep
+
+        started, no_account = 0, []  # workers which got account, why others stopped
+
+        async def worker(queue: str):
+            nonlocal started
+            async with self._client(queue) as client:
+                started += 1
+                while todo:
+                    key = todo.pop()
+                    if wanted is not None and not wanted(key):
+                        continue
+
+                    op, kv, ft = req(key)
+                    if (
+                        self.cache is not None
+                        and (rep := await self.cache.get(queue, kv)) is not None
+                    ):
+                        for x in parse(BulkResult(key, rep)):
+                            done.put_nowait(x)
+                        continue
+
+                    params = {"variables": kv, "features": {**GQL_FEATURES, **(ft or {})}}
+                    try:
+                        fn = partial(fetch, client, op, kv, params)
+                        rep = await self._single_flight(
+                            self._flight_key(op, params), fn, "coalesced.items"
+                        )
+                    except NoAccountError:
+                        todo.append(key)
+                        raise  # account lost, key is left for other workers
+                    except Exception as e:
+                        rep, err = None, e
+                    else:
+                        if rep is None and client.ctx is None:
+                            todo.append(key)
+                            return  # no active accounts, left keys reported below
+                        err = AbortReqError("Request aborted") if rep is None else None
+
+                    for x in parse(BulkResult(key, rep, err)):
+                        done.put_nowait(x)
+
+        async def run(queue: str):
+            try:
+                await worker(queue)
+            except NoAccountError as e:
+                no_account.append(e)  # fewer free accounts than workers, others continue
+            except BaseException as e:
+                done.put_nowait(e)
+                raise
+            finally:
+                done.put_nowait(None)
+
+        queue = req(todo[-1])[0].split("/")[-1] if todo else ""
+        tasks = [asyncio.create_task(run(queue)) for _ in range(min(concurrency, len(todo)))]
+        try:
+            running = len(tasks)
+            while running > 0:
+                x = await done.get()
+                if x is None:
+                    running -= 1
+                elif isinstance(x, BaseException):
+                    raise x
+                else:
+                    yield x
+
+            if todo and no_account and started == 0:
+                raise no_account[0]  # no account at all, same as single item call
+
+            msg = str(no_account[0]) if no_account else "No active accounts"
+            for key in reversed(todo):
+                if wanted is None or wanted(key):
+                    yield BulkResult(key, None, NoAccountError(msg))
+        finally:
+            for x in tasks:
+                x.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_many(
+        self,
+        fn: Callable[[K], AsyncGenerator[T, None]],
+        keys: Iterable[K],
+        concurrency=CONCURRENCY,
+        buffer=BUFFER_SIZE,
+    ):
+        """
+        Runs paginated method for many keys at once, e.g. `lambda uid: api.followers(uid)`,
+        yields `(key, item)` as pages arrive. Requests of all calls share `concurrency`
+        accounts per queue: waiting calls are served in FIFO order, so pages of all keys are
+        interleaved, and accounts are not oversubscribed by many independent generators.
+        Up to `buffer` items are received ahead of consumer. Error of any call is raised.
+        """
+        ctx = contextvars.copy_context()
+        clients: dict[str, SharedClient] = {}
+        ctx.run(_shared_clients.set, (concurrency, clients))
+
+        done: asyncio.Queue[tuple[K, T] | BaseException | None] = asyncio.Queue()
+        space = asyncio.Semaphore(buffer)
+
+        async def run(key: K):
+            try:
+                async with aclosing(fn(key)) as gen:
+                    async for x in gen:
+                        await space.acquire()
+                        done.put_nowait((key, x))
+            except BaseException as e:
+                done.put_nowait(e)
+                raise
+            finally:
+                done.put_nowait(None)
+
+        tasks = [ctx.run(asyncio.create_task, run(x)) for x in dict.fromkeys(keys)]
+        try:
+            running = len(tasks)
+            while running > 0:
+                x = await done.get()
+                if x is None:
+                    running -= 1
+                elif isinstance(x, BaseException):
+                    raise x
+                else:
+                    space.release()
+                    yield x
+        finally:
+            for x in tasks:
+                x.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for x in clients.values():
+                await x.close()
 
     # search
 
-    async def search_raw(self, q: str, limit=-1, kv: KV = None):
+    async def search_raw(self, q: str, limit=-1, kv: KV = None, resume=False):
         op = OP_SearchTimeline
         kv = {
             "rawQuery": q,
@@ -166,26 +546,86 @@ class API:
             "querySource": "typed_query",
             **(kv or {}),
         }
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def search(self, q: str, limit=-1, kv: KV = None):
-        async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
+    @overload
+    def search(
+        self, q: str, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def search(
+        self, q: str, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def search(self, q: str, limit=-1, kv: KV = None, fields: Fields = None, resume=False):
+        async with aclosing(self.search_raw(q, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
 
-    async def search_user(self, q: str, limit=-1, kv: KV = None):
+    @overload
+    def search_many(
+        self,
+        queries: Iterable[str],
+        limit=-1,
+        kv: KV = None,
+        fields: None = None,
+        concurrency=CONCURRENCY,
+    ) -> AsyncGenerator[tuple[str, Tweet], None]: ...
+
+    @overload
+    def search_many(
+        self,
+        queries: Iterable[str],
+        limit=-1,
+        kv: KV = None,
+        *,
+        fields: Iterable[str],
+        concurrency=CONCURRENCY,
+    ) -> AsyncGenerator[tuple[str, LazyTweet], None]: ...
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        limit=-1,
+        kv: KV = None,
+        fields: Fields = None,
+        concurrency=CONCURRENCY,
+    ) -> AsyncGenerator[tuple[str, Tweet | LazyTweet], None]:
+        """Search of many queries at once (see `run_many`), yields `(query, tweet)`"""
+
+        def fn(q: str):
+            return self.search(q, limit, kv, fields=fields)
+
+        async with aclosing(self.run_many(fn, queries, concurrency)) as gen:
+            async for x in gen:
+                yield x
+
+    @overload
+    def search_user(
+        self, q: str, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def search_user(
+        self, q: str, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def search_user(
+        self, q: str, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
         kv = {"product": "People", **(kv or {})}
-        async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
+        async with aclosing(self.search_raw(q, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # user_by_id
 
-    async def user_by_id_raw(self, uid: int, kv: KV = None):
+    def _user_by_id_req(self, uid: int, kv: KV = None) -> GqlReq:
         op = OP_UserByRestId
         kv = {"userId": str(uid), "withSafetyModeUserFields": True, **(kv or {})}
         ft = {
@@ -197,15 +637,18 @@ class API:
             "subscriptions_feature_can_gift_premium": False,
             "profile_label_improvements_pcf_label_in_post_enabled": False,
         }
-        return await self._gql_item(op, kv, ft)
+        return op, kv, ft
+
+    async def user_by_id_raw(self, uid: int, kv: KV = None):
+        return await self._gql_item(*self._user_by_id_req(uid, kv))
 
     async def user_by_id(self, uid: int, kv: KV = None) -> User | None:
-        rep = await self.user_by_id_raw(uid, kv=kv)
-        return parse_user(rep) if rep else None
+        raw = partial(self.user_by_id_raw, uid, kv=kv)
+        return await self._gql_parsed("user", self._user_by_id_req(uid, kv), raw, parse_user)
 
     # user_by_login
 
-    async def user_by_login_raw(self, login: str, kv: KV = None):
+    def _user_by_login_req(self, login: str, kv: KV = None) -> GqlReq:
         op = OP_UserByScreenName
         kv = {"screen_name": login, "withSafetyModeUserFields": True, **(kv or {})}
         ft = {
@@ -219,15 +662,37 @@ class API:
             "subscriptions_feature_can_gift_premium": False,
             "profile_label_improvements_pcf_label_in_post_enabled": False,
         }
-        return await self._gql_item(op, kv, ft)
+        return op, kv, ft
+
+    async def user_by_login_raw(self, login: str, kv: KV = None):
+        return await self._gql_item(*self._user_by_login_req(login, kv))
 
     async def user_by_login(self, login: str, kv: KV = None) -> User | None:
-        rep = await self.user_by_login_raw(login, kv=kv)
-        return parse_user(rep) if rep else None
+        raw = partial(self.user_by_login_raw, login, kv=kv)
+        return await self._gql_parsed("user", self._user_by_login_req(login, kv), raw, parse_user)
+
+    # users_by_ids / users_by_logins
+
+    def _parse_user_result(self, x: BulkResult[Response]):
+        return [BulkResult(x.key, parse_user(x.value) if x.value else None, x.error)]
+
+    async def users_by_ids(self, uids: Iterable[int], concurrency=CONCURRENCY, kv: KV = None):
+        req = partial(self._user_by_id_req, kv=kv)
+        gen = self._gql_many(uids, req, self._parse_user_result, concurrency)
+        async with aclosing(gen):
+            async for x in gen:
+                yield x
+
+    async def users_by_logins(self, logins: Iterable[str], concurrency=CONCURRENCY, kv: KV = None):
+        req = partial(self._user_by_login_req, kv=kv)
+        gen = self._gql_many(logins, req, self._parse_user_result, concurrency)
+        async with aclosing(gen):
+            async for x in gen:
+                yield x
 
     # tweet_details
 
-    async def tweet_details_raw(self, twid: int, kv: KV = None):
+    def _tweet_details_req(self, twid: int, kv: KV = None) -> GqlReq:
         op = OP_TweetDetail
         kv = {
             "focalTweetId": str(twid),
@@ -240,16 +705,57 @@ class API:
             "withV2Timeline": True,
             **(kv or {}),
         }
-        return await self._gql_item(op, kv)
+        return op, kv, None
+
+    async def tweet_details_raw(self, twid: int, kv: KV = None):
+        return await self._gql_item(*self._tweet_details_req(twid, kv))
 
     async def tweet_details(self, twid: int, kv: KV = None) -> Tweet | None:
-        rep = await self.tweet_details_raw(twid, kv=kv)
-        return parse_tweet(rep, twid) if rep else None
+        raw, parse = partial(self.tweet_details_raw, twid, kv=kv), partial(parse_tweet, twid=twid)
+        return await self._gql_parsed("tweet", self._tweet_details_req(twid, kv), raw, parse)
+
+    # tweets_by_ids
+
+    async def tweets_by_ids(self, twids: Iterable[int], concurrency=CONCURRENCY, kv: KV = None):
+        """
+        Tweets by ids, in completion order. Conversation page of one tweet often contains
+        other requested tweets: they are taken from it and not requested again (counted in
+        `API.counters["tweets_by_ids.reused"]`).
+        """
+        keys = list(dict.fromkeys(twids))
+        todo = set(keys)
+
+        def parse(x: BulkResult[Response]):
+            res: list[BulkResult[Tweet]] = []
+            for doc in parse_tweets(x.value, lazy=True) if x.value else []:
+                if doc.id not in todo:
+                    continue
+
+                todo.discard(doc.id)
+                if doc.id != x.key:
+                    self.counters["tweets_by_ids.reused"] += 1
+
+                try:
+                    res.append(BulkResult(doc.id, doc.to_tweet()))
+                except Exception as e:
+                    res.append(BulkResult(doc.id, None, e))
+
+            if x.key in todo:  # not found in own page
+                todo.discard(x.key)
+                res.append(BulkResult(x.key, None, x.error))
+            return res
+
+        req = partial(self._tweet_details_req, kv=kv)
+        counter = "tweets_by_ids.requests"
+        gen = self._gql_many(keys, req, parse, concurrency, todo.__contains__, counter)
+        async with aclosing(gen):
+            async for x in gen:
+                yield x
 
     # tweet_replies
     # note: uses same op as tweet_details, see: https://github.com/vladkens/twscrape/issues/104
 
-    async def tweet_replies_raw(self, twid: int, limit=-1, kv: KV = None):
+    async def tweet_replies_raw(self, twid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_TweetDetail
         kv = {
             "focalTweetId": str(twid),
@@ -264,100 +770,176 @@ class API:
             **(kv or {}),
         }
         async with aclosing(
-            self._gql_items(op, kv, limit=limit, cursor_type="ShowMoreThreads")
+            self._gql_items(op, kv, limit=limit, cursor_type="ShowMoreThreads", resume=resume)
         ) as gen:
             async for x in gen:
                 yield x
 
-    async def tweet_replies(self, twid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.tweet_replies_raw(twid, limit=limit, kv=kv)) as gen:
+    @overload
+    def tweet_replies(
+        self, twid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def tweet_replies(
+        self, twid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def tweet_replies(
+        self, twid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(
+            self.tweet_replies_raw(twid, limit=limit, kv=kv, resume=resume)
+        ) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     if x.inReplyToTweetId == twid:
                         yield x
 
     # followers
 
-    async def followers_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def followers_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_Followers
         kv = {"userId": str(uid), "count": 20, "includePromotedContent": False, **(kv or {})}
         ft = {"responsive_web_twitter_article_notes_tab_enabled": False}
-        async with aclosing(self._gql_items(op, kv, limit=limit, ft=ft)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, ft=ft, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def followers(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.followers_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def followers(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def followers(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def followers(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.followers_raw(uid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # verified_followers
 
-    async def verified_followers_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def verified_followers_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_BlueVerifiedFollowers
         kv = {"userId": str(uid), "count": 20, "includePromotedContent": False, **(kv or {})}
         ft = {
             "responsive_web_twitter_article_notes_tab_enabled": True,
         }
-        async with aclosing(self._gql_items(op, kv, limit=limit, ft=ft)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, ft=ft, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def verified_followers(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.verified_followers_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def verified_followers(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def verified_followers(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def verified_followers(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(
+            self.verified_followers_raw(uid, limit=limit, kv=kv, resume=resume)
+        ) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # following
 
-    async def following_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def following_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_Following
         kv = {"userId": str(uid), "count": 20, "includePromotedContent": False, **(kv or {})}
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def following(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.following_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def following(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def following(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def following(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.following_raw(uid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # subscriptions
 
-    async def subscriptions_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def subscriptions_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_UserCreatorSubscriptions
         kv = {"userId": str(uid), "count": 20, "includePromotedContent": False, **(kv or {})}
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def subscriptions(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.subscriptions_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def subscriptions(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def subscriptions(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def subscriptions(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.subscriptions_raw(uid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # retweeters
 
-    async def retweeters_raw(self, twid: int, limit=-1, kv: KV = None):
+    async def retweeters_raw(self, twid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_Retweeters
         kv = {"tweetId": str(twid), "count": 20, "includePromotedContent": True, **(kv or {})}
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def retweeters(self, twid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.retweeters_raw(twid, limit=limit, kv=kv)) as gen:
+    @overload
+    def retweeters(
+        self, twid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[User, None]: ...
+
+    @overload
+    def retweeters(
+        self, twid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyUser, None]: ...
+
+    async def retweeters(
+        self, twid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.retweeters_raw(twid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_users(rep.json(), limit):
+                for x in self._unique("user", parse_users(rep, limit, fields=fields)):
                     yield x
 
     # user_tweets
 
-    async def user_tweets_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def user_tweets_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_UserTweets
         kv = {
             "userId": str(uid),
@@ -368,19 +950,31 @@ class API:
             "withV2Timeline": True,
             **(kv or {}),
         }
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def user_tweets(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.user_tweets_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def user_tweets(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def user_tweets(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def user_tweets(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.user_tweets_raw(uid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
 
     # user_tweets_and_replies
 
-    async def user_tweets_and_replies_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def user_tweets_and_replies_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_UserTweetsAndReplies
         kv = {
             "userId": str(uid),
@@ -391,19 +985,33 @@ class API:
             "withV2Timeline": True,
             **(kv or {}),
         }
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def user_tweets_and_replies(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.user_tweets_and_replies_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def user_tweets_and_replies(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def user_tweets_and_replies(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def user_tweets_and_replies(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(
+            self.user_tweets_and_replies_raw(uid, limit=limit, kv=kv, resume=resume)
+        ) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
 
     # user_media
 
-    async def user_media_raw(self, uid: int, limit=-1, kv: KV = None):
+    async def user_media_raw(self, uid: int, limit=-1, kv: KV = None, resume=False):
         op = OP_UserMedia
         kv = {
             "userId": str(uid),
@@ -416,14 +1024,26 @@ class API:
             **(kv or {}),
         }
 
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def user_media(self, uid: int, limit=-1, kv: KV = None):
-        async with aclosing(self.user_media_raw(uid, limit=limit, kv=kv)) as gen:
+    @overload
+    def user_media(
+        self, uid: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def user_media(
+        self, uid: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def user_media(
+        self, uid: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(self.user_media_raw(uid, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep, limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     # sometimes some tweets without media, so skip them
                     media_count = (
                         len(x.media.photos) + len(x.media.videos) + len(x.media.animated)
@@ -436,22 +1056,36 @@ class API:
 
     # list_timeline
 
-    async def list_timeline_raw(self, list_id: int, limit=-1, kv: KV = None):
+    async def list_timeline_raw(self, list_id: int, limit=-1, kv: KV = None, resume=False):
         op = OP_ListLatestTweetsTimeline
         kv = {"listId": str(list_id), "count": 20, **(kv or {})}
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def list_timeline(self, list_id: int, limit=-1, kv: KV = None):
-        async with aclosing(self.list_timeline_raw(list_id, limit=limit, kv=kv)) as gen:
+    @overload
+    def list_timeline(
+        self, list_id: int, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def list_timeline(
+        self, list_id: int, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def list_timeline(
+        self, list_id: int, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
+        async with aclosing(
+            self.list_timeline_raw(list_id, limit=limit, kv=kv, resume=resume)
+        ) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep, limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
 
     # trends
 
-    async def trends_raw(self, trend_id: TrendId, limit=-1, kv: KV = None):
+    async def trends_raw(self, trend_id: TrendId, limit=-1, kv: KV = None, resume=False):
         map = {
             "trending": "VGltZWxpbmU6DAC2CwABAAAACHRyZW5kaW5nAAA",
             "news": "VGltZWxpbmU6DAC2CwABAAAABG5ld3MAAA",
@@ -467,29 +1101,41 @@ class API:
             "withQuickPromoteEligibilityTweetFields": True,
             **(kv or {}),
         }
-        async with aclosing(self._gql_items(op, kv, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def trends(self, trend_id: TrendId, limit=-1, kv: KV = None):
-        async with aclosing(self.trends_raw(trend_id, limit=limit, kv=kv)) as gen:
+    async def trends(self, trend_id: TrendId, limit=-1, kv: KV = None, resume=False):
+        async with aclosing(self.trends_raw(trend_id, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
                 for x in parse_trends(rep, limit):
                     yield x
 
-    async def search_trend(self, q: str, limit=-1, kv: KV = None):
+    @overload
+    def search_trend(
+        self, q: str, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def search_trend(
+        self, q: str, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def search_trend(
+        self, q: str, limit=-1, kv: KV = None, fields: Fields = None, resume=False
+    ):
         kv = {
             "querySource": "trend_click",
             **(kv or {}),
         }
-        async with aclosing(self.search_raw(q, limit=limit, kv=kv)) as gen:
+        async with aclosing(self.search_raw(q, limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
 
     # Get current user bookmarks
 
-    async def bookmarks_raw(self, limit=-1, kv: KV = None):
+    async def bookmarks_raw(self, limit=-1, kv: KV = None, resume=False):
         op = OP_Bookmarks
         kv = {
             "count": 20,
@@ -503,12 +1149,22 @@ class API:
         ft = {
             "graphql_timeline_v2_bookmark_timeline": True,
         }
-        async with aclosing(self._gql_items(op, kv, ft, limit=limit)) as gen:
+        async with aclosing(self._gql_items(op, kv, ft, limit=limit, resume=resume)) as gen:
             async for x in gen:
                 yield x
 
-    async def bookmarks(self, limit=-1, kv: KV = None):
-        async with aclosing(self.bookmarks_raw(limit=limit, kv=kv)) as gen:
+    @overload
+    def bookmarks(
+        self, limit=-1, kv: KV = None, fields: None = None, resume=False
+    ) -> AsyncGenerator[Tweet, None]: ...
+
+    @overload
+    def bookmarks(
+        self, limit=-1, kv: KV = None, *, fields: Iterable[str], resume=False
+    ) -> AsyncGenerator[LazyTweet, None]: ...
+
+    async def bookmarks(self, limit=-1, kv: KV = None, fields: Fields = None, resume=False):
+        async with aclosing(self.bookmarks_raw(limit=limit, kv=kv, resume=resume)) as gen:
             async for rep in gen:
-                for x in parse_tweets(rep.json(), limit):
+                for x in self._unique("tweet", parse_tweets(rep, limit, fields=fields)):
                     yield x
@@ -0,0 +1,269 @@
+"""
+Columnar output: stream of models (`Tweet`, `User`, ...) or raw pages to Arrow record batches
+and Parquet files. Schema is derived from model dataclass, so it's same for every batch:
+nested models (user, media, links, ...) are struct columns, recursive models deeper than one
+level (e.g. quote of retweeted tweet) and cards (union of several types) are JSON strings.
+
+Requires `pyarrow` package: pip install twscrape[arrow]
+"""
+
+import json
+import typing
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from operator import attrgetter
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, AsyncIterable, Callable, NamedTuple
+
+import httpx
+
+from .models import LazyModel, LazyTweet, LazyUser, Tweet, User, parse_tweets, parse_users
+
+if TYPE_CHECKING:
+    import pyarrow as pa  # pyright: ignore[reportMissingImports]
+    import pyarrow.parquet as pq  # pyright: ignore[reportMissingImports]
+else:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:  # pragma: no cover
+        pa = pq = None
+
+Model = Any  # Tweet, User, Trend, LazyTweet, ... or raw page (httpx.Response)
+Convert = Callable[[Any], Any] | None  # value -> value for arrow, None for as is
+
+BATCH_SIZE = 10_000  # rows per record batch / parquet row group
+
+
+class _Column(NamedTuple):
+    type: "pa.DataType"
+    conv: Convert  # from value of `dict()` (used for projected lazy models)
+    get: Convert  # from attribute of model object (no intermediate `asdict`)
+
+
+_schemas: dict[type, tuple["pa.Schema", Convert, Callable[[Any], dict | None]]] = {}
+
+
+def _require():
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar output: pip install twscrape[arrow]")
+
+
+def _to_json(val: Any):
+    return None if val is None else json.dumps(val, default=str)
+
+
+def _obj_to_json(val: Any):
+    return None if val is None else json.dumps(val.dict(), default=str)
+
+
+def _struct(model: type, path: tuple[type, ...]):
+    hints = typing.get_type_hints(model)
+    items, convs, plain, nested = [], {}, [], []
+    for x in fields(model):
+        if x.name.startswith("_"):  # constant model markers like `_type`
+            continue
+
+        col = _column(hints[x.name], (*path, model))
+        items.append(pa.field(x.name, col.type))
+        if col.conv is not None:
+            convs[x.name] = col.conv
+        if col.get is not None:
+            nested.append((x.name, col.get))
+        else:
+            plain.append(x.name)
+
+    # attrgetter returns tuple only for several names
+    get_plain = attrgetter(*plain) if len(plain) > 1 else lambda o: [getattr(o, k) for k in plain]
+
+    def get(obj) -> dict | None:
+        if obj is None:
+            return None
+        doc = dict(zip(plain, get_plain(obj)))
+        for k, fn in nested:
+            doc[k] = fn(getattr(obj, k))
+        return doc
+
+    def convert(doc: dict | None):
+        if doc is None:
+            return None
+        return {**doc, **{k: fn(doc[k]) for k, fn in convs.items() if k in doc}}
+
+    return items, convert if convs else None, get
+
+
+def _column(tp: Any, path: tuple[type, ...]) -> _Column:
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+
+    if origin in (typing.Union, UnionType):
+        args = [x for x in args if x is not NoneType]
+        if len(args) == 1:
+            return _column(args[0], path)
+        return _Column(pa.string(), _to_json, _obj_to_json)  # union of models (cards)
+
+    if origin is list:
+        item = _column(args[0], path)
+        conv, get = item.conv, item.get
+        return _Column(
+            pa.list_(item.type),
+            None if conv is None else lambda v: v and [conv(x) for x in v],
+            None if get is None else lambda v: v and [get(x) for x in v],
+        )
+
+    if is_dataclass(tp) and isinstance(tp, type):
+        if path.count(tp) > 1:
+            return _Column(pa.string(), _to_json, _obj_to_json)  # recursive model, second level
+        items, conv, get = _struct(tp, path)
+        return _Column(pa.struct(items), conv, get)
+
+    simple = {
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bool: pa.bool_(),
+        datetime: pa.timestamp("us", tz="UTC"),
+    }
+    if tp in simple:
+        return _Column(simple[tp], None, None)
+    return _Column(pa.string(), _to_json, _to_json)
+
+
+def model_schema(model: type) -> "pa.Schema":
+    """Arrow schema of model (e.g. `Tweet`, `User`)"""
+    return _schema(model)[0]
+
+
+def _schema(model: type):
+    _require()
+    if issubclass(model, LazyModel):
+        model = model._model
+
+    if model not in _schemas:
+        items, conv, get = _struct(model, ())
+        _schemas[model] = (pa.schema(items), conv, get)
+    return _schemas[model]
+
+
+def _model_of(doc: Model) -> type:
+    if isinstance(doc, LazyModel):
+        return doc._model
+    return type(doc)
+
+
+def to_record_batch(docs: list[Model], model: type | None = None) -> "pa.RecordBatch":
+    """Convert list of models (same type) to Arrow record batch"""
+    model = model or (_model_of(docs[0]) if docs else Tweet)
+    schema, conv, get = _schema(model)
+
+    rows = []
+    for x in docs:
+        if isinstance(x, LazyModel) and x._fields is not None:
+            rows.append(x.dict() if conv is None else conv(x.dict()))  # projection
+        else:
+            rows.append(get(x))
+
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+async def to_batches(
+    stream: AsyncIterable[Model], model: type | None = None, batch_size=BATCH_SIZE
+):
+    """
+    Convert async stream of models (or raw pages of `*_raw` methods, then `model` should be
+    `Tweet` or `User`) to Arrow record batches of up to `batch_size` rows.
+    """
+    buffer: list[Model] = []
+    async for doc in stream:
+        if isinstance(doc, httpx.Response):
+            buffer.extend(_parse_page(doc, model))
+        else:
+            model = model or _model_of(doc)
+            buffer.append(doc)
+
+        while len(buffer) >= batch_size:
+            yield to_record_batch(buffer[:batch_size], model)
+            buffer = buffer[batch_size:]
+
+    if buffer:
+        yield to_record_batch(buffer, model)
+
+
+def _parse_page(rep: httpx.Response, model: type | None) -> list[Model]:
+    if model in (Tweet, LazyTweet):
+        return list(parse_tweets(rep))
+    if model in (User, LazyUser):
+        return list(parse_users(rep))
+    raise ValueError(f"Model (Tweet or User) is required for raw pages, got: {model}")
+
+
+class ParquetSink:
+    """
+    Parquet file writer, models are buffered and written as row group of `batch_size` rows,
+    so file is written while pages are streamed from API.
+
+        async with aclosing(api.search("elon musk")) as gen:
+            with ParquetSink("tweets.parquet") as sink:
+                async for doc in gen:
+                    sink.write(doc)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model: type | None = None,
+        batch_size=BATCH_SIZE,
+        compression="zstd",
+    ):
+        _require()
+        self.path = path
+        self.model = model
+        self.batch_size = batch_size
+        self.compression = compression
+        self.rows = 0
+        self._buffer: list[Model] = []
+        self._writer: "pq.ParquetWriter | None" = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, doc: Model):
+        if isinstance(doc, httpx.Response):
+            self._buffer.extend(_parse_page(doc, self.model))
+        else:
+            self.model = self.model or _model_of(doc)
+            self._buffer.append(doc)
+
+        while len(self._buffer) >= self.batch_size:
+            self.write_batch(to_record_batch(self._buffer[: self.batch_size], self.model))
+            self._buffer = self._buffer[self.batch_size :]
+
+    def write_batch(self, batch: "pa.RecordBatch"):
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, batch.schema, compression=self.compression)
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def flush(self):
+        if self._buffer:
+            self.write_batch(to_record_batch(self._buffer, self.model))
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self._writer is None:  # no rows, write empty file with schema
+            schema = model_schema(self.model or Tweet)
+            self._writer = pq.ParquetWriter(self.path, schema, compression=self.compression)
+        self._writer.close()
+
+
+async def write_parquet(
+    stream: AsyncIterable[Model], path: str, model: type | None = None, batch_size=BATCH_SIZE
+) -> int:
+    """Write async stream of models (or raw pages) to Parquet file, returns number of rows"""
+    with ParquetSink(path, model, batch_size) as sink:
+        async for batch in to_batches(stream, model, batch_size):
+            sink.write_batch(batch)
+    return sink.rows
@@ -0,0 +1,186 @@
+"""
+Cache of single item responses (`user_by_login`, `user_by_id`, `tweet_details` and bulk
+versions): in-memory LRU with TTL per operation and optional persistent tier in SQLite database
+(shared by processes and kept between restarts). Responses without requested object (user or
+tweet not found, suspended) are cached too, with `negative_ttl`, unless they have API errors
+(often transient, e.g. "Dependency: Unspecified").
+"""
+
+import json
+import time
+from collections import Counter, OrderedDict
+from typing import NamedTuple
+
+import httpx
+
+from .db import execute, fetchone
+from .utils import rep_json, walk_rep
+
+# seconds, operations not listed here are not cached
+DEFAULT_TTL = {
+    "UserByScreenName": 24 * 3600,  # login -> user (mostly used to get id, which never changes)
+    "UserByRestId": 3600,
+    "TweetDetail": 600,
+}
+NEGATIVE_TTL = 600
+MAX_ITEMS = 10_000
+MAX_BYTES = 64 * 1024 * 1024  # size of response bodies kept in memory
+
+# typename of requested object in response of operation, response without it is "not found"
+FOUND_TYPES = {"UserByScreenName": "User", "UserByRestId": "User", "TweetDetail": "Tweet"}
+
+GET_QS = "SELECT * FROM response_cache WHERE key = :key AND expires_at > :now"
+
+PUT_QS = """
+INSERT OR REPLACE INTO response_cache (key, url, status, content, found, expires_at)
+VALUES (:key, :url, :status, :content, :found, :expires_at)
+"""
+
+
+class _Item(NamedTuple):
+    expires_at: float
+    found: bool
+    rep: httpx.Response
+
+
+def cache_key(queue: str, kv: dict) -> str:
+    # logins are case insensitive, variables order does not matter
+    kv = {k: v.lower() if k == "screen_name" else v for k, v in kv.items() if v is not None}
+    return f"{queue}:{json.dumps(kv, sort_keys=True, separators=(',', ':'))}"
+
+
+def _url_of(rep: httpx.Response) -> str:
+    try:
+        return str(rep.request.url)
+    except RuntimeError:  # response created without request
+        return ""
+
+
+def is_found(queue: str, rep: httpx.Response) -> bool:
+    tp = FOUND_TYPES.get(queue, None)
+    return tp is None or len(walk_rep(rep).typed.get(tp, [])) > 0
+
+
+class ResponseCache:
+    """
+    ttl: seconds per operation (queue name, e.g. "UserByScreenName"), merged with DEFAULT_TTL,
+        0 disables caching of operation
+    negative_ttl: seconds for responses without requested user / tweet (0 – not cached)
+    max_items / max_bytes: limits of in-memory tier, least recently used items are evicted
+    db_file: SQLite database for persistent tier (e.g. accounts db), None – memory only
+    """
+
+    def __init__(
+        self,
+        ttl: dict[str, float] | None = None,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_items=MAX_ITEMS,
+        max_bytes=MAX_BYTES,
+        db_file: str | None = None,
+    ):
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.negative_ttl = negative_ttl
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.db_file = db_file
+        self.counters: Counter[str] = Counter()  # hits, hits_db, negative_hits, misses, ...
+
+        self._items: OrderedDict[str, _Item] = OrderedDict()
+        self._nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def enabled(self, queue: str) -> bool:
+        return self.ttl.get(queue, 0) > 0
+
+    def stats(self) -> dict:
+        return {**self.counters, "items": len(self._items), "nbytes": self._nbytes}
+
+    def _set(self, key: str, item: _Item):
+        self._pop(key)
+        self._items[key] = item
+        self._nbytes += len(item.rep.content)
+        while self._items and (len(self._items) > self.max_items or self._nbytes > self.max_bytes):
+            self._pop(next(iter(self._items)))
+            self.counters["evictions"] += 1
+
+    def _pop(self, key: str):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._nbytes -= len(item.rep.content)
+
+    async def _get(self, key: str) -> _Item | None:
+        now = time.time()
+        item = self._items.get(key, None)
+        if item is not None:
+            if item.expires_at > now:
+                self._items.move_to_end(key)
+                self.counters["hits"] += 1
+                return item
+
+            self._pop(key)
+            self.counters["expired"] += 1
+
+        if self.db_file is not None:
+            rs = await fetchone(self.db_file, GET_QS, {"key": key, "now": now})
+            if rs is not None:
+                req = httpx.Request("GET", rs["url"]) if rs["url"] else None
+                rep = httpx.Response(rs["status"], content=rs["content"], request=req)
+                item = _Item(rs["expires_at"], bool(rs["found"]), rep)
+                self._set(key, item)
+                self.counters["hits_db"] += 1
+                return item
+
+        return None
+
+    async def get(self, queue: str, kv: dict) -> httpx.Response | None:
+        """Cached response of operation with variables `kv` or None"""
+        if not self.enabled(queue):
+            return None
+
+        item = await self._get(cache_key(queue, kv))
+        if item is None:
+            self.counters["misses"] += 1
+            return None
+
+        if not item.found:
+            self.counters["negative_hits"] += 1
+        return item.rep
+
+    async def put(self, queue: str, kv: dict, rep: httpx.Response):
+        if not self.enabled(queue) or rep.status_code != 200:
+            return
+
+        found = is_found(queue, rep)
+        if not found and rep_json(rep).get("errors"):
+            return  # error instead of requested object, not a clean "not found"
+
+        ttl = self.ttl[queue] if found else self.negative_ttl
+        if ttl <= 0:
+            return
+
+        key, expires_at = cache_key(queue, kv), time.time() + ttl
+        self._set(key, _Item(expires_at, found, rep))
+        self.counters["stores" if found else "negative_stores"] += 1
+
+        if self.db_file is not None:
+            kv = {"key": key, "url": _url_of(rep), "status": rep.status_code}
+            kv = {**kv, "content": rep.content, "found": found, "expires_at": expires_at}
+            await execute(self.db_file, PUT_QS, kv)
+
+    async def purge(self):
+        """Remove expired items from memory and database"""
+        now = time.time()
+        for key in [k for k, v in self._items.items() if v.expires_at <= now]:
+            self._pop(key)
+
+        if self.db_file is not None:
+            qs = "DELETE FROM response_cache WHERE expires_at <= :now"
+            await execute(self.db_file, qs, {"now": now})
+
+    async def clear(self):
+        self._items.clear()
+        self._nbytes = 0
+        if self.db_file is not None:
+            await execute(self.db_file, "DELETE FROM response_cache")
@@ -0,0 +1,79 @@
+"""
+Pagination checkpoints: last cursor and number of items of paginated call, stored in accounts
+database (`checkpoints` table), so long crawl can be continued after restart (`resume=True`).
+Checkpoint is keyed by operation name and hash of request variables (without cursor).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from .db import execute, fetchall, fetchone
+from .utils import utc
+
+UPSERT_QS = """
+INSERT INTO checkpoints (op, key, cursor, items, pages, updated_at)
+VALUES (:op, :key, :cursor, :items, :pages, datetime(:updated_at, 'unixepoch'))
+ON CONFLICT(op, key) DO UPDATE SET
+    cursor = excluded.cursor, items = excluded.items, pages = excluded.pages,
+    updated_at = excluded.updated_at
+"""
+
+
+@dataclass
+class Checkpoint:
+    op: str
+    key: str
+    cursor: str
+    items: int
+    pages: int
+    updated_at: datetime
+
+    @staticmethod
+    def from_rs(rs):
+        return Checkpoint(
+            op=rs["op"],
+            key=rs["key"],
+            cursor=rs["cursor"],
+            items=rs["items"],
+            pages=rs["pages"],
+            updated_at=utc.from_iso(rs["updated_at"]),
+        )
+
+
+def checkpoint_key(kv: dict) -> str:
+    kv = {k: v for k, v in kv.items() if k != "cursor" and v is not None}
+    val = json.dumps(kv, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(val.encode()).hexdigest()
+
+
+class Checkpoints:
+    """
+    Store of pagination checkpoints. Checkpoint is saved after each page consumed by caller
+    and removed when pagination is finished (no more pages or limit reached).
+    """
+
+    def __init__(self, db_file: str):
+        self._db_file = db_file
+
+    async def get(self, op: str, kv: dict) -> Checkpoint | None:
+        qs = "SELECT * FROM checkpoints WHERE op = :op AND key = :key"
+        rs = await fetchone(self._db_file, qs, {"op": op, "key": checkpoint_key(kv)})
+        return Checkpoint.from_rs(rs) if rs else None
+
+    async def save(self, op: str, kv: dict, cursor: str, items: int, pages: int):
+        kv = {"op": op, "key": checkpoint_key(kv), "cursor": cursor, "items": items}
+        kv = {**kv, "pages": pages, "updated_at": utc.ts()}
+        await execute(self._db_file, UPSERT_QS, kv)
+
+    async def delete(self, op: str, kv: dict):
+        qs = "DELETE FROM checkpoints WHERE op = :op AND key = :key"
+        await execute(self._db_file, qs, {"op": op, "key": checkpoint_key(kv)})
+
+    async def get_all(self) -> list[Checkpoint]:
+        rs = await fetchall(self._db_file, "SELECT * FROM checkpoints ORDER BY updated_at")
+        return [Checkpoint.from_rs(x) for x in rs]
+
+    async def clear(self):
+        await execute(self._db_file, "DELETE FROM checkpoints")
@@ -10,10 +10,13 @@ from importlib.metadata import version
 import httpx
 
 from .api import API, AccountsPool
-from .db import get_sqlite_version
+from .arrow import ParquetSink
+from .db import close_all, get_sqlite_version
 from .logger import logger, set_log_level
 from .login import LoginConfig
-from .models import Tweet, User
+from .models import LazyModel, Tweet, User
+from .ndjson import NdjsonWriter
+from .transport import close_transports
 from .utils import print_table
 
 
@@ -32,7 +35,7 @@ def get_fn_arg(args):
     exit(1)
 
 
-def to_str(doc: httpx.Response | Tweet | User | None) -> str:
+def to_str(doc: httpx.Response | Tweet | User | LazyModel | None) -> str:
     if doc is None:
         return "Not Found. See --raw for more details."
 
@@ -41,6 +44,14 @@ def to_str(doc: httpx.Response | Tweet | User | None) -> str:
 
 
 async def main(args):
+    try:
+        await _main(args)
+    finally:
+        await close_all()
+        await close_transports()
+
+
+async def _main(args):
     if args.debug:
         set_log_level("DEBUG")
 
@@ -111,13 +122,43 @@ async def main(args):
     _, val = get_fn_arg(args)
 
     if "limit" in args:
-        async for doc in fn(val, limit=args.limit):
+        kw = {"fields": args.fields.split(",")} if getattr(args, "fields", None) else {}
+        kw = {} if args.raw else kw
+        kw = {**kw, "resume": True} if args.resume else kw
+        if args.format == "parquet":
+            return await save_parquet(args, fn(val, limit=args.limit, **kw))
+
+        if args.out:
+            return await save_ndjson(args, fn(val, limit=args.limit, **kw))
+
+        async for doc in fn(val, limit=args.limit, **kw):
             print(to_str(doc))
     else:
         doc = await fn(val)
         print(to_str(doc))
 
 
+async def save_parquet(args, gen):
+    if args.raw or not args.out:
+        logger.error("--format=parquet requires --out and can't be used with --raw")
+        exit(1)
+
+    with ParquetSink(args.out) as sink:
+        async for doc in gen:
+            sink.write(doc)
+
+    logger.info(f"Saved {sink.rows:,d} rows to {args.out}")
+
+
+async def save_ndjson(args, gen):
+    rotate_bytes = int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None
+    with NdjsonWriter(args.out, rotate_bytes=rotate_bytes, rotate_rows=args.rotate_rows) as out:
+        async for doc in gen:
+            out.write(doc)
+
+    logger.info(f"Saved {out.rows:,d} rows to {', '.join(out.files)}")
+
+
 def custom_help(p):
     buffer = io.StringIO()
     p.print_help(buffer)
@@ -151,9 +192,18 @@ def run():
         p.add_argument("--raw", action="store_true", help="Print raw response")
         return p
 
-    def c_lim(name: str, msg: str, a_name: str, a_msg: str, a_type: type = str):
+    def c_lim(name: str, msg: str, a_name: str, a_msg: str, a_type: type = str, fields=True):
         p = c_one(name, msg, a_name, a_msg, a_type)
         p.add_argument("--limit", type=int, default=-1, help="Max tweets to retrieve")
+        p.add_argument("--resume", action="store_true", help="Continue from last saved page")
+        if fields:
+            p.add_argument("--fields", help="Only these fields, e.g: id,date,rawContent,user.id")
+        p.add_argument(
+            "--format", choices=["json", "parquet"], default="json", help="Output format"
+        )
+        p.add_argument("--out", help="Output file (.gz / .zst for compressed NDJSON)")
+        p.add_argument("--rotate-rows", type=int, help="Split NDJSON output by rows count")
+        p.add_argument("--rotate-mb", type=float, help="Split NDJSON output by size (MB)")
         return p
 
     subparsers.add_parser("version", help="Show version")
@@ -195,7 +245,7 @@ def run():
     c_lim("user_tweets_and_replies", "Get user tweets and replies", "user_id", "User ID", int)
     c_lim("user_media", "Get user's media", "user_id", "User ID", int)
     c_lim("list_timeline", "Get tweets from list", "list_id", "List ID", int)
-    c_lim("trends", "Get trends", "trend_id", "Trend ID or name", str)
+    c_lim("trends", "Get trends", "trend_id", "Trend ID or name", str, fields=False)
 
     args = p.parse_args()
     if args.command is None:
@@ -1,32 +1,34 @@
 import asyncio
 import random
 import sqlite3
-from collections import defaultdict
+from contextlib import asynccontextmanager
 
 import aiosqlite
 
 from .logger import logger
+from .utils import shard_of
 
 MIN_SQLITE_VERSION = "3.24"
+MAX_READERS = 4
+BUSY_TIMEOUT = 30  # seconds to wait for other process to release write lock
 
-_lock = asyncio.Lock()
+_version_checked = False
 
 
 def lock_retry(max_retries=10):
-    # this lock decorator has double nature:
-    # 1. it uses asyncio lock in same process
-    # 2. it retries when db locked by other process (eg. two cli instances running)
+    # waiting for other process (eg. two cli instances running) is done by sqlite busy_timeout,
+    # this retry is a fallback for cases when sqlite returns SQLITE_BUSY without waiting
+    # locking in same process is done by DB (single writer connection)
     def decorator(func):
         async def wrapper(*args, **kwargs):
             for i in range(max_retries):
                 try:
-                    async with _lock:
-                        return await func(*args, **kwargs)
+                    return await func(*args, **kwargs)
                 except sqlite3.OperationalError as e:
                     if i == max_retries - 1 or "database is locked" not in str(e):
                         raise e
 
-                    await asyncio.sleep(random.uniform(0.5, 1.0))
+                    await asyncio.sleep(random.uniform(0.01, 0.05) * (i + 1))
 
         return wrapper
 
@@ -41,6 +43,10 @@ async def get_sqlite_version():
 
 
 async def check_version():
+    global _version_checked
+    if _version_checked:
+        return
+
     ver = await get_sqlite_version()
     ver = ".".join(ver.split(".")[:2])
 
@@ -51,6 +57,8 @@ async def check_version():
     except ValueError:
         pass
 
+    _version_checked = True
+
 
 async def migrate(db: aiosqlite.Connection):
     async with db.execute("PRAGMA user_version") as cur:
@@ -84,11 +92,100 @@ async def migrate(db: aiosqlite.Connection):
     async def v4():
         await db.execute("ALTER TABLE accounts ADD COLUMN mfa_code TEXT DEFAULT NULL")
 
+    async def v5():
+        # locks & stats moved from json columns to tables, so queries can use index
+        qs = """
+        CREATE TABLE IF NOT EXISTS account_locks (
+            username TEXT NOT NULL COLLATE NOCASE,
+            queue TEXT NOT NULL,
+            unlock_at TEXT NOT NULL,
+            PRIMARY KEY (username, queue)
+        );"""
+        await db.execute(qs)
+        qs = "CREATE INDEX IF NOT EXISTS account_locks_queue ON account_locks (queue, unlock_at, username)"
+        await db.execute(qs)
+        qs = "CREATE INDEX IF NOT EXISTS accounts_active ON accounts (active, username)"
+        await db.execute(qs)
+
+        qs = """
+        CREATE TABLE IF NOT EXISTS account_stats (
+            username TEXT NOT NULL COLLATE NOCASE,
+            queue TEXT NOT NULL,
+            req_count INTEGER DEFAULT 0 NOT NULL,
+            PRIMARY KEY (username, queue)
+        );"""
+        await db.execute(qs)
+
+        qs = """
+        CREATE TRIGGER IF NOT EXISTS accounts_delete AFTER DELETE ON accounts BEGIN
+            DELETE FROM account_locks WHERE username = old.username;
+            DELETE FROM account_stats WHERE username = old.username;
+        END;"""
+        await db.execute(qs)
+
+        qs = """
+        INSERT OR IGNORE INTO account_locks (username, queue, unlock_at)
+        SELECT a.username, x.key, datetime(x.value) FROM accounts a, json_each(a.locks) x
+        WHERE datetime(x.value) IS NOT NULL
+        """
+        await db.execute(qs)
+
+        qs = """
+        INSERT OR IGNORE INTO account_stats (username, queue, req_count)
+        SELECT a.username, x.key, x.value FROM accounts a, json_each(a.stats) x
+        WHERE x.type = 'integer'
+        """
+        await db.execute(qs)
+        await db.execute("UPDATE accounts SET locks = '{}', stats = '{}'")
+
+    async def v6():
+        # last seen rate limit headers, used by MostRemaining selection strategy
+        await db.execute("ALTER TABLE account_stats ADD COLUMN limit_remaining INTEGER")
+        await db.execute("ALTER TABLE account_stats ADD COLUMN limit_reset INTEGER")
+
+    async def v7():
+        # owner of checkout lease (pool instance), lease is renewed by owner while account in use
+        await db.execute("ALTER TABLE account_locks ADD COLUMN owner TEXT DEFAULT NULL")
+
+    async def v8():
+        # pagination checkpoints (last cursor of op + variables), used by `resume=True`
+        qs = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            op TEXT NOT NULL,
+            key TEXT NOT NULL,
+            cursor TEXT NOT NULL,
+            items INTEGER DEFAULT 0 NOT NULL,
+            pages INTEGER DEFAULT 0 NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (op, key)
+        );"""
+        await db.execute(qs)
+
+    async def v9():
+        # persistent tier of API response cache (`twscrape.cache.ResponseCache`)
+        qs = """
+        CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY NOT NULL,
+            url TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            content BLOB NOT NULL,
+            found BOOLEAN NOT NULL,
+            expires_at REAL NOT NULL
+        );"""
+        await db.execute(qs)
+        qs = "CREATE INDEX IF NOT EXISTS response_cache_expires ON response_cache (expires_at)"
+        await db.execute(qs)
+
     migrations = {
         1: v1,
         2: v2,
         3: v3,
         4: v4,
+        5: v5,
+        6: v6,
+        7: v7,
+        8: v8,
+        9: v9,
     }
 
     # logger.debug(f"Current migration v{uv} (latest v{len(migrations)})")
@@ -104,41 +201,145 @@ async def migrate(db: aiosqlite.Connection):
         await db.commit()
 
 
+def is_read_query(qs: str) -> bool:
+    # UPDATE ... RETURNING also goes through fetchone, so only plain SELECTs can use readers
+    return qs.lstrip()[:6].upper() == "SELECT"
+
+
 class DB:
-    _init_queries: defaultdict[str, list[str]] = defaultdict(list)
-    _init_once: defaultdict[str, bool] = defaultdict(bool)
+    """
+    Long-lived connections to one database file: a single writer connection
+    (all writes are serialized by asyncio lock) and a bounded pool of readers.
+    Use `get_db` to get shared instance for db_path.
+    """
 
-    def __init__(self, db_path):
+    def __init__(self, db_path: str, max_readers=MAX_READERS):
         self.db_path = db_path
-        self.conn = None
+        self.max_readers = 0 if db_path == ":memory:" else max_readers
+        self.loop = asyncio.get_running_loop()
+
+        self._lock = asyncio.Lock()
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []  # idle readers
+        self._readers_sem = asyncio.Semaphore(max(self.max_readers, 1))
+        self._opened: list[aiosqlite.Connection] = []
 
-    async def __aenter__(self):
+    async def _connect(self):
         await check_version()
-        db = await aiosqlite.connect(self.db_path)
+
+        db = aiosqlite.connect(self.db_path, timeout=BUSY_TIMEOUT)
+        # do not block interpreter exit if pool was not closed explicitly (`close_all()`)
+        db._thread.daemon = True  # pyright: ignore[reportAttributeAccessIssue]
+
+        db = await db
         db.row_factory = aiosqlite.Row
+        await db.execute("PRAGMA synchronous = NORMAL")
+        await db.create_function("shard_of", 2, shard_of, deterministic=True)
+        self._opened.append(db)
+        return db
 
-        if not self._init_once[self.db_path]:
+    async def _get_writer(self):
+        if self._writer is None:
+            db = await self._connect()
+            # WAL: readers do not block writer and writer does not block readers
+            # (also safe with synchronous = NORMAL, commit does not fsync)
+            await db.execute("PRAGMA journal_mode = WAL")
             await migrate(db)
-            self._init_once[self.db_path] = True
-
-        self.conn = db
+            self._writer = db
+        return self._writer
+
+    @asynccontextmanager
+    async def write(self, immediate=False):
+        async with self._lock:
+            db = await self._get_writer()
+            try:
+                if immediate:
+                    # take write lock at start of transaction, otherwise read-then-write
+                    # transaction can fail with SQLITE_BUSY when other process writes
+                    await db.execute("BEGIN IMMEDIATE")
+                yield db
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+
+    @asynccontextmanager
+    async def read(self):
+        if self.max_readers == 0:
+            async with self.write() as db:
+                yield db
+            return
+
+        async with self._readers_sem:
+            if self._writer is None:
+                async with self._lock:
+                    await self._get_writer()  # run migrations first
+
+            db = self._readers.pop() if self._readers else await self._connect()
+            try:
+                yield db
+            finally:
+                self._readers.append(db)
+
+    async def close(self):
+        async with self._lock:
+            opened, self._opened, self._readers, self._writer = self._opened, [], [], None
+            for db in opened:
+                await db.close()
+
+    def stop(self):
+        # sync version of close, used when event loop is changed (eg. several asyncio.run)
+        opened, self._opened, self._readers, self._writer = self._opened, [], [], None
+        for db in opened:
+            db.stop()
+
+
+_dbs: dict[str, DB] = {}
+
+
+def get_db(db_path: str) -> DB:
+    db_path = str(db_path)
+    db = _dbs.get(db_path, None)
+    if db is not None and db.loop is asyncio.get_running_loop():
         return db
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            await self.conn.commit()
-            await self.conn.close()
+    if db is not None:
+        db.stop()
+
+    db = _dbs[db_path] = DB(db_path)
+    return db
+
+
+async def close_db(db_path: str):
+    db = _dbs.pop(str(db_path), None)
+    if db is not None:
+        if db.loop is asyncio.get_running_loop():
+            await db.close()
+        else:
+            db.stop()
+
+
+async def close_all():
+    for db_path in list(_dbs.keys()):
+        await close_db(db_path)
+
+
+@asynccontextmanager
+async def transaction(db_path: str):
+    async with get_db(db_path).write(immediate=True) as db:
+        yield db
 
 
 @lock_retry()
 async def execute(db_path: str, qs: str, params: dict | None = None):
-    async with DB(db_path) as db:
+    async with get_db(db_path).write() as db:
         await db.execute(qs, params)
 
 
 @lock_retry()
 async def fetchone(db_path: str, qs: str, params: dict | None = None):
-    async with DB(db_path) as db:
+    db = get_db(db_path)
+    async with db.read() if is_read_query(qs) else db.write() as db:
         async with db.execute(qs, params) as cur:
             row = await cur.fetchone()
             return row
@@ -146,7 +347,8 @@ async def fetchone(db_path: str, qs: str, params: dict | None = None):
 
 @lock_retry()
 async def fetchall(db_path: str, qs: str, params: dict | None = None):
-    async with DB(db_path) as db:
+    db = get_db(db_path)
+    async with db.read() if is_read_query(qs) else db.write() as db:
         async with db.execute(qs, params) as cur:
             rows = await cur.fetchall()
             return rows
@@ -154,5 +356,5 @@ async def fetchall(db_path: str, qs: str, params: dict | None = None):
 
 @lock_retry()
 async def executemany(db_path: str, qs: str, params: list[dict]):
-    async with DB(db_path) as db:
+    async with get_db(db_path).write() as db:
         await db.executemany(qs, params)
@@ -0,0 +1,187 @@
+"""
+Filters of already seen items, used to skip duplicates across pages and calls (`API(dedup=...)`):
+exact LRU set of last `max_items` keys (for small jobs) and Bloom filter with fixed memory
+and configured false positive rate (for crawls of millions of items; false positive means
+new item is skipped as seen). State can be saved to file and loaded for resumed crawl.
+"""
+
+import hashlib
+import json
+import math
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from .utils import utc
+
+
+class Dedup(ABC):
+    kind = ""
+    seen = 0  # number of keys added before and skipped
+
+    @abstractmethod
+    def add(self, key: str) -> bool:
+        """Adds key, returns True if it was not seen before"""
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        """Memory used by filter state (approximate for LruSet)"""
+
+    def stats(self) -> dict:
+        return {"kind": self.kind, "items": len(self), "seen": self.seen, "nbytes": self.nbytes}
+
+    def _header(self) -> dict:
+        return {"kind": self.kind, "seen": self.seen, "saved_at": utc.ts()}
+
+    @abstractmethod
+    def _body(self) -> bytes: ...
+
+    def save(self, path: str):
+        with open(path, "wb") as fp:
+            fp.write(json.dumps(self._header()).encode() + b"\n")
+            fp.write(self._body())
+
+
+class LruSet(Dedup):
+    """Exact set of last `max_items` keys, least recently seen keys are evicted"""
+
+    kind = "lru"
+
+    def __init__(self, max_items=1_000_000):
+        self.max_items = max_items
+        self.seen = 0
+        self._items: OrderedDict[str, None] = OrderedDict()
+        self._keys_nbytes = 0
+
+    def add(self, key: str) -> bool:
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.seen += 1
+            return False
+
+        self._items[key] = None
+        self._keys_nbytes += sys.getsizeof(key)
+        while len(self._items) > self.max_items:
+            old, _ = self._items.popitem(last=False)
+            self._keys_nbytes -= sys.getsizeof(old)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._items) + self._keys_nbytes
+
+    def _header(self) -> dict:
+        return {**super()._header(), "max_items": self.max_items}
+
+    def _body(self) -> bytes:
+        return "\n".join(self._items).encode()
+
+    @classmethod
+    def _load(cls, head: dict, body: bytes):
+        obj = cls(head["max_items"])
+        for x in body.decode().split("\n") if body else []:
+            obj.add(x)
+        obj.seen = head["seen"]
+        return obj
+
+
+class BloomFilter(Dedup):
+    """
+    Bloom filter for `capacity` keys with `error_rate` false positive probability, memory
+    is fixed (~1.2 MB per million keys for 1% rate). Keys above capacity are still added,
+    but error rate grows (see `error_rate_now`).
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity should be > 0 and error_rate in (0, 1)")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(round(self.bits_count / capacity * math.log(2)), 1)
+        self.count = 0
+        self.seen = 0
+        self._bits = bytearray((self.bits_count + 7) // 8)
+
+    def _positions(self, key: str):
+        # double hashing: h1 + i * h2 gives k independent enough positions
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        return [(h1 + i * h2) % self.bits_count for i in range(self.hashes)]
+
+    def add(self, key: str) -> bool:
+        bits, new = self._bits, False
+        for x in self._positions(key):
+            if not bits[x >> 3] & (1 << (x & 7)):
+                bits[x >> 3] |= 1 << (x & 7)
+                new = True
+
+        if new:
+            self.count += 1
+        else:
+            self.seen += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[x >> 3] & (1 << (x & 7)) for x in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def error_rate_now(self) -> float:
+        """Expected false positive rate for current number of keys"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits_count)) ** self.hashes
+
+    def stats(self) -> dict:
+        return {**super().stats(), "error_rate": self.error_rate_now}
+
+    def _header(self) -> dict:
+        head = {**super()._header(), "capacity": self.capacity, "error_rate": self.error_rate}
+        return {**head, "count": self.count}
+
+    def _body(self) -> bytes:
+        return bytes(self._bits)
+
+    @classmethod
+    def _load(cls, head: dict, body: bytes):
+        obj = cls(head["capacity"], head["error_rate"])
+        if len(body) != len(obj._bits):
+            raise ValueError(f"Bloom filter size mismatch: {len(body)} != {len(obj._bits)}")
+
+        obj._bits[:] = body
+        obj.count, obj.seen = head["count"], head["seen"]
+        return obj
+
+
+def load_dedup(path: str) -> LruSet | BloomFilter:
+    """Load filter saved with `save(path)`"""
+    with open(path, "rb") as fp:
+        head = json.loads(fp.readline())
+        body = fp.read()
+
+    kinds = {x.kind: x for x in [LruSet, BloomFilter]}
+    if head.get("kind") not in kinds:
+        raise ValueError(f"Unknown dedup filter kind: {head.get('kind')}")
+    return kinds[head["kind"]]._load(head, body)
@@ -6,26 +6,59 @@ import re
 import string
 import sys
 import traceback
-from dataclasses import asdict, dataclass, field
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Generator, Optional, Union
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Generic,
+    Iterable,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import httpx
 
 from .logger import logger
-from .utils import find_item, get_or, int_or, to_old_rep, utc
+from .utils import find_item, get_or, int_or, to_old_rep, utc, walk_rep
 
 
-@dataclass
+@dataclass(slots=True)
 class JSONTrait:
     def dict(self):
-        return asdict(self)
+        return _to_dict(self)
 
     def json(self):
         return json.dumps(self.dict(), default=str)
 
 
-@dataclass
+_fields_names: dict[type, tuple[str, ...]] = {}
+
+
+def _to_dict(val: Any) -> Any:
+    # same result as `dataclasses.asdict`, but without deepcopy of values (they're immutable)
+    if isinstance(val, JSONTrait):
+        tp = type(val)
+        if tp not in _fields_names:
+            _fields_names[tp] = tuple(x.name for x in fields(tp))
+        return {k: _to_dict(getattr(val, k)) for k in _fields_names[tp]}
+
+    if isinstance(val, list):
+        return [_to_dict(x) for x in val]
+
+    if isinstance(val, dict):
+        return {k: _to_dict(v) for k, v in val.items()}
+
+    return val
+
+
+@dataclass(slots=True)
 class Coordinates(JSONTrait):
     longitude: float
     latitude: float
@@ -41,7 +74,7 @@ class Coordinates(JSONTrait):
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Place(JSONTrait):
     id: str
     fullName: str
@@ -62,7 +95,7 @@ class Place(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TextLink(JSONTrait):
     url: str
     text: str | None
@@ -82,7 +115,7 @@ class TextLink(JSONTrait):
         return tmp
 
 
-@dataclass
+@dataclass(slots=True)
 class UserRef(JSONTrait):
     id: int
     id_str: str
@@ -100,7 +133,7 @@ class UserRef(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class User(JSONTrait):
     id: int
     id_str: str
@@ -158,7 +191,20 @@ class User(JSONTrait):
         )
 
 
-@dataclass
+RT_ID_PATH = [
+    "retweeted_status_id_str",
+    "retweeted_status_result.result.rest_id",
+    "retweeted_status_result.result.tweet.rest_id",
+]
+
+QT_ID_PATH = [
+    "quoted_status_id_str",
+    "quoted_status_result.result.rest_id",
+    "quoted_status_result.result.tweet.rest_id",
+]
+
+
+@dataclass(slots=True)
 class Tweet(JSONTrait):
     id: int
     id_str: str
@@ -202,20 +248,8 @@ class Tweet(JSONTrait):
     def parse(obj: dict, res: dict):
         tw_usr = User.parse(res["users"][obj["user_id_str"]])
 
-        rt_id_path = [
-            "retweeted_status_id_str",
-            "retweeted_status_result.result.rest_id",
-            "retweeted_status_result.result.tweet.rest_id",
-        ]
-
-        qt_id_path = [
-            "quoted_status_id_str",
-            "quoted_status_result.result.rest_id",
-            "quoted_status_result.result.tweet.rest_id",
-        ]
-
-        rt_obj = get_or(res, f"tweets.{_first(obj, rt_id_path)}")
-        qt_obj = get_or(res, f"tweets.{_first(obj, qt_id_path)}")
+        rt_obj = get_or(res, f"tweets.{_first(obj, RT_ID_PATH)}")
+        qt_obj = get_or(res, f"tweets.{_first(obj, QT_ID_PATH)}")
 
         url = f"https://x.com/{tw_usr.username}/status/{obj['id_str']}"
         doc = Tweet(
@@ -265,7 +299,291 @@ class Tweet(JSONTrait):
         return doc
 
 
-@dataclass
+T = TypeVar("T")
+
+Fields = Iterable[str] | None  # projection of model, dotted names for nested: "user.id"
+
+# requested fields as tree: {"id", "user.id"} -> {"id": None, "user": {"id": None}}
+FieldsTree = dict[str, Optional["FieldsTree"]]
+
+
+class _lazy(Generic[T]):
+    # field of lazy model: computed on first access and memoized in instance `_cache`
+    def __init__(self, fn: Callable[[Any], T]):
+        self.fn = fn
+        self.name = fn.__name__
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, inst, owner=None) -> T:
+        if inst is None:
+            return self  # type: ignore
+
+        if self.name not in inst._cache:
+            inst._cache[self.name] = self.fn(inst)
+        return inst._cache[self.name]
+
+    def __set__(self, inst, value: T):
+        inst._cache[self.name] = value
+
+
+def _raw(key: str, *default) -> Any:
+    # lazy field which is taken from raw object as is (`get_or` used when default is set)
+    def fn(self: "LazyModel"):
+        return get_or(self._obj, key, default[0]) if default else self._obj[key]
+
+    return _lazy(fn)
+
+
+def _project(val: Any, sub: FieldsTree | None):
+    if isinstance(val, list):
+        return [_project(x, sub) for x in val]
+
+    if isinstance(val, LazyModel):
+        return val.dict()
+
+    if isinstance(val, JSONTrait):
+        doc = val.dict()
+        return doc if sub is None else {k: doc[k] for k in sub if k in doc}
+
+    return val
+
+
+class LazyModel(ABC):
+    """
+    Proxy over raw object with same attributes as eager model. Each field is parsed on first
+    access and memoized, so consumers which read only few fields skip parsing of the rest.
+    Parse errors are raised on field access.
+
+    With `fields` projection, `dict()` / `json()` contain only requested fields. Parsers fill
+    requested fields upfront, so items which fail on them are skipped as in eager parsing.
+    """
+
+    __slots__ = ("_obj", "_res", "_cache", "_fields")
+    _model: Any  # eager model class
+    _nested: dict[str, type["LazyModel"]] = {}  # lazy fields which support nested projection
+
+    def __init__(self, obj: dict, res: dict, fields: FieldsTree | None = None):
+        self._obj = obj
+        self._res = res
+        self._cache: dict[str, Any] = {}
+        self._fields = fields
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(id={self.id!r}, url={self.url!r})"
+
+    @property
+    def id(self) -> int:
+        return int(self._obj["id_str"])
+
+    @property
+    @abstractmethod
+    def url(self) -> str: ...
+
+    def _sub(self, name: str) -> FieldsTree | None:
+        return self._fields.get(name) if self._fields else None
+
+    def _to_model(self):
+        kv = {x.name: getattr(self, x.name) for x in fields(self._model)}
+        kv = {k: v._to_model() if isinstance(v, LazyModel) else v for k, v in kv.items()}
+        return self._model(**kv)
+
+    def dict(self) -> dict:
+        if self._fields is None:
+            return self._to_model().dict()
+        return {k: _project(getattr(self, k), sub) for k, sub in self._fields.items()}
+
+    def json(self):
+        return json.dumps(self.dict(), default=str)
+
+    @classmethod
+    def fields_tree(cls, names: Iterable[str]) -> FieldsTree:
+        """Build projection from dotted names (e.g. `{"id", "user.id"}`), raise on unknown"""
+        tree: FieldsTree = {}
+        for name in names:
+            key, _, rest = name.strip().partition(".")
+            if key not in {x.name for x in fields(cls._model)}:
+                raise ValueError(f"Unknown field '{key}' of {cls._model.__name__}")
+
+            if key in tree and tree[key] is None:
+                continue  # whole field already requested
+
+            if not rest:
+                tree[key] = None
+            elif key in cls._nested:
+                sub = cls._nested[key].fields_tree([rest])
+                tree[key] = {**(tree.get(key) or {}), **sub}
+            else:
+                tree[key] = {**(tree.get(key) or {}), rest: None}
+
+        return tree
+
+
+class LazyUser(LazyModel):
+    """Lazy variant of `User` (see `parse_users(..., lazy=True)`)"""
+
+    __slots__ = ()
+    _model = User
+    _type = "snscrape.modules.twitter.User"
+
+    id_str: _lazy[str] = _raw("id_str")
+    username: _lazy[str] = _raw("screen_name")
+    displayname: _lazy[str] = _raw("name")
+    rawDescription: _lazy[str] = _raw("description")
+    followersCount: _lazy[int] = _raw("followers_count")
+    friendsCount: _lazy[int] = _raw("friends_count")
+    statusesCount: _lazy[int] = _raw("statuses_count")
+    favouritesCount: _lazy[int] = _raw("favourites_count")
+    listedCount: _lazy[int] = _raw("listed_count")
+    mediaCount: _lazy[int] = _raw("media_count")
+    location: _lazy[str] = _raw("location")
+    profileImageUrl: _lazy[str] = _raw("profile_image_url_https")
+    profileBannerUrl: _lazy[str | None] = _raw("profile_banner_url", None)
+    verified: _lazy[bool | None] = _raw("verified", None)
+    blue: _lazy[bool | None] = _raw("is_blue_verified", None)
+    blueType: _lazy[str | None] = _raw("verified_type", None)
+    protected: _lazy[bool | None] = _raw("protected", None)
+
+    @property
+    def url(self) -> str:
+        return f"https://x.com/{self._obj['screen_name']}"
+
+    @_lazy
+    def created(self) -> datetime:
+        return email.utils.parsedate_to_datetime(self._obj["created_at"])
+
+    @_lazy
+    def descriptionLinks(self) -> list[TextLink]:
+        return _parse_links(self._obj, ["entities.description.urls", "entities.url.urls"])
+
+    @_lazy
+    def pinnedIds(self) -> list[int]:
+        return [int(x) for x in self._obj.get("pinned_tweet_ids_str", [])]
+
+    def to_user(self) -> User:
+        return self._to_model()
+
+
+class LazyTweet(LazyModel):
+    """Lazy variant of `Tweet` (see `parse_tweets(..., lazy=True)`)"""
+
+    __slots__ = ()
+    _model = Tweet
+    _type = "snscrape.modules.twitter.Tweet"
+
+    id_str: _lazy[str] = _raw("id_str")
+    lang: _lazy[str] = _raw("lang")
+    replyCount: _lazy[int] = _raw("reply_count")
+    retweetCount: _lazy[int] = _raw("retweet_count")
+    likeCount: _lazy[int] = _raw("favorite_count")
+    quoteCount: _lazy[int] = _raw("quote_count")
+    bookmarkedCount: _lazy[int] = _raw("bookmark_count", 0)
+    conversationIdStr: _lazy[str] = _raw("conversation_id_str")
+    inReplyToTweetIdStr: _lazy[str | None] = _raw("in_reply_to_status_id_str", None)
+    source: _lazy[str | None] = _raw("source", None)
+    possibly_sensitive: _lazy[bool | None] = _raw("possibly_sensitive", None)
+
+    @property
+    def url(self) -> str:
+        username = self._res["users"][self._obj["user_id_str"]]["screen_name"]
+        return f"https://x.com/{username}/status/{self._obj['id_str']}"
+
+    @_lazy
+    def date(self) -> datetime:
+        return email.utils.parsedate_to_datetime(self._obj["created_at"])
+
+    @_lazy
+    def user(self) -> LazyUser:
+        return LazyUser(self._res["users"][self._obj["user_id_str"]], self._res, self._sub("user"))
+
+    @_lazy
+    def rawContent(self) -> str:
+        obj = self._obj
+        txt = get_or(obj, "note_tweet.note_tweet_results.result.text", obj["full_text"])
+
+        # issue #42 – restore full rt text
+        rt = self.retweetedTweet if txt.endswith("…") else None
+        if rt is not None and rt.user is not None:
+            txt = f"RT @{rt.user.username}: {rt.rawContent}"
+        return txt
+
+    @_lazy
+    def conversationId(self) -> int:
+        return int(self._obj["conversation_id_str"])
+
+    @_lazy
+    def hashtags(self) -> list[str]:
+        return [x["text"] for x in get_or(self._obj, "entities.hashtags", [])]
+
+    @_lazy
+    def cashtags(self) -> list[str]:
+        return [x["text"] for x in get_or(self._obj, "entities.symbols", [])]
+
+    @_lazy
+    def mentionedUsers(self) -> list[UserRef]:
+        return [UserRef.parse(x) for x in get_or(self._obj, "entities.user_mentions", [])]
+
+    @_lazy
+    def links(self) -> list[TextLink]:
+        paths = ["entities.urls", "note_tweet.note_tweet_results.result.entity_set.urls"]
+        return _parse_links(self._obj, paths)
+
+    @_lazy
+    def media(self) -> "Media":
+        return Media.parse(self._obj)
+
+    @_lazy
+    def viewCount(self) -> int | None:
+        rt_obj = get_or(self._res, f"tweets.{_first(self._obj, RT_ID_PATH)}")
+        return _get_views(self._obj, rt_obj or {})
+
+    @_lazy
+    def retweetedTweet(self) -> Optional["LazyTweet"]:
+        rt_obj = get_or(self._res, f"tweets.{_first(self._obj, RT_ID_PATH)}")
+        return LazyTweet(rt_obj, self._res, self._sub("retweetedTweet")) if rt_obj else None
+
+    @_lazy
+    def quotedTweet(self) -> Optional["LazyTweet"]:
+        qt_obj = get_or(self._res, f"tweets.{_first(self._obj, QT_ID_PATH)}")
+        return LazyTweet(qt_obj, self._res, self._sub("quotedTweet")) if qt_obj else None
+
+    @_lazy
+    def place(self) -> Place | None:
+        return Place.parse(self._obj["place"]) if self._obj.get("place") else None
+
+    @_lazy
+    def coordinates(self) -> Coordinates | None:
+        return Coordinates.parse(self._obj)
+
+    @_lazy
+    def inReplyToTweetId(self) -> int | None:
+        return int_or(self._obj, "in_reply_to_status_id_str")
+
+    @_lazy
+    def inReplyToUser(self) -> UserRef | None:
+        return _get_reply_user(self._obj, self._res)
+
+    @_lazy
+    def sourceUrl(self) -> str | None:
+        return _get_source_url(self._obj)
+
+    @_lazy
+    def sourceLabel(self) -> str | None:
+        return _get_source_label(self._obj)
+
+    @_lazy
+    def card(self) -> Union[None, "SummaryCard", "PollCard", "BroadcastCard", "AudiospaceCard"]:
+        return _parse_card(self._obj, self.url)
+
+    def to_tweet(self) -> Tweet:
+        return self._to_model()
+
+
+LazyTweet._nested = {"user": LazyUser, "retweetedTweet": LazyTweet, "quotedTweet": LazyTweet}
+
+
+@dataclass(slots=True)
 class MediaPhoto(JSONTrait):
     url: str
 
@@ -274,7 +592,7 @@ class MediaPhoto(JSONTrait):
         return MediaPhoto(url=obj["media_url_https"])
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaVideo(JSONTrait):
     thumbnailUrl: str
     variants: list["MediaVideoVariant"]
@@ -293,7 +611,7 @@ class MediaVideo(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaAnimated(JSONTrait):
     thumbnailUrl: str
     videoUrl: str
@@ -309,7 +627,7 @@ class MediaAnimated(JSONTrait):
             return None
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaVideoVariant(JSONTrait):
     contentType: str
     bitrate: int
@@ -324,7 +642,7 @@ class MediaVideoVariant(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Media(JSONTrait):
     photos: list[MediaPhoto] = field(default_factory=list)
     videos: list[MediaVideo] = field(default_factory=list)
@@ -357,12 +675,12 @@ class Media(JSONTrait):
         return Media(photos=photos, videos=videos, animated=animated)
 
 
-@dataclass
+@dataclass(slots=True)
 class Card(JSONTrait):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryCard(Card):
     title: str
     description: str
@@ -373,20 +691,20 @@ class SummaryCard(Card):
     _type: str = "summary"
 
 
-@dataclass
+@dataclass(slots=True)
 class PollOption(JSONTrait):
     label: str
     votesCount: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PollCard(Card):
     options: list[PollOption]
     finished: bool
     _type: str = "poll"
 
 
-@dataclass
+@dataclass(slots=True)
 class BroadcastCard(Card):
     title: str
     url: str
@@ -394,19 +712,19 @@ class BroadcastCard(Card):
     _type: str = "broadcast"
 
 
-@dataclass
+@dataclass(slots=True)
 class AudiospaceCard(Card):
     url: str
     _type: str = "audiospace"
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestParam(JSONTrait):
     key: str
     value: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TrendUrl(JSONTrait):
     url: str
     urlType: str
@@ -424,7 +742,7 @@ class TrendUrl(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TrendMetadata(JSONTrait):
     domain_context: str
     meta_description: str
@@ -439,7 +757,7 @@ class TrendMetadata(JSONTrait):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupedTrend(JSONTrait):
     name: str
     url: TrendUrl
@@ -449,7 +767,7 @@ class GroupedTrend(JSONTrait):
         return GroupedTrend(name=obj["name"], url=TrendUrl.parse(obj["url"]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Trend(JSONTrait):
     id: Optional[str]
     rank: Optional[str | int]
@@ -699,19 +1017,25 @@ def _write_dump(kind: str, e: Exception, x: dict, obj: dict):
     logger.error(f"Failed to parse response of {kind}, writing dump to {dumpfile}")
 
 
-def _parse_items(rep: httpx.Response, kind: str, limit: int = -1):
+def _parse_items(
+    rep: httpx.Response | dict, kind: str, limit: int = -1, lazy=False, fields: Fields = None
+):
+    parse: Callable[[dict, dict], Any]
     if kind == "user":
-        Cls, key = User, "users"
+        parse, lazy_cls, key = User.parse, LazyUser, "users"
     elif kind == "tweet":
-        Cls, key = Tweet, "tweets"
+        parse, lazy_cls, key = Tweet.parse, LazyTweet, "tweets"
     elif kind == "trends":
-        Cls, key = Trend, "trends"
+        parse, lazy_cls, key = Trend.parse, None, "trends"
     else:
         raise ValueError(f"Invalid kind: {kind}")
 
-    # check for dict, because httpx.Response can be mocked in tests with different type
-    res = rep if isinstance(rep, dict) else rep.json()
-    obj = to_old_rep(res)
+    # projection is done over lazy models, so not requested fields are not parsed at all
+    if lazy_cls is not None and (lazy or fields is not None):
+        tree = lazy_cls.fields_tree(fields) if fields is not None else None
+        parse = partial(lazy_cls, fields=tree)
+
+    obj = to_old_rep(walk_rep(rep))  # rep can be dict or Response with cached walk result
 
     ids = set()
     for x in obj[key].values():
@@ -722,7 +1046,9 @@ def _parse_items(rep: httpx.Response, kind: str, limit: int = -1):
             pass
 
         try:
-            tmp = Cls.parse(x, obj)
+            tmp = parse(x, obj)
+            if fields is not None:
+                tmp.dict()  # parse (and memoize) requested fields, so bad item is skipped here
             if tmp.id not in ids:
                 ids.add(tmp.id)
                 yield tmp
@@ -768,13 +1094,54 @@ def parse_trend(rep: httpx.Response) -> Trend | None:
         return None
 
 
-def parse_tweets(rep: httpx.Response, limit: int = -1) -> Generator[Tweet, None, None]:
-    return _parse_items(rep, "tweet", limit)  # type: ignore
+# lazy – yield `LazyTweet` / `LazyUser` proxies, fields are parsed on first access
+# fields – projection (implies lazy), e.g. {"id", "date", "user.id"}; dict() / json() of
+# returned objects contain only these fields
+
+
+@overload
+def parse_tweets(
+    rep: httpx.Response | dict, limit: int = -1, lazy: Literal[False] = False, fields: None = None
+) -> Generator[Tweet, None, None]: ...
+
+
+@overload
+def parse_tweets(
+    rep: httpx.Response | dict, limit: int = -1, *, lazy: Literal[True], fields: Fields = None
+) -> Generator[LazyTweet, None, None]: ...
+
+
+@overload
+def parse_tweets(
+    rep: httpx.Response | dict, limit: int = -1, lazy: bool = False, *, fields: Iterable[str]
+) -> Generator[LazyTweet, None, None]: ...
+
+
+def parse_tweets(rep: httpx.Response | dict, limit: int = -1, lazy=False, fields: Fields = None):
+    return _parse_items(rep, "tweet", limit, lazy=lazy, fields=fields)
+
+
+@overload
+def parse_users(
+    rep: httpx.Response | dict, limit: int = -1, lazy: Literal[False] = False, fields: None = None
+) -> Generator[User, None, None]: ...
+
+
+@overload
+def parse_users(
+    rep: httpx.Response | dict, limit: int = -1, *, lazy: Literal[True], fields: Fields = None
+) -> Generator[LazyUser, None, None]: ...
+
+
+@overload
+def parse_users(
+    rep: httpx.Response | dict, limit: int = -1, lazy: bool = False, *, fields: Iterable[str]
+) -> Generator[LazyUser, None, None]: ...
 
 
-def parse_users(rep: httpx.Response, limit: int = -1) -> Generator[User, None, None]:
-    return _parse_items(rep, "user", limit)  # type: ignore
+def parse_users(rep: httpx.Response | dict, limit: int = -1, lazy=False, fields: Fields = None):
+    return _parse_items(rep, "user", limit, lazy=lazy, fields=fields)
 
 
-def parse_trends(rep: httpx.Response, limit: int = -1) -> Generator[Trend, None, None]:
+def parse_trends(rep: httpx.Response | dict, limit: int = -1) -> Generator[Trend, None, None]:
     return _parse_items(rep, kind="trends", limit=limit)  # type: ignore
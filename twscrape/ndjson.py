@@ -0,0 +1,255 @@
+"""
+Buffered NDJSON (one JSON document per line) writer for large exports, with optional
+compression (gzip, zstd) and rotation of output files by size or number of rows.
+
+zstd requires `zstandard` package: pip install twscrape[zstd]
+"""
+
+import asyncio
+import gzip
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Literal
+
+import httpx
+
+from .utils import json_dumps, rep_json
+
+Compression = Literal["gzip", "zstd"] | None
+
+BUFFER_SIZE = 1024 * 1024  # bytes kept in memory before write to file
+FLUSH_INTERVAL = 1.0  # seconds, max time rows stay in buffer
+FSYNC_INTERVAL = 10.0  # seconds, min time between fsync of flushed data
+MAX_PENDING = 4  # writes queued to writer thread, next write waits when disk is slower
+
+
+def _compression_of(path: str) -> Compression:
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def _open(path: str, compression: Compression) -> tuple[Any, IO[bytes]]:
+    # returns (stream to write, underlying file), file is needed for fsync
+    if compression == "gzip":
+        raw = open(path, "wb")
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6), raw
+
+    if compression == "zstd":
+        try:
+            import zstandard  # pyright: ignore[reportMissingImports]
+        except ImportError as e:
+            raise ImportError("zstandard is required for zstd: pip install twscrape[zstd]") from e
+        raw = open(path, "wb")
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False), raw
+
+    raw = open(path, "wb")
+    return raw, raw
+
+
+class NdjsonWriter:
+    """
+    Writes models (`Tweet`, `User`, lazy / projected models), dicts or raw responses as NDJSON.
+    Rows are serialized from model `dict()` (no `dataclasses.asdict` copy) with fastest JSON
+    backend and buffered, buffer is written to file when it reaches `buffer_size` bytes or
+    after `flush_interval` seconds (by event loop timer, so rows are written even if stream
+    stalls, e.g. while waiting for account; without running loop – checked on write).
+    Flushed data is synced to disk (`os.fsync`) at most every `fsync_interval` seconds and on
+    rotate / close (None – not synced, left to OS). When used from event loop, file writes,
+    compression and fsync are done in writer thread, so they do not block other tasks.
+
+    Compression is taken from file extension (`.gz`, `.zst`) if not set. With `rotate_bytes`
+    (uncompressed size) or `rotate_rows` output is split to files with part number:
+    `tweets.ndjson.gz` -> `tweets.00001.ndjson.gz`, `tweets.00002.ndjson.gz`, ...
+
+        with NdjsonWriter("tweets.ndjson.gz", rotate_rows=1_000_000) as out:
+            async for doc in api.search("elon musk"):
+                out.write(doc)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: Compression = None,
+        rotate_bytes: int | None = None,
+        rotate_rows: int | None = None,
+        buffer_size=BUFFER_SIZE,
+        flush_interval=FLUSH_INTERVAL,
+        fsync_interval: float | None = FSYNC_INTERVAL,
+    ):
+        self.path = path
+        self.compression: Compression = compression or _compression_of(path)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_rows = rotate_rows
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+
+        self.rows = 0  # total rows written
+        self.files: list[str] = []  # all written files
+
+        self._fp: Any = None  # file objects are used only in `_run` (writer thread)
+        self._raw: IO[bytes] | None = None
+        self._opened = False
+        self._buffer: list[bytes] = []
+        self._buffer_bytes = 0
+        self._file_rows = 0
+        self._file_bytes = 0
+        self._flushed_at = time.monotonic()
+        self._synced_at = time.monotonic()
+        self._timer: asyncio.TimerHandle | None = None
+        self._io: ThreadPoolExecutor | None = None
+        self._tasks: deque[Future] = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _next_path(self) -> str:
+        if self.rotate_bytes is None and self.rotate_rows is None:
+            return self.path
+
+        name, ext = os.path.basename(self.path), ""
+        for x in [".gz", ".zst"]:
+            if name.endswith(x):
+                name, ext = name[: -len(x)], x
+                break
+
+        stem, dot, base_ext = name.partition(".")
+        name = f"{stem}.{len(self.files) + 1:05d}{dot}{base_ext}{ext}"
+        return os.path.join(os.path.dirname(self.path), name)
+
+    def write(self, doc: Any):
+        if isinstance(doc, httpx.Response):
+            doc = rep_json(doc)
+
+        line = json_dumps(doc) + b"\n"
+        self._buffer.append(line)
+        self._buffer_bytes += len(line)
+        self._file_bytes += len(line)
+        self._file_rows += 1
+        self.rows += 1
+
+        if (self.rotate_rows is not None and self._file_rows >= self.rotate_rows) or (
+            self.rotate_bytes is not None and self._file_bytes >= self.rotate_bytes
+        ):
+            self.rotate()
+        elif self._buffer_bytes >= self.buffer_size:
+            self._write_buffer()
+        elif time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+        elif self._timer is None and self._buffer:
+            self._start_timer()
+
+    def _start_timer(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync usage, interval is checked on write
+
+        delay = max(self.flush_interval - (time.monotonic() - self._flushed_at), 0)
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self.flush()
+
+    def _run(self, fn: Callable, *args):
+        if self._io is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return fn(*args)  # sync usage, nothing to block
+            self._io = ThreadPoolExecutor(1, thread_name_prefix="twscrape-ndjson")
+
+        # single thread keeps order of file operations, errors are raised on next call
+        while self._tasks and (self._tasks[0].done() or len(self._tasks) >= MAX_PENDING):
+            self._tasks.popleft().result()
+        self._tasks.append(self._io.submit(fn, *args))
+
+    def _write_file(self, path: str, data: bytes):
+        if self._fp is None:
+            self._fp, self._raw = _open(path, self.compression)
+        self._fp.write(data)
+
+    def _flush_file(self, sync: bool):
+        if self._fp is None or self._raw is None:
+            return
+
+        self._fp.flush()
+        if sync:
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+
+    def _close_file(self):
+        if self._fp is None or self._raw is None:
+            return
+
+        if self._fp is not self._raw:
+            self._fp.close()  # compressed stream writes its end, file is kept open
+        self._raw.flush()
+        if self.fsync_interval is not None:
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+        self._fp, self._raw = None, None
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+
+        if not self._opened:
+            self.files.append(self._next_path())
+            self._opened = True
+
+        data = b"".join(self._buffer)
+        self._buffer, self._buffer_bytes = [], 0
+        self._run(self._write_file, self.files[-1], data)
+
+    def flush(self):
+        """Write buffered rows and flush file (compressed stream is flushed too)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._write_buffer()
+        if self._opened:
+            interval = self.fsync_interval
+            sync = interval is not None and time.monotonic() - self._synced_at >= interval
+            if sync:
+                self._synced_at = time.monotonic()
+            self._run(self._flush_file, sync)
+        self._flushed_at = time.monotonic()
+
+    def rotate(self):
+        """Close current file, next rows go to new file"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._write_buffer()
+        if self._opened:
+            self._run(self._close_file)
+            self._opened = False
+            self._synced_at = time.monotonic()
+        self._file_rows, self._file_bytes = 0, 0
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        self.rotate()
+        if not self.files:  # no rows, but output file is expected
+            self.files.append(self._next_path())
+            self._run(self._write_file, self.files[-1], b"")
+            self._run(self._close_file)
+
+        # wait for writer thread, so files are complete on return
+        while self._tasks:
+            self._tasks.popleft().result()
+        if self._io is not None:
+            self._io.shutdown()
+            self._io = None
@@ -1,13 +1,16 @@
+import asyncio
 import json
 import os
-from typing import Any
+from collections import deque
+from typing import Any, Callable
 
 import httpx
 from httpx import AsyncClient, Response
 
-from .accounts_pool import Account, AccountsPool
+from .accounts_pool import Account, AccountsPool, NoAccountError
 from .logger import logger
-from .utils import utc
+from .transport import MAX_STREAMS, Http2Config
+from .utils import rep_json, utc
 
 ReqParams = dict[str, str | int] | None
 TMP_TS = utc.now().isoformat().split(".")[0].replace("T", "_").replace(":", "-")[0:16]
@@ -18,6 +21,9 @@ class Ctx:
         self.acc = acc
         self.clt = clt
         self.req_count = 0
+        self.limit: tuple[int, int] | None = None  # last seen (remaining, reset)
+        self.lease_lost = False
+        self.heartbeat: asyncio.Task | None = None
 
 
 class HandledError(Exception):
@@ -56,7 +62,7 @@ def dump_rep(rep: Response):
     msg.append("\n")
 
     try:
-        msg.append(json.dumps(rep.json(), indent=2))
+        msg.append(json.dumps(rep_json(rep), indent=2))
     except json.JSONDecodeError:
         msg.append(rep.text)
 
@@ -66,12 +72,22 @@ def dump_rep(rep: Response):
 
 
 class QueueClient:
-    def __init__(self, pool: AccountsPool, queue: str, debug=False, proxy: str | None = None):
+    def __init__(
+        self,
+        pool: AccountsPool,
+        queue: str,
+        debug=False,
+        proxy: str | None = None,
+        http2: Http2Config = False,
+        max_streams=MAX_STREAMS,
+    ):
         self.pool = pool
         self.queue = queue
         self.debug = debug
         self.ctx: Ctx | None = None
         self.proxy = proxy
+        self.http2 = http2
+        self.max_streams = max_streams
 
     async def __aenter__(self):
         await self._get_ctx()
@@ -86,19 +102,29 @@ class QueueClient:
 
         ctx, self.ctx, self.req_count = self.ctx, None, 0
         username = ctx.acc.username
+        if ctx.heartbeat is not None:
+            ctx.heartbeat.cancel()
         await ctx.clt.aclose()
 
+        if ctx.lease_lost:
+            return  # account can be already used by other owner, do not touch it
+
         if inactive:
             await self.pool.mark_inactive(username, msg)
             return
 
         if reset_at > 0:
-            await self.pool.lock_until(ctx.acc.username, self.queue, reset_at, ctx.req_count)
+            await self.pool.lock_until(
+                ctx.acc.username, self.queue, reset_at, ctx.req_count, limit=ctx.limit
+            )
             return
 
-        await self.pool.unlock(ctx.acc.username, self.queue, ctx.req_count)
+        await self.pool.unlock(ctx.acc.username, self.queue, ctx.req_count, limit=ctx.limit)
 
     async def _get_ctx(self):
+        if self.ctx and self.ctx.lease_lost:
+            await self._close_ctx()
+
         if self.ctx:
             return self.ctx
 
@@ -106,10 +132,23 @@ class QueueClient:
         if acc is None:
             return None
 
-        clt = acc.make_client(proxy=self.proxy)
+        clt = acc.make_client(self.proxy, self.http2, self.max_streams)
         self.ctx = Ctx(acc, clt)
+        self.ctx.heartbeat = asyncio.create_task(self._heartbeat(self.ctx))
         return self.ctx
 
+    async def _heartbeat(self, ctx: Ctx):
+        # renew account lease while context is alive
+        while True:
+            await asyncio.sleep(self.pool.lease_ttl / 3)
+            try:
+                if not await self.pool.renew_lease(ctx.acc.username, self.queue):
+                    logger.warning(f"Lease lost for {ctx.acc.username} on queue {self.queue}")
+                    ctx.lease_lost = True
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of {ctx.acc.username}: {type(e)}: {e}")
+
     async def _check_rep(self, rep: Response) -> None:
         """
         This function can raise Exception and request will be retried or aborted
@@ -120,13 +159,15 @@ class QueueClient:
             dump_rep(rep)
 
         try:
-            res = rep.json()
+            res = rep_json(rep)
         except json.JSONDecodeError:
             res: Any = {"_raw": rep.text}
 
         limit_remaining = int(rep.headers.get("x-rate-limit-remaining", -1))
         limit_reset = int(rep.headers.get("x-rate-limit-reset", -1))
         # limit_max = int(rep.headers.get("x-rate-limit-limit", -1))
+        if self.ctx is not None and limit_remaining >= 0 and limit_reset > 0:
+            self.ctx.limit = (limit_remaining, limit_reset)
 
         err_msg = "OK"
         if "errors" in res:
@@ -223,7 +264,7 @@ class QueueClient:
             except HandledError:
                 # retry with new account
                 continue
-            except (httpx.ReadTimeout, httpx.ProxyError):
+            except (httpx.ReadTimeout, httpx.PoolTimeout, httpx.ProxyError):
                 # http transport failed, just retry with same account
                 continue
             except (httpx.ConnectError, httpx.ConnectTimeout) as e:
@@ -242,3 +283,75 @@ class QueueClient:
 
                     logger.warning(" ".join(msg))
                     await self._close_ctx(utc.ts() + 60 * 15)  # 15 minutes
+
+
+class SharedClient:
+    """
+    Up to `size` QueueClients (accounts) of one queue shared by many concurrent calls: each
+    request takes free client for its time, callers waiting for client are served in FIFO
+    order, so pages of many paginated calls are interleaved fairly. Clients are opened on
+    first use and closed with `close()` (not on exit of calls using it). If account for
+    new client is not available (`NoAccountError`), pool is shrunk to opened clients.
+    """
+
+    def __init__(self, make: Callable[[], QueueClient], size: int):
+        self._make = make
+        self._size = max(size, 1)
+        self._clients: list[QueueClient] = []
+        self._idle: list[QueueClient] = []
+        self._waiters: deque[asyncio.Future[QueueClient]] = deque()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def _acquire(self) -> QueueClient:
+        if self._idle:
+            return self._idle.pop()
+
+        if len(self._clients) < self._size:
+            client = self._make()
+            self._clients.append(client)
+            try:
+                return await client.__aenter__()
+            except NoAccountError:
+                self._clients.remove(client)
+                if not self._clients:
+                    raise
+
+                # fewer free accounts than `size`, wait for already opened client instead
+                self._size = len(self._clients)
+            except BaseException:
+                self._clients.remove(client)
+                raise
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            return await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release(fut.result())  # client was given, but caller is cancelled
+            raise
+
+    def _release(self, client: QueueClient):
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(client)
+                return
+        self._idle.append(client)
+
+    async def get(self, url: str, params: ReqParams = None) -> Response | None:
+        client = await self._acquire()
+        try:
+            return await client.get(url, params=params)
+        finally:
+            self._release(client)
+
+    async def close(self):
+        clients, self._clients, self._idle = self._clients, [], []
+        for x in clients:
+            await x.__aexit__(None, None, None)
@@ -0,0 +1,218 @@
+import asyncio
+import heapq
+import sqlite3
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+
+from .account import (
+    ACCOUNTS_QS,
+    LOCKS_INSERT_QS,
+    LOCKS_RESET_QS,
+    STATS_INSERT_QS,
+    Account,
+    db_time,
+)
+from .db import BUSY_TIMEOUT, fetchall, transaction
+from .logger import logger
+from .utils import utc
+from .write_queue import flush_on_exit
+
+LOCK_TIME = timedelta(minutes=15)
+
+ACCOUNTS_UPDATE_QS = """
+UPDATE accounts SET active = :active, error_msg = :error_msg, last_used = :last_used
+WHERE username = :username
+"""
+
+
+@dataclass
+class QueueHeaps:
+    free: list[tuple[str, int, str]] = field(default_factory=list)  # (username, ver, key)
+    locked: list[tuple[float, int, str]] = field(default_factory=list)  # (unlock_at, ver, key)
+    ver: dict[str, int] = field(default_factory=dict)  # key: last pushed version
+
+
+class AccountsScheduler:
+    """
+    In-process account scheduler. Accounts are loaded once, checkouts are served from
+    per-queue heaps in O(log n) and changes are written to db in batches (write-behind).
+    Should be used only when one process works with accounts db. Not written changes are
+    flushed on `close()` and on interpreter exit.
+    """
+
+    def __init__(self, db_file: str, flush_interval: float = 1.0):
+        self._db_file = db_file
+        self._flush_interval = flush_interval
+        self._accounts: dict[str, Account] | None = None  # lower(username): Account
+        self._queues: dict[str, QueueHeaps] = {}
+        self._dirty: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        flush_on_exit(self)
+
+    async def _load(self) -> dict[str, Account]:
+        if self._accounts is not None:
+            return self._accounts
+
+        async with self._lock:
+            if self._accounts is None:
+                rs = await fetchall(self._db_file, ACCOUNTS_QS)
+                accounts = [Account.from_rs(x) for x in rs]
+                self._accounts = {x.username.lower(): x for x in accounts}
+                self._queues = {}
+
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_loop())
+
+            return self._accounts
+
+    def _heaps(self, queue: str) -> QueueHeaps:
+        q = self._queues.get(queue, None)
+        if q is None:
+            q = self._queues[queue] = QueueHeaps()
+            for acc in (self._accounts or {}).values():
+                self._push(q, queue, acc)
+        return q
+
+    def _push(self, q: QueueHeaps, queue: str, acc: Account):
+        # old heap entries of account become stale by version change
+        key = acc.username.lower()
+        ver = q.ver[key] = q.ver.get(key, 0) + 1
+        if not acc.active:
+            return
+
+        lock = acc.locks.get(queue, None)
+        if lock is not None and lock > utc.now():
+            heapq.heappush(q.locked, (lock.timestamp(), ver, key))
+        else:
+            heapq.heappush(q.free, (key, ver, key))
+
+    def _changed(self, acc: Account, queue: str | None = None):
+        key = acc.username.lower()
+        self._dirty.add(key)
+
+        queues = [queue] if queue is not None else list(self._queues.keys())
+        for x in queues:
+            if x in self._queues:
+                self._push(self._queues[x], x, acc)
+
+    async def _get(self, username: str) -> Account | None:
+        accounts = await self._load()
+        return accounts.get(username.lower(), None)
+
+    async def get_for_queue(self, queue: str) -> Account | None:
+        accounts = await self._load()
+        q = self._heaps(queue)
+        now = utc.now()
+
+        ts = now.timestamp()
+        while q.locked and q.locked[0][0] <= ts:
+            _, ver, key = heapq.heappop(q.locked)
+            if q.ver.get(key, None) == ver:
+                heapq.heappush(q.free, (key, ver, key))
+
+        while q.free:
+            _, ver, key = heapq.heappop(q.free)
+            acc = accounts.get(key, None)
+            if acc is None or q.ver.get(key, None) != ver:
+                continue
+
+            acc.locks[queue] = now + LOCK_TIME
+            acc.last_used = now
+            self._changed(acc, queue)
+            return replace(acc, locks={**acc.locks}, stats={**acc.stats})
+
+        return None
+
+    async def lock_until(self, username: str, queue: str, unlock_at: int, req_count=0):
+        if acc := await self._get(username):
+            acc.locks[queue] = utc.from_ts(unlock_at)
+            acc.stats[queue] = acc.stats.get(queue, 0) + req_count
+            acc.last_used = utc.now()
+            self._changed(acc, queue)
+
+    async def unlock(self, username: str, queue: str, req_count=0):
+        if acc := await self._get(username):
+            acc.locks.pop(queue, None)
+            acc.stats[queue] = acc.stats.get(queue, 0) + req_count
+            acc.last_used = utc.now()
+            self._changed(acc, queue)
+
+    async def mark_inactive(self, username: str, error_msg: str | None):
+        if acc := await self._get(username):
+            acc.active = False
+            acc.error_msg = error_msg
+            self._changed(acc)
+
+    def _statements(self, dirty: set[str]):
+        accounts = [self._accounts[x] for x in dirty if self._accounts and x in self._accounts]
+        rows = [
+            {
+                "username": x.username,
+                "active": x.active,
+                "error_msg": x.error_msg,
+                "last_used": db_time(x.last_used),
+            }
+            for x in accounts
+        ]
+
+        return [
+            (ACCOUNTS_UPDATE_QS, rows),
+            (LOCKS_RESET_QS, rows),
+            (LOCKS_INSERT_QS, [y for x in accounts for y in x.locks_rs()]),
+            (STATS_INSERT_QS, [y for x in accounts for y in x.stats_rs()]),
+        ]
+
+    async def flush(self):
+        if not self._dirty or self._accounts is None:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        try:
+            async with transaction(self._db_file) as db:
+                for qs, rows in self._statements(dirty):
+                    await db.executemany(qs, rows)
+        except BaseException:
+            self._dirty |= dirty
+            raise
+
+    def flush_sync(self):
+        # used on interpreter exit, when event loop is already closed
+        if not self._dirty or self._accounts is None or self._db_file == ":memory:":
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        db = sqlite3.connect(self._db_file, timeout=BUSY_TIMEOUT)
+        try:
+            with db:
+                for qs, rows in self._statements(dirty):
+                    db.executemany(qs, rows)
+        finally:
+            db.close()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush accounts state: {type(e)}: {e}")
+
+    @asynccontextmanager
+    async def paused(self):
+        # exclusive section for direct db writes: in-memory state is flushed before
+        # and reloaded after, so changes from both sides are not lost
+        async with self._lock:
+            while self._dirty:
+                await self.flush()
+
+            self._accounts, self._queues = None, {}
+            yield
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        await self.flush()
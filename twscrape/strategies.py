@@ -0,0 +1,64 @@
+"""
+Account selection strategies for AccountsPool. Strategy defines in which order free accounts
+are taken for queue: it returns sql expression used in ORDER BY of `account_locks` rows
+(columns: username, queue, unlock_at) of this queue.
+"""
+
+from abc import ABC, abstractmethod
+
+# value used for accounts without known rate limit (or when rate limit window is over)
+FULL_BUDGET = 1_000_000
+
+
+class SelectionStrategy(ABC):
+    @abstractmethod
+    def order_by(self, queue: str) -> str: ...
+
+
+class ByUsername(SelectionStrategy):
+    """Never used accounts first, then by username. Fastest (index only), used by default."""
+
+    def order_by(self, queue: str) -> str:
+        return "unlock_at, username"
+
+
+class LeastRecentlyUsed(SelectionStrategy):
+    """Account with oldest `last_used` first, so load is spread across all accounts."""
+
+    def order_by(self, queue: str) -> str:
+        return """(
+            SELECT a.last_used FROM accounts a WHERE a.username = account_locks.username
+        ), username"""
+
+
+class MostRemaining(SelectionStrategy):
+    """
+    Account with most remaining rate limit budget for queue first (from last seen
+    `x-rate-limit-remaining` / `x-rate-limit-reset` headers).
+    """
+
+    def order_by(self, queue: str) -> str:
+        return f"""COALESCE((
+            SELECT s.limit_remaining FROM account_stats s
+            WHERE s.username = account_locks.username AND s.queue = account_locks.queue
+                AND s.limit_reset > CAST(strftime('%s', 'now') AS INTEGER)
+        ), {FULL_BUDGET}) DESC, username"""
+
+
+class Sharded(SelectionStrategy):
+    """
+    Each worker (eg. process) takes accounts of own shard first (by consistent hash of
+    username), so workers do not compete for the same accounts. When own shard is
+    exhausted, accounts of other shards are used. Within shard - least recently used.
+    """
+
+    def __init__(self, worker_id: int, workers: int):
+        if not 0 <= worker_id < workers:
+            raise ValueError(f"Invalid worker_id {worker_id} for {workers} workers")
+
+        self.worker_id = worker_id
+        self.workers = workers
+
+    def order_by(self, queue: str) -> str:
+        lru = LeastRecentlyUsed().order_by(queue)
+        return f"shard_of(username, {self.workers}) != {self.worker_id}, {lru}"
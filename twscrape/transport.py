@@ -0,0 +1,86 @@
+import asyncio
+import weakref
+from typing import Container
+
+from httpx import AsyncBaseTransport, AsyncHTTPTransport, Limits, Request, Response
+
+from .utils import get_env_bool
+
+# http/2 can be enabled for all connections (True), for one proxy (str) or for listed
+# proxies (None for direct)
+Http2Config = bool | str | Container[str | None]
+
+MAX_STREAMS = 100  # default max concurrent requests over shared http/2 transport
+
+# shared transport serves requests of all accounts, so number of connections is not limited
+# (httpx default is 100), otherwise requests over the limit fail with `PoolTimeout`
+LIMITS = Limits(max_connections=None, max_keepalive_connections=100)
+
+Transports = dict[tuple[str | None, bool], "SharedTransport"]  # (proxy, http2) -> transport
+
+# connections can't be used from other event loop, so transports are kept per loop
+_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Transports]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def use_http2(config: Http2Config, proxy: str | None) -> bool:
+    if isinstance(config, bool):
+        return config
+    if isinstance(config, str):  # str is Container too, but `in` would check substring
+        return proxy == config
+    return proxy in config
+
+
+class SharedTransport(AsyncBaseTransport):
+    """
+    Transport which is shared by clients of all accounts with same proxy. Cookies and headers
+    are kept by each client and sent per request, so open connections survive account switch.
+    Closing client does not close shared connections, use `close_transports` for this.
+
+    With http/2 concurrent requests are multiplexed over one connection, `max_streams` limits
+    number of requests in flight.
+    """
+
+    def __init__(self, transport: AsyncHTTPTransport, max_streams: int | None = None):
+        self._transport = transport
+        self._streams = asyncio.Semaphore(max_streams) if max_streams else None
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if self._streams is None:
+            return await self._transport.handle_async_request(request)
+
+        async with self._streams:
+            rep = await self._transport.handle_async_request(request)
+            await rep.aread()  # stream is busy until body is received
+            return rep
+
+    async def aclose(self) -> None:
+        pass
+
+    async def close(self):
+        await self._transport.aclose()
+
+
+def get_transport(proxy: str | None = None, http2=False, max_streams=MAX_STREAMS):
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is None or not get_env_bool("TWS_REUSE_CONNECTIONS", True):
+        return AsyncHTTPTransport(retries=2, proxy=proxy, http2=http2)
+
+    items = _transports.setdefault(loop, {})
+    key = (proxy, http2)
+    if key not in items:
+        transport = AsyncHTTPTransport(retries=2, proxy=proxy, http2=http2, limits=LIMITS)
+        items[key] = SharedTransport(transport, max_streams if http2 else None)
+
+    return items[key]
+
+
+async def close_transports():
+    items = _transports.pop(asyncio.get_running_loop(), {})
+    for x in items.values():
+        await x.close()
@@ -1,13 +1,93 @@
+import asyncio
 import base64
 import json
 import os
+import zlib
 from collections import defaultdict
+from contextlib import aclosing
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, AsyncGenerator, Callable, TypeVar
 
 T = TypeVar("T")
 
 
+def _json_backend() -> tuple[str, Callable[[str | bytes], Any]]:
+    try:
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        return "orjson", orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec  # pyright: ignore[reportMissingImports]
+
+        decoder = msgspec.json.Decoder()
+
+        def loads(data: str | bytes) -> Any:
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise json.JSONDecodeError(str(e), "", 0) from e
+
+        return "msgspec", loads
+    except ImportError:
+        pass
+
+    return "json", json.loads
+
+
+JSON_BACKEND, _json_loads = _json_backend()
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Decode JSON with fastest installed backend (orjson, msgspec or stdlib json)."""
+    return _json_loads(data)
+
+
+def _json_default(val: Any):
+    # models by `dict()`, other values (datetime) as str
+    return val.dict() if hasattr(val, "dict") else str(val)
+
+
+def _json_dumps_backend() -> Callable[[Any], bytes]:
+    try:
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        # same output as stdlib: models by `dict()` (orjson skips `_type`), datetime as str
+        opts = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        return lambda obj: orjson.dumps(obj, default=_json_default, option=opts)
+    except ImportError:
+        pass
+
+    def dumps(obj: Any) -> bytes:
+        res = json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+        return res.encode()
+
+    return dumps
+
+
+_json_dumps = _json_dumps_backend()
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode object or model to compact UTF-8 JSON (with orjson if installed)."""
+    return _json_dumps(obj)
+
+
+def rep_json(rep) -> Any:
+    # decoded body is cached on response, so each page is decoded once
+    if isinstance(rep, dict):
+        return rep
+
+    res = getattr(rep, "__json", None)
+    if res is None:
+        res = json_loads(rep.content)
+        setattr(rep, "__json", res)
+    return res
+
+
 class utc:
     @staticmethod
     def now() -> datetime:
@@ -17,11 +97,21 @@ class utc:
     def from_iso(iso: str) -> datetime:
         return datetime.fromisoformat(iso).replace(tzinfo=timezone.utc)
 
+    @staticmethod
+    def from_ts(ts: int | float) -> datetime:
+        return datetime.fromtimestamp(ts, timezone.utc)
+
     @staticmethod
     def ts() -> int:
         return int(utc.now().timestamp())
 
 
+def shard_of(key: str, shards: int) -> int:
+    # rendezvous hashing: when number of shards changes, only 1/n of keys are moved
+    key = key.lower()
+    return max(range(max(shards, 1)), key=lambda i: zlib.crc32(f"{i}:{key}".encode()))
+
+
 async def gather(gen: AsyncGenerator[T, None]) -> list[T]:
     items = []
     async for x in gen:
@@ -29,6 +119,46 @@ async def gather(gen: AsyncGenerator[T, None]) -> list[T]:
     return items
 
 
+async def read_ahead(gen: AsyncGenerator[T, None], size: int) -> AsyncGenerator[T, None]:
+    """
+    Iterates `gen` in background task up to `size` items ahead of consumer. Closing of
+    returned generator (e.g. with `aclosing`) cancels task and closes `gen`.
+    """
+    done: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()  # (is item, item or error)
+    slots = asyncio.Semaphore(size)  # items requested but not taken by consumer yet
+
+    async def run():
+        try:
+            async with aclosing(gen):
+                while True:
+                    await slots.acquire()
+                    try:
+                        x = await gen.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    done.put_nowait((True, x))
+            done.put_nowait((False, None))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            done.put_nowait((False, e))
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            ok, x = await done.get()
+            if not ok:
+                if x is not None:
+                    raise x
+                return
+
+            slots.release()
+            yield x
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
 def encode_params(obj: dict):
     res = {}
     for k, v in obj.items():
@@ -124,6 +254,47 @@ def get_typed_object(obj: dict, res: defaultdict[str, list]):
     return res
 
 
+@dataclass
+class GqlDoc:
+    entries: list  # first "entries" list (timeline entries)
+    cursors: dict[str, str | None]  # cursorType -> value (first of each type)
+    typed: dict[str, list[dict]]  # __typename -> objects
+
+
+def walk_doc(obj: dict) -> GqlDoc:
+    # one pass over response instead of get_by_path + find_obj + get_typed_object
+    entries, cursors, typed = None, {}, defaultdict(list)
+
+    stack: list = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, dict):
+            if (tp := x.get("__typename")) is not None:
+                typed[tp].append(x)
+            if (ct := x.get("cursorType")) is not None and ct not in cursors:
+                cursors[ct] = x.get("value")
+            if entries is None and isinstance(x.get("entries"), list):
+                entries = x["entries"]
+
+            stack.extend(reversed(x.values()))  # reversed to keep document order
+        elif isinstance(x, list):
+            stack.extend(reversed(x))
+
+    return GqlDoc(entries or [], cursors, typed)
+
+
+def walk_rep(rep) -> GqlDoc:
+    # walk result is attached to response by pagination loop and reused by parsers
+    if isinstance(rep, dict):
+        return walk_doc(rep)
+
+    doc = getattr(rep, "__doc", None)
+    if doc is None:
+        doc = walk_doc(rep_json(rep))
+        setattr(rep, "__doc", doc)
+    return doc
+
+
 def to_old_obj(obj: dict):
     return {
         **obj,
@@ -134,8 +305,8 @@ def to_old_obj(obj: dict):
     }
 
 
-def to_old_rep(obj: dict) -> dict[str, dict]:
-    tmp = get_typed_object(obj, defaultdict(list))
+def to_old_rep(obj: dict | GqlDoc) -> dict[str, dict]:
+    tmp = obj.typed if isinstance(obj, GqlDoc) else get_typed_object(obj, defaultdict(list))
 
     tw1 = [x for x in tmp.get("Tweet", []) if "legacy" in x]
     tw1 = {str(x["rest_id"]): to_old_obj(x) for x in tw1}
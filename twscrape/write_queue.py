@@ -0,0 +1,162 @@
+import asyncio
+import atexit
+import sqlite3
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .account import STATS_UPDATE_QS, UNLOCKED
+from .db import BUSY_TIMEOUT, transaction
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .scheduler import AccountsScheduler
+
+LOCK_QS = """
+INSERT INTO account_locks (username, queue, unlock_at)
+VALUES (:username, :queue, COALESCE(datetime(:unlock_at, 'unixepoch'), :unlocked))
+ON CONFLICT(username, queue) DO UPDATE SET unlock_at = excluded.unlock_at, owner = NULL
+"""
+
+USED_QS = """
+UPDATE accounts SET last_used = datetime(:last_used, 'unixepoch') WHERE username = :username
+"""
+
+
+@dataclass
+class PendingOp:
+    unlock_at: int | None  # None means unlock
+    req_count: int
+    last_used: int
+    limit_remaining: int | None = None
+    limit_reset: int | None = None
+
+
+class WriteQueue:
+    """
+    Coalesces lock / unlock / stats updates of accounts. Operations are merged per
+    (username, queue): last lock state wins and request counters are summed. Pending
+    operations are written in one transaction after `max_delay` seconds or when
+    `max_ops` operations are queued (whichever comes first).
+    """
+
+    def __init__(self, db_file: str, max_delay=0.05, max_ops=100):
+        self._db_file = db_file
+        self._max_delay = max_delay
+        self._max_ops = max_ops
+        self._pending: dict[tuple[str, str], PendingOp] = {}
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self._ops = 0
+        flush_on_exit(self)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _merge(self, key: tuple[str, str], op: PendingOp):
+        old = self._pending.get(key, None)
+        if old is not None:
+            op.req_count += old.req_count
+            op.last_used = max(op.last_used, old.last_used)
+            if op.limit_reset is None:
+                op.limit_remaining, op.limit_reset = old.limit_remaining, old.limit_reset
+        self._pending[key] = op
+
+    async def put(
+        self,
+        username: str,
+        queue: str,
+        unlock_at: int | None,
+        req_count: int,
+        ts: int,
+        limit: tuple[int, int] | None = None,
+    ):
+        op = PendingOp(unlock_at, req_count, ts, *(limit or (None, None)))
+        self._merge((username, queue), op)
+        self._ops += 1
+
+        if self._ops >= self._max_ops:
+            await self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self._max_delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._task = asyncio.create_task(self._flush_safe())
+
+    async def _flush_safe(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush account updates: {type(e)}: {e}")
+
+    def _take(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending, self._ops = self._pending, {}, 0
+        return pending
+
+    def _statements(self, pending: dict[tuple[str, str], PendingOp]):
+        rows = [{"username": u, "queue": q, **vars(x)} for (u, q), x in pending.items()]
+
+        used: dict[str, int] = {}
+        for x in rows:
+            used[x["username"]] = max(used.get(x["username"], 0), x["last_used"])
+
+        return [
+            (LOCK_QS, [{**x, "unlocked": UNLOCKED} for x in rows]),
+            (STATS_UPDATE_QS, rows),
+            (USED_QS, [{"username": k, "last_used": v} for k, v in used.items()]),
+        ]
+
+    async def flush(self):
+        async with self._lock:
+            pending = self._take()
+            if not pending:
+                return
+
+            try:
+                async with transaction(self._db_file) as db:
+                    for qs, rows in self._statements(pending):
+                        await db.executemany(qs, rows)
+            except BaseException:
+                # put back under newer operations, so nothing is lost
+                newer, self._pending = self._pending, pending
+                for k, v in newer.items():
+                    self._merge(k, v)
+                raise
+
+    def flush_sync(self):
+        # used on interpreter exit, when event loop is already closed
+        pending = self._take()
+        if not pending or self._db_file == ":memory:":
+            return
+
+        db = sqlite3.connect(self._db_file, timeout=BUSY_TIMEOUT)
+        try:
+            with db:
+                for qs, rows in self._statements(pending):
+                    db.executemany(qs, rows)
+        finally:
+            db.close()
+
+
+_queues: "weakref.WeakSet[WriteQueue | AccountsScheduler]" = weakref.WeakSet()
+
+
+def flush_on_exit(obj: "WriteQueue | AccountsScheduler"):
+    # pending account updates are written with sync `flush_sync()` on interpreter exit
+    _queues.add(obj)
+
+
+@atexit.register
+def _flush_on_exit():
+    for x in list(_queues):
+        try:
+            x.flush_sync()
+        except Exception as e:
+            logger.error(f"Failed to flush account updates on exit: {type(e)}: {e}")